@@ -1,5 +1,4 @@
 import re
-import requests
 import os
 import json
 import threading
@@ -11,16 +10,22 @@ from imperva_sdk.core import *
 class ADCUploader(MxObject):
     """A simple example class"""
     def __init__(self, connection):
-        self.cookies = {'JSESSIONID': str(connection._MxConnection__Headers['Cookie'])[11:],
-                        'SSOSESSIONID': str(connection._MxConnection__Headers['Cookie'])[11:]}
+        self._connection = connection
         self.ip = connection.Host
+        # Go through the connection's pooled keep-alive session
+        self._session = connection._session
+
+    # Built for each request, so the upload uses the new MX session if the connection authenticates again
+    @property
+    def cookies(self):
+        session_id = str(self._connection._MxConnection__Headers['Cookie'])[11:]
+        return {'JSESSIONID': session_id, 'SSOSESSIONID': session_id}
 
     # for tracking the upload we need the script id.
     def get_script_id(self):
 
         headers = {
             'Host': '%s:8083' % self.ip,
-            'Connection': 'close',
             'Upgrade-Insecure-Requests': '1',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/63.0.3239.132 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
@@ -32,7 +37,7 @@ class ADCUploader(MxObject):
 
         # getting script id for later tracking
         api_url = 'https://%s:8083/SecureSphere/ui/main.html' % (self.ip)
-        r = requests.get(api_url, cookies=self.cookies, verify=False)
+        r = self._session.get(api_url, cookies=self.cookies, verify=False)
         regex_result = re.search(r"JAWR.dwr_scriptSessionId='([a-zA-Z0-9_.-]*)'", r.text)
 
         # check if not found?
@@ -48,14 +53,13 @@ class ADCUploader(MxObject):
 
         headers = {
             'Host': '%s:8083' % self.ip,
-            'Connection': 'close',
             'Upgrade-Insecure-Requests': '1',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Referer': 'https://%s:8083/SecureSphere/ui/main.html' % self.ip,
             'Accept-Encoding': 'gzip, deflate',
             'Accept-Language': 'en-US,en;q=0.9',
         }
-        r = requests.post(api_url, files={'ADC1': prod},
+        r = self._session.post(api_url, files={'ADC1': prod},
                           cookies=self.cookies, headers=headers, verify=False)
 
         return r.status_code == 200
@@ -66,7 +70,6 @@ class ADCUploader(MxObject):
 
         headers = {
             'Host': '%s:8083' % self.ip,
-            'Connection': 'close',
             'Upgrade-Insecure-Requests': '1',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/63.0.3239.132 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
@@ -87,7 +90,7 @@ class ADCUploader(MxObject):
                'c0-param1=boolean:false\n' \
                'batchId=5'.format(sessionid)
 
-        response = requests.post(api_url, headers=headers, data=data, cookies=self.cookies, verify=False)
+        response = self._session.post(api_url, headers=headers, data=data, cookies=self.cookies, verify=False)
 
         regex_result = re.search(r"dwr\.engine\.\_remoteHandleCallback.*({.*})", response.text)
 
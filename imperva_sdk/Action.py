@@ -7,22 +7,7 @@ class Action(MxObject):
   '''
   MX Action Class (part of Action Set)
   '''
-  # Store created Action Set objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = Action._exists(connection=kwargs['connection'], Name=kwargs['Name'], ActionSet=kwargs['ActionSet'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None, ActionSet=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'Action':
-        if cur_obj.Name == Name and cur_obj._ActionSet == ActionSet:
-          return cur_obj
-    return None
+  _key_fields = ('ActionSet', 'Name')
 
   def __init__(self, connection=None, Name=None, ActionSet=None, ActionType=None, Protocol=None, SyslogFacility=None, Host=None, SyslogLogLevel=None, SecondaryPort=None, ActionInterface=None, SecondaryHost=None, Message=None, Port=None):
     super(Action, self).__init__(connection=connection, Name=Name)
@@ -205,7 +190,7 @@ class Action(MxObject):
       if is_parameter.match(cur_key) and cur_key not in ['Name', 'ActionSet', 'ActionType'] and parameters[cur_key] != None:
         body[cur_key[0].lower() + cur_key[1:]] = parameters[cur_key]
       
-    connection._mx_api('POST', '/conf/actionSets/%s/%s' % (ActionSet, Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/actionSets/%s/%s' % (ActionSet, Name), data=json_dumps(body))
     return Action(connection=connection, Name=Name, ActionSet=ActionSet, ActionType=ActionType, Protocol=Protocol, SyslogFacility=SyslogFacility, Host=Host, SyslogLogLevel=SyslogLogLevel, SecondaryPort=SecondaryPort, ActionInterface=ActionInterface, SecondaryHost=SecondaryHost, Message=Message, Port=Port)
   @staticmethod
   def _delete_action(connection, Name, ActionSet):
@@ -213,7 +198,7 @@ class Action(MxObject):
     obj = connection.get_action(Name=Name, ActionSet=ActionSet)
     if obj:
       connection._mx_api('DELETE', '/conf/actionSets/%s/%s' % (ActionSet, Name))
-      connection._instances.remove(obj)
+      connection._instances.discard(obj)
       del obj
     else:
       raise MxException("Action does not exist")
@@ -232,5 +217,5 @@ class Action(MxObject):
         func = lambda s: s[:1].lower() + s[1:] if s else ''
         lowparam = func(param)
       body[lowparam] = axnDict[param]
-    connection._mx_api('PUT', '/conf/actionSets/%s/%s' % (ActionSet, Name), data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/actionSets/%s/%s' % (ActionSet, Name), data=json_dumps(body))
     return True
@@ -7,22 +7,6 @@ class ActionSet(MxObject):
   '''
   MX Action Set Class
   '''
-  # Store created Action Set objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = ActionSet._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'ActionSet':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
 
   def __init__(self, connection=None, Name=None, AsType=None):
     super(ActionSet, self).__init__(connection=connection, Name=Name)
@@ -81,7 +65,7 @@ class ActionSet(MxObject):
         pass
       return action_set
     body = {'type': AsType}
-    connection._mx_api('POST', '/conf/actionSets/%s' % (Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/actionSets/%s' % (Name), data=json_dumps(body))
     return ActionSet(connection=connection, Name=Name, AsType=AsType)
   @staticmethod
   def _delete_action_set(connection, Name=None):
@@ -89,7 +73,7 @@ class ActionSet(MxObject):
     action_set = connection.get_action_set(Name=Name)
     if action_set:
       connection._mx_api('DELETE', '/conf/actionSets/%s' % Name)
-      connection._instances.remove(action_set)
+      connection._instances.discard(action_set)
       del action_set
     else:
       raise MxException("Action Set does not exist")
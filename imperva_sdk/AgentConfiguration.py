@@ -33,24 +33,6 @@ class AgentConfiguration(MxObject):
 
   '''
 
-  # Store created objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = AgentConfiguration._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'AgentConfiguration':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, Ip=None, DataInterfaces=[], Tags=[], AdvancedConfig={},
                DiscoverySettings={}, CpuUsageRestraining={}, GeneralDetails={}):
     super(AgentConfiguration, self).__init__(connection=connection, Name=Name)
@@ -348,16 +330,16 @@ class AgentConfiguration(MxObject):
           connection.create_tag(tag)
         # Second, replace the existing tags with the new ones
         try:
-          connection._mx_api('POST', '/conf/agents/%s/tags' % Name, data=json.dumps({'tags': Value}))
+          connection._mx_api('POST', '/conf/agents/%s/tags' % Name, data=json_dumps({'tags': Value}))
         except Exception as e:
           pass
       elif isinstance(Value, dict):
         if Parameter == 'AdvancedConfiguration':
-          connection._mx_api('PUT', '/conf/agents/%s/Settings/AdvancedConfiguration' % Name, data=json.dumps(Value))
+          connection._mx_api('PUT', '/conf/agents/%s/Settings/AdvancedConfiguration' % Name, data=json_dumps(Value))
         elif Parameter == 'DiscoverySettings':
-          connection._mx_api('PUT', '/conf/agents/%s/Settings/DiscoverySettings' % Name, data=json.dumps(Value))
+          connection._mx_api('PUT', '/conf/agents/%s/Settings/DiscoverySettings' % Name, data=json_dumps(Value))
         elif Parameter == 'CPUUsageRestraining':
-          connection._mx_api('PUT', '/conf/agents/%s/Settings/CPUUsageRestraining' % Name, data=json.dumps(Value))
+          connection._mx_api('PUT', '/conf/agents/%s/Settings/CPUUsageRestraining' % Name, data=json_dumps(Value))
       else:
         raise MxException("Value of parameter '%s' must be from type dictionary" % Parameter)
 
@@ -1,8 +1,12 @@
 # Copyright 2018 Imperva. All rights reserved.
 
 from imperva_sdk.core import *
+from imperva_sdk.core import _clock
 import json
 
+# Seconds the index of the rules by agent is used if the connection has no TTL for AgentMonitoringRule objects (see MxConnection 'CacheTtl')
+AgentMonitoringRulesIndexTtl = 60
+
 class AgentMonitoringRule(MxObject):
   '''
   MX agent monitoring rule Class
@@ -21,23 +25,6 @@ class AgentMonitoringRule(MxObject):
 
   '''
 
-  # Store created Policy objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = AgentMonitoringRule._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'AgentMonitoringRule':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, PolicyType=None, Action=None, CustomPredicates=[], ApplyToAgent=[], ApplyToTag=[]):
     super(AgentMonitoringRule, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name, PolicyType=PolicyType, Action=Action)
@@ -223,7 +210,7 @@ class AgentMonitoringRule(MxObject):
       connection.create_tag(tag)
 
     try:
-      res = connection._mx_api('POST', '/conf/agentsMonitoringRules/%s' % Name, data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/agentsMonitoringRules/%s' % Name, data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating agent monitoring rule: %s" % e)
 
@@ -273,18 +260,52 @@ class AgentMonitoringRule(MxObject):
     jsonObj['apply-to-tag'] = objDict['ApplyToTag']
 
     try:
-      connection._mx_api('PUT', '/conf/agentsMonitoringRules/%s' % Name, data=json.dumps(jsonObj))
+      connection._mx_api('PUT', '/conf/agentsMonitoringRules/%s' % Name, data=json_dumps(jsonObj))
     except Exception as e:
       raise MxException("Failed updating agent monitoring rule %s: %s" % (Name, e))
     return True
 
   @staticmethod
-  def _get_all_agent_monitoring_rules_by_agent(connection, AgentName=None, AgentTags=[]):
+  def _get_all_agent_monitoring_rules_by_agent(connection, AgentName=None, AgentTags=[], Index=None):
     '''
     return a list of all the agent monitoring rules that connected to a given agent
+    `Index` is an index of the rules (see _get_agent_monitoring_rules_index) that is used for several agents
     '''
     validate_string(Name=AgentName)
-    allRules = connection.get_all_agent_monitoring_rule_dam_global_objects()
-    agentRules = list(filter(lambda rule:((set(AgentTags) & set(rule.ApplyToTag))
-                                                or AgentName in rule.ApplyToAgent), allRules))
-    return agentRules
\ No newline at end of file
+    index = Index or AgentMonitoringRule._get_agent_monitoring_rules_index(connection)
+    names = set(index['agents'].get(AgentName, ()))
+    for tag in AgentTags:
+      names.update(index['tags'].get(tag, ()))
+    # Same order as the rules list
+    return [index['rules'][name] for name in sorted(names, key=index['order'].get)]
+
+  @staticmethod
+  def _get_agent_monitoring_rules_index(connection):
+    '''
+    Returns the index of the agent monitoring rules by agent name and tag. The index is kept by the connection and the rules are listed again
+    after any change made through the connection (the API call generation changes) or after the TTL of AgentMonitoringRule objects, so changes made by other clients are seen.
+    {'rules': {name: rule}, 'order': {name: position in the rules list}, 'agents': {agent: set of rule names}, 'tags': {tag: set of rule names}}
+    '''
+    generation = connection._request_generation
+    stored = connection._agent_monitoring_rules_index
+    if stored is not None and stored[0] == generation and _clock() < stored[1]:
+      return stored[2]
+    ttl = connection._instances._get_ttl('AgentMonitoringRule')
+    if ttl is None:
+      ttl = AgentMonitoringRulesIndexTtl
+    expiration = _clock() + ttl
+    index = {'rules': {}, 'order': {}, 'agents': {}, 'tags': {}}
+    for rule in connection.get_all_agent_monitoring_rule_dam_global_objects():
+      AgentMonitoringRule._add_to_index(index, rule)
+    # The index isn't changed after it is stored, so concurrent callers can use it (if two build it at the same time, the last one is kept)
+    connection._agent_monitoring_rules_index = (generation, expiration, index)
+    return index
+
+  @staticmethod
+  def _add_to_index(Index, Rule):
+    Index['rules'][Rule.Name] = Rule
+    Index['order'].setdefault(Rule.Name, len(Index['order']))
+    for agent in Rule.ApplyToAgent:
+      Index['agents'].setdefault(agent, set()).add(Rule.Name)
+    for tag in Rule.ApplyToTag:
+      Index['tags'].setdefault(tag, set()).add(Rule.Name)
\ No newline at end of file
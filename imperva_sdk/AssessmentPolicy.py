@@ -8,23 +8,6 @@ class AssessmentPolicy(MxObject):
     MX Assessment Policy Class
     '''
 
-    # Store created DB Audit Policy objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = AssessmentPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for curr_obj in connection._instances:
-            if type(curr_obj).__name__ == 'AssessmentPolicy':
-                if curr_obj.Name == Name:
-                    return curr_obj
-        return None
     #
     def __init__(self, connection=None, Name=None, Description=None,
         DbType=None, PolicyTags=[], AdcKeywords=[], TestNames=[]):
@@ -44,7 +27,7 @@ class AssessmentPolicy(MxObject):
     #
     def __iter__(self):
         iters = {}
-        for field in dir(self):
+        for field in self._get_fields():
             if is_parameter.match(field):
                 variable_function = getattr(self, field)
                 iters[field] = variable_function
@@ -133,7 +116,7 @@ class AssessmentPolicy(MxObject):
         body['test-names'] = TestNames
 
         try:
-            connection._mx_api('POST', '/conf/assessment/policies/%s' % Name, data=json.dumps(body))
+            connection._mx_api('POST', '/conf/assessment/policies/%s' % Name, data=json_dumps(body))
         except Exception as e:
             raise MxException("Failed creating Assessment Policy '%s'" % e)
 
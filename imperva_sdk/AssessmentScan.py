@@ -11,24 +11,6 @@ class AssessmentScan(MxObject):
 
   '''
 
-  # Store created Assessment Scan objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(ClassType, *args, **kwargs):
-    obj_exists = AssessmentScan._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, ClassType).__new__(ClassType)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'AssessmentScan':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, Type=None, PolicyName=None, PreTest=None, PolicyTags=[],DbConnectionTags=[],ApplyTo=[], Scheduling=None):
     super(AssessmentScan, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name, Type=Type)
@@ -239,7 +221,7 @@ class AssessmentScan(MxObject):
       if Scheduling: body['scheduling'] = Scheduling
 
       if ApplyTo: body['apply-to'] = ApplyTo
-      connection._mx_api('POST', '/conf/assessment/scans/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/assessment/scans/%s' % Name, data=json_dumps(body))
       return AssessmentScan(connection=connection, Name=Name, Type=Type, PolicyName=PolicyName, PreTest=PreTest,
                             PolicyTags=PolicyTags, DbConnectionTags=DbConnectionTags,
                             ApplyTo=ApplyTo, Scheduling=Scheduling)
@@ -251,7 +233,7 @@ class AssessmentScan(MxObject):
     scan = connection.get_assessment_scan(Name=Name)
     if scan:
       connection._mx_api('DELETE', '/conf/assessment/scans/%s' % Name)
-      connection._instances.remove(scan)
+      connection._instances.discard(scan)
       del scan
     else:
       raise MxException("Scan does not exist")
@@ -269,6 +251,6 @@ class AssessmentScan(MxObject):
       if Value not in ['tag based','policy based']:
         raise MxException("Parameter '%s' must be 'tag based' or 'policy based'" %Parameter)
     body = {Parameter: Value}
-    connection._mx_api('PUT', '/conf/assessment/scans/%s' %Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/assessment/scans/%s' %Name, data=json_dumps(body))
 
     return True
\ No newline at end of file
@@ -5,22 +5,6 @@ class AssessmentTest(MxObject):
     '''
     MX Assessment Test Class
     '''
-     # Store created Assessment test objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = AssessmentTest._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for curr_obj in connection._instances:
-            if type(curr_obj).__name__ == 'AssessmentTest':
-                if curr_obj.Name == Name:
-                    return curr_obj
-        return None
     #
     def __init__(self, connection=None, Name=None, Description=None,
                     Severity=None, Category=None, ScriptType=None, OsType=None, DbType=None, RecommendedFix=None,
@@ -45,7 +29,7 @@ class AssessmentTest(MxObject):
     #
     def __iter__(self):
         iters = {}
-        for field in dir(self):
+        for field in self._get_fields():
             if is_parameter.match(field):
                 variable_function = getattr(self, field)
                 iters[field] = variable_function
@@ -140,7 +124,7 @@ class AssessmentTest(MxObject):
         body['additional-script'] = AdditionalScript
         body['result-layout'] = ResultsLayout
 
-        connection._mx_api('POST', '/conf/assessment/tests/%s' % Name, data=json.dumps(body))
+        connection._mx_api('POST', '/conf/assessment/tests/%s' % Name, data=json_dumps(body))
         return AssessmentTest(connection=connection, Name=Name, Description=Description, Severity=Severity,
                                            Category=Category, ScriptType=ScriptType, OsType=OsType, DbType=DbType,
                                            RecommendedFix=RecommendedFix, TestScript=TestScript, AdditionalScript=AdditionalScript,
@@ -12,24 +12,6 @@ class ClassificationProfile(MxObject):
 
     '''
 
-    # Store created Classification Scan objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(ClassType, *args, **kwargs):
-        obj_exists = ClassificationProfile._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, ClassType).__new__(ClassType)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for cur_obj in connection._instances:
-            if type(cur_obj).__name__ == 'ClassificationProfile':
-                if cur_obj.Name == Name:
-                    return cur_obj
-        return None
-
     def __init__(self, connection=None, Name=None, SiteName=None, DataTypes=[], AutoAcceptResults=None, ScanViewsAndSynonyms=None,
                  SaveSampleData=None, DataSampleAccuracy=None, ScanSystemSchemas=None, DbsAndSchemasUsage=None, DbsAndSchemas=[],
                  ExcludeTablesAndColumns=[], DelayBetweenQueries=None, NumberOfConcurrentDbConnection=None):
@@ -337,7 +319,7 @@ class ClassificationProfile(MxObject):
             if NumberOfConcurrentDbConnection: body['number-of-concurrent-db-connection'] = NumberOfConcurrentDbConnection
 
 
-            connection._mx_api('POST', '/conf/classification/profiles/%s' % Name, data=json.dumps(body))
+            connection._mx_api('POST', '/conf/classification/profiles/%s' % Name, data=json_dumps(body))
             return ClassificationProfile(connection=connection, Name=Name, SiteName=SiteName, DataTypes=DataTypes,
                                          AutoAcceptResults=AutoAcceptResults, ScanViewsAndSynonyms=ScanViewsAndSynonyms,
                                          SaveSampleData=SaveSampleData, DataSampleAccuracy=DataSampleAccuracy,
@@ -355,7 +337,7 @@ class ClassificationProfile(MxObject):
         profile = connection.get_classification_profile(Name=Name)
         if profile:
             connection._mx_api('DELETE', '/conf/classification/profiles/%s' % Name)
-            connection._instances.remove(profile)
+            connection._instances.discard(profile)
             del profile
         else:
             raise MxException("Profile does not exist")
@@ -365,6 +347,6 @@ class ClassificationProfile(MxObject):
     @staticmethod
     def _update_classification_profile(connection, Name=None, Parameter=None, Value=None):
         body = {Parameter: Value}
-        connection._mx_api('PUT', '/conf/classification/profiles/%s' % Name, data=json.dumps(body))
+        connection._mx_api('PUT', '/conf/classification/profiles/%s' % Name, data=json_dumps(body))
 
         return True
@@ -12,24 +12,6 @@ class ClassificationScan(MxObject):
 
   '''
 
-  # Store created Classification Scan objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(ClassType, *args, **kwargs):
-    obj_exists = ClassificationScan._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, ClassType).__new__(ClassType)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'ClassificationScan':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, ProfileName=None, ApplyTo=[], Scheduling=None):
     super(ClassificationScan, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name)
@@ -156,7 +138,7 @@ class ClassificationScan(MxObject):
 
       if ApplyTo: body['apply-to'] = ApplyTo
       if Scheduling: body['scheduling'] = Scheduling
-      connection._mx_api('POST', '/conf/classification/scans/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/classification/scans/%s' % Name, data=json_dumps(body))
       return ClassificationScan(connection=connection, Name=Name, ProfileName=ProfileName,
                                 ApplyTo=ApplyTo, Scheduling=Scheduling)
 
@@ -166,7 +148,7 @@ class ClassificationScan(MxObject):
     scan = connection.get_classification_scan(Name=Name)
     if scan:
       connection._mx_api('DELETE', '/conf/classification/scans/%s' % Name)
-      connection._instances.remove(scan)
+      connection._instances.discard(scan)
       del scan
     else:
       raise MxException("Scan does not exist")
@@ -175,7 +157,7 @@ class ClassificationScan(MxObject):
   @staticmethod
   def _update_classification_scan(connection, Name=None, Parameter=None, Value=None):
     body = {Parameter: Value}
-    connection._mx_api('PUT', '/conf/classification/scans/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/classification/scans/%s' % Name, data=json_dumps(body))
 
     return True
 
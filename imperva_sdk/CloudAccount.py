@@ -7,27 +7,9 @@ class CloudAccount(MxObject):
   '''
   MX Cloud Account Class
   '''
-  
-  # Store created Cloud account objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = CloudAccount._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for curr_obj in connection._instances:
-      if type(curr_obj).__name__ == 'CloudAccount':
-        if curr_obj.Name == Name:
-          return curr_obj
-    return None
 
   def __init__(self, connection=None, Name=None, PrivateKey=None, AccessKey=None, AwsRegion=None, AzureTenant=None, CloudProvider=None):
-  
+
     super(CloudAccount, self).__init__(connection=connection, Name=Name)
     self._Name = Name
     self._PrivateKey = PrivateKey
@@ -115,7 +97,7 @@ class CloudAccount(MxObject):
     body['cloudProvider'] = CloudProvider
 
     try:
-      connection._mx_api('POST', '/conf/cloudAccounts/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/cloudAccounts/%s' % Name, data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating cloud account: %s" % e)
     return CloudAccount(connection=connection, Name=Name, PrivateKey=PrivateKey, AccessKey=AccessKey,
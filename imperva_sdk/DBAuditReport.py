@@ -20,23 +20,6 @@ class DBAuditReport(MxObject):
 
    '''
 
-  # Store created Policy objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DBAuditReport._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'DBAuditReport':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, ReportFormat=None, ReportId = None, Columns=[],
                Filters=[], Policies=[],  Sorting=[], TimeFrame=[], Scheduling={}):
     super(DBAuditReport, self).__init__(connection=connection, Name=Name)
@@ -324,7 +307,7 @@ class DBAuditReport(MxObject):
     body['scheduling'] = Scheduling
 
     try:
-      res = connection._mx_api('POST', '/conf/dbauditreports', data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/dbauditreports', data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating DB audit report: %s" % e)
 
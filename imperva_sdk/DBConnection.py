@@ -7,24 +7,6 @@ from imperva_sdk.core import *
 
 class DBConnection(MxObject):
 
-    # Store created DB Audit Policy objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = DBConnection._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for curr_obj in connection._instances:
-            if type(curr_obj).__name__ == 'DBConnection':
-                if curr_obj.Name == Name:
-                    return curr_obj
-        return None
-
     def __init__(self, connection=None, Name=None, SiteName=None, ServerGroupName = None, ServiceName = None,
         UserName = None, Password = None, Port = None, IpAddress = None, DbName = None,
         ServerName = None, UserMapping = None, ConnectionString = None, ServiceDirectory = None,
@@ -56,7 +38,7 @@ class DBConnection(MxObject):
     #
     def __iter__(self):
         iters = {}
-        for field in dir(self):
+        for field in self._get_fields():
             if is_parameter.match(field):
                 variable_function = getattr(self, field)
                 iters[field] = variable_function
@@ -204,7 +186,7 @@ class DBConnection(MxObject):
         body['host-name'] = HostName;
 
         try:
-            connection._mx_api('POST', '/conf/dbServices/%s' % fullPath, data=json.dumps(body))
+            connection._mx_api('POST', '/conf/dbServices/%s' % fullPath, data=json_dumps(body))
         except Exception as e:
             raise MxException("Failed creating DB connection - " + str(e))
 
@@ -282,7 +264,7 @@ class DBConnection(MxObject):
             body['host-name'] = HostName
 
         try:
-            connection._mx_api('PUT', '/conf/dbServices/%s' % fullPath, data=json.dumps(body))
+            connection._mx_api('PUT', '/conf/dbServices/%s' % fullPath, data=json_dumps(body))
         except:
             raise MxException("Failed updating DB connection")
 
@@ -8,24 +8,6 @@ class DataEnrichmentPolicy(MxObject):
     MX Data Erichment Policy Class
     '''
 
-    # Store created DB Audit Policy objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = DataEnrichmentPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for curr_obj in connection._instances:
-            if type(curr_obj).__name__ == 'DataEnrichmentPolicy':
-                if curr_obj.Name == Name:
-                    return curr_obj
-        return None
-    
     def __init__(self, connection=None, Name=None, PolicyType=None,
         Rules = [],
         MatchCriteria=[], ApplyTo=[]):
@@ -112,7 +94,7 @@ class DataEnrichmentPolicy(MxObject):
         body['rules'] = Rules
         body['match-criteria'] = MatchCriteria
 
-        connection._mx_api('POST', '/conf/dataEnrichmentPolicies/%s' % Name, data=json.dumps(body))
+        connection._mx_api('POST', '/conf/dataEnrichmentPolicies/%s' % Name, data=json_dumps(body))
         return DataEnrichmentPolicy(connection=connection, Name=Name, PolicyType=PolicyType, ApplyTo=ApplyTo, Rules=Rules, MatchCriteria=MatchCriteria)
 
 
@@ -25,26 +25,6 @@ class DataType(MxObject):
 
   '''
 
-
-  # Store created datasets objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DataType._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'DataType':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
-
   def __init__(self, connection=None, Name=None, IsSensitive=True, Rules=[], TargetTableGroupName=None):
     super(DataType, self).__init__(connection=connection, Name=Name)
     self._IsSensitive = IsSensitive
@@ -177,7 +157,7 @@ class DataType(MxObject):
     body['sensitive'] = 'true' if IsSensitive else 'false'
 
     try:
-      res = connection._mx_api('POST', '/conf/dataTypes/%s' % Name, data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/dataTypes/%s' % Name, data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating data type: %s" % e)
 
@@ -9,25 +9,9 @@ class DbApplication(MxObject):
   >>> dba = ws.get_db_application("Default DB Application")
   >>> dba.Name = "DB application name"                                                                  
   '''
-  
-  # Store created DbApplication objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DbApplication._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], DbService=kwargs['DbService'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
 
-  @staticmethod
-  def _exists(connection=None, Name=None, Site=None, ServerGroup=None, DbService=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'DbApplication':
-        if cur_obj.Name == Name and cur_obj._Site == Site and cur_obj._ServerGroup == ServerGroup and cur_obj._DbService == DbService:
-          return cur_obj
-    return None
-  
+  _key_fields = ('Site', 'ServerGroup', 'DbService', 'Name')
+
   def __init__(self, connection=None, DbService=None, Name=None, ServerGroup=None, Site=None, TableGroupValues=[]):
     super(DbApplication, self).__init__(connection=connection, Name=Name)
     validate_string(DbService=DbService, Site=Site, ServerGroup=ServerGroup, Name=Name)
@@ -40,7 +24,7 @@ class DbApplication(MxObject):
   # Overriding iter (dict) function to handle profile and mappings properly
   def __iter__(self):
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       # Only variables should start with a capital letter
       if is_parameter.match(field):
         variable_function = getattr(self, field)
@@ -129,7 +113,7 @@ class DbApplication(MxObject):
         raise MxException("DB Application '%s' already exists" % Name)
     body = {}
     if TableGroupValues: body['tableGroupValues'] = TableGroupValues
-    connection._mx_api('POST', '/conf/dbApplications/%s/%s/%s/%s' % (Site, ServerGroup, DbService, Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/dbApplications/%s/%s/%s/%s' % (Site, ServerGroup, DbService, Name), data=json_dumps(body))
     dba = DbApplication(connection=connection, Name=Name, DbService=DbService, ServerGroup=ServerGroup, Site=Site, TableGroupValues=TableGroupValues)
     return dba
 
@@ -139,7 +123,7 @@ class DbApplication(MxObject):
     dba = connection.get_db_application(Site=Site, ServerGroup=ServerGroup, DbService=DbService, Name=Name)
     if dba:
       connection._mx_api('DELETE', '/conf/dbApplications/%s/%s/%s/%s' % (Site, ServerGroup, DbService, Name))
-      connection._instances.remove(dba)
+      connection._instances.discard(dba)
       del dba
     else:
       raise MxException("DB Application does not exist")
@@ -148,7 +132,7 @@ class DbApplication(MxObject):
   @staticmethod
   def _update_db_application(connection, DbService=None, ServerGroup=None, Site=None, Name=None, Parameter=None, Value=None):
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/dbApplications/%s/%s/%s/%s' % (Site, ServerGroup, DbService, Name), data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/dbApplications/%s/%s/%s/%s' % (Site, ServerGroup, DbService, Name), data=json_dumps(body))
     return True
 
 #  When we support profile, goto WebApplication and copy and modify the part from _get_profile onwards, as it is all about profile
@@ -39,24 +39,6 @@ class DbAuditPolicy(MxObject):
     MX DB Audit Policy Class
     '''
 
-    # Store created DB Audit Policy objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = DbAuditPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for cur_obj in connection._instances:
-            if type(cur_obj).__name__ == 'DbAuditPolicy':
-                if cur_obj.Name == Name:
-                    return cur_obj
-        return None
-
     # Method: __init__
     #-----------------------------------------------------------------------------------------------------
     # Inputs:
@@ -74,7 +56,7 @@ class DbAuditPolicy(MxObject):
     #
     def __iter__(self):
         iters = {}
-        for field in dir(self):
+        for field in self._get_fields():
             if is_parameter.match(field):
                 variable_function = getattr(self, field)
                 iters[field] = variable_function
@@ -163,7 +145,7 @@ class DbAuditPolicy(MxObject):
             }
             if Parameters: body = Parameters
 
-            connection._mx_api('POST', '/conf/auditPolicies/%s' % Name, data=json.dumps(body))
+            connection._mx_api('POST', '/conf/auditPolicies/%s' % Name, data=json_dumps(body))
 
             return DbAuditPolicy(connection=connection, Name=Name, Parameters=Parameters)
 
@@ -173,7 +155,7 @@ class DbAuditPolicy(MxObject):
         pol = connection.get_db_audit_policy(Name=Name)
         if pol:
             connection._mx_api('DELETE', '/conf/auditPolicies/%s' % Name)
-            connection._instances.remove(pol)
+            connection._instances.discard(pol)
             del pol
         else:
             raise MxException("Policy does not exist")
@@ -183,5 +165,5 @@ class DbAuditPolicy(MxObject):
     def _update_db_audit_policy(connection, Name=None, Parameter=None, Value=None):
       if Parameter in ['Parameters']:
          body = Value
-         connection._mx_api('PUT', '/conf/auditPolicies/%s' % Name, data=json.dumps(body))
+         connection._mx_api('PUT', '/conf/auditPolicies/%s' % Name, data=json_dumps(body))
       return True
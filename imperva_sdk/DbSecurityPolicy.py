@@ -5,23 +5,6 @@ from imperva_sdk.core import *
 
 class DbSecurityPolicy(MxObject):
 
-  # Store created Policy objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DbSecurityPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'DbServiceCustomPolicy':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-  
   def __init__(self, connection=None, Name=None, PolicyType=None, Enabled=None, Severity=None, Action=None, FollowedAction=None, ApplyTo=[], AutoApply=None, MatchCriteria=[]):
     super(DbSecurityPolicy, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name, Severity=Severity, Action=Action)
@@ -212,7 +195,7 @@ class DbSecurityPolicy(MxObject):
       if AutoApply: body['automatic-apply'] = AutoApply
       body['policy-type'] = PolicyType
       if ApplyTo: body['apply-to'] = ApplyTo
-      connection._mx_api('POST', '/conf/dbSecurityPolicies/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/dbSecurityPolicies/%s' % Name, data=json_dumps(body))
       return DbSecurityPolicy(connection=connection, Name=Name,
                               PolicyType=PolicyType, AutoApply=AutoApply,
                               Enabled=Enabled, Severity=Severity,
@@ -225,7 +208,7 @@ class DbSecurityPolicy(MxObject):
     pol = connection.get_db_security_policy(Name=Name)
     if pol:
       connection._mx_api('DELETE', '/conf/dbSecurityPolicies/%s' % Name)
-      connection._instances.remove(pol)
+      connection._instances.discard(pol)
       del pol
     else:
       raise MxException("Policy does not exist")
@@ -242,6 +225,6 @@ class DbSecurityPolicy(MxObject):
       if Value not in ['high', 'medium', 'low', 'informative', 'noAlert']:
         raise MxException("Parameter '%s' must be one of %s" % (Parameter, str(['high', 'medium', 'low', 'informative', 'noAlert'])))
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/dbSecurityPolicies/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/dbSecurityPolicies/%s' % Name, data=json_dumps(body))
     return True
 
@@ -19,24 +19,8 @@ class DbService(MxObject):
   >>> }
   >>>
   '''
-  
-  # Store created DB service objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DbService._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
 
-  @staticmethod
-  def _exists(connection=None, Site=None, ServerGroup=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'DbService':
-        if cur_obj.Name == Name and cur_obj._ServerGroup == ServerGroup and cur_obj._Site == Site:
-          return cur_obj
-    return None
+  _key_fields = ('Site', 'ServerGroup', 'Name')
 
   def __init__(self, connection=None, Name=None, ServerGroup=None, Site=None, Ports=[], DefaultApp=None, DbMappings=[], TextReplacement=[], LogCollectors=[], DbServiceType=None):
     super(DbService, self).__init__(connection=connection, Name=Name)
@@ -87,7 +71,7 @@ class DbService(MxObject):
   @Name.setter
   def Name(self, Name):
     validate_string(Name=Name)
-    body = json.dumps({'name': Name})
+    body = json_dumps({'name': Name})
     self._connection._mx_api('PUT', '/conf/dbServices/%s/%s/%s' % (self._Site, self._ServerGroup, self._Name), data=body)
     self._Name = Name
 
@@ -172,7 +156,7 @@ class DbService(MxObject):
     body = {}
     if DbServiceType: body['db-service-type'] = DbServiceType
     if Ports: body['ports'] = Ports
-    connection._mx_api('POST', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json_dumps(body))
     if DefaultApp: body['default-application'] = DefaultApp
 
     # Unfortunately, this cannot be done now - if we create a service, then the DB Applications do not yet
@@ -182,7 +166,7 @@ class DbService(MxObject):
     if TextReplacement: body['text-replacement'] = TextReplacement
     # Must remove the database service type for this to succeed
     if 'db-service-type' in body: del body['db-service-type']
-    connection._mx_api('PUT', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json_dumps(body))
 
     # store the log collectors
     for logColl in LogCollectors:
@@ -191,7 +175,7 @@ class DbService(MxObject):
         logColl['password'] = 'ChangeMe'
       if 'access-key' in logColl:
         logColl['secret-key'] = 'ChangeMe'
-      connection._mx_api('POST', '/conf/dbServices/%s/%s/%s/logCollectors' % (Site, ServerGroup, Name), data=json.dumps(logColl))
+      connection._mx_api('POST', '/conf/dbServices/%s/%s/%s/logCollectors' % (Site, ServerGroup, Name), data=json_dumps(logColl))
 
     return DbService(connection=connection, Name=Name, ServerGroup=ServerGroup, Site=Site, Ports=Ports, LogCollectors=LogCollectors, DbServiceType=DbServiceType)
 
@@ -209,7 +193,7 @@ class DbService(MxObject):
     if DbMappings:
       body = {}
       body['db-mappings'] = DbMappings
-      connection._mx_api('PUT', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json.dumps(body))
+      connection._mx_api('PUT', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json_dumps(body))
     return DbService(connection=connection, Name=Name, ServerGroup=ServerGroup, Site=Site, Ports=Ports, LogCollectors=LogCollectors, DbServiceType=DbServiceType)
 
   @staticmethod
@@ -218,7 +202,7 @@ class DbService(MxObject):
     dbs = connection.get_db_service(Name=Name, Site=Site, ServerGroup=ServerGroup)
     if dbs:
       connection._mx_api('DELETE', '/conf/dbServices/%s/%s/%s' % (Site, ServerGroup, Name))
-      connection._instances.remove(dbs)
+      connection._instances.discard(dbs)
       del dbs
     else:
       raise MxException("DB Service '%s' does not exist" % Name)
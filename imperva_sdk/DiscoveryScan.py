@@ -8,24 +8,6 @@ class DiscoveryScan(MxObject):
   MX Discovery Scan Class
   '''
 
-  # Store created Discovery Scan objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = DiscoveryScan._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for curr_obj in connection._instances:
-      if type(curr_obj).__name__ == 'DiscoveryScan':
-        if curr_obj.Name == Name:
-          return curr_obj
-    return None
-
   def __init__(self, connection=None, Name=None, ExistingSiteName=None, AutoAccept=None,
                ScanExistingServerGroups=None, ScanIpGroup=None, IpGroups=[], ScanCloudAccount=None,
                CloudAccounts=[], ServiceTypes=[], ResolveDns=None, ResolveVersions=None, EnhancedScanning=None,
@@ -63,7 +45,7 @@ class DiscoveryScan(MxObject):
   #
   def __iter__(self):
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       if is_parameter.match(field):
         variable_function = getattr(self, field)
         iters[field] = variable_function
@@ -210,7 +192,7 @@ class DiscoveryScan(MxObject):
     body['scheduling'] = Scheduling
 
     try:
-      connection._mx_api('POST', '/conf/discovery/scans/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/discovery/scans/%s' % Name, data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating Discovery scan: '%s'" % e)
 
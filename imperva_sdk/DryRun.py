@@ -0,0 +1,95 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import threading
+from imperva_sdk.core import *
+
+# Latency used for the duration estimate if no API call was measured
+DefaultDryRunLatency = 0.1
+
+class DryRunRecorder(object):
+  '''
+  Records the API calls of a dry run import (see :py:meth:`imperva_sdk.MxConnection.import_from_json`).
+  Calls that change the MX (POST, PUT, DELETE) are recorded and not sent. GET calls are sent, so the import can check which objects already exist,
+  and their latency is measured for the duration estimate.
+  Calls are recorded per import plan node, so the call list is in plan order even if nodes run concurrently.
+  The dry run uses its own identity map (`Instances`), so the objects it "creates" or changes are never shared with the rest of the connection.
+  '''
+  def __init__(self):
+    self.Instances = MxIdentityMap()
+    self._calls = []
+    self._node_calls = {}
+    self._latencies = []
+    self._lock = threading.Lock()
+    self._local = threading.local()
+
+  def begin(self, Node, Placeholder=None):
+    '''
+    Starts recording the calls of an import plan node (in the current thread).
+    :param Placeholder: function that is called on the first recorded change - it should store a placeholder for the object that would have been created, so the rest of the import can use it.
+    '''
+    self._local.node = Node
+    self._local.placeholder = Placeholder
+    with self._lock:
+      self._node_calls[Node] = []
+
+  def end(self):
+    self._local.node = None
+    self._local.placeholder = None
+
+  def _record(self, Method, Url, Data):
+    node = getattr(self._local, 'node', None)
+    call = {
+      'Method': Method,
+      'Url': Url,
+      'BodySize': len(Data) if Data else 0,
+      'Phase': node.Tags[0] if node and node.Tags else None
+    }
+    with self._lock:
+      if node:
+        self._node_calls[node].append(call)
+      else:
+        self._calls.append(call)
+
+  def read(self, Method, Url, Data, Latency):
+    ''' Records a call that was sent to the MX '''
+    self._record(Method, Url, Data)
+    with self._lock:
+      self._latencies.append(Latency)
+
+  def write(self, Method, Url, Data):
+    ''' Records a call instead of sending it to the MX '''
+    self._record(Method, Url, Data)
+    placeholder = getattr(self._local, 'placeholder', None)
+    if placeholder:
+      self._local.placeholder = None
+      placeholder()
+    # Most API calls that change the configuration return an empty body
+    return {}
+
+  def report(self, Plan, Log=[], Workers=1):
+    '''
+    :param Plan: The :py:class:`imperva_sdk.ImportPlan.ImportPlan` that ran in dry run mode
+    :rtype: dict
+    :return: 'Calls' (ordered list of API calls), 'Phases' (number of calls per phase and method), 'AverageLatency', 'EstimatedDuration' (seconds) and 'Log' (import log)
+    '''
+    calls = list(self._calls)
+    for node in Plan.Nodes:
+      calls += self._node_calls.get(node, [])
+    phases = {}
+    for call in calls:
+      phase = phases.setdefault(call['Phase'] or 'other', {})
+      phase[call['Method']] = phase.get(call['Method'], 0) + 1
+    if self._latencies:
+      latency = sum(self._latencies) / len(self._latencies)
+    else:
+      latency = DefaultDryRunLatency
+    # Calls outside of the plan run first, then the plan can't finish before its longest dependency chain or before the workers go through all calls
+    plan_duration = latency * sum(len(self._node_calls.get(node, [])) for node in Plan.Nodes) / max(1, Workers)
+    critical_path = Plan.critical_path(lambda node: latency * len(self._node_calls.get(node, [])))
+    return {
+      'Calls': calls,
+      'Phases': phases,
+      'AverageLatency': latency,
+      'EstimatedDuration': latency * len(self._calls) + max(plan_duration, critical_path),
+      'Log': Log
+    }
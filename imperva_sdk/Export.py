@@ -1,5 +1,5 @@
 import imperva_sdk
-import getopt, sys
+import getopt, sys, os
 
 
 def main():
@@ -9,8 +9,8 @@ def main():
   # - further arguments
   argumentList = fullCmdArguments[1:]
 
-  unixOptions = "ho:s:u:p:a:"
-  gnuOptions = ["help", "output", "server", "username", "password", "agents"]
+  unixOptions = "ho:s:u:p:a:w:c"
+  gnuOptions = ["help", "output", "server", "username", "password", "agents", "workers", "compact"]
 
   try:
       arguments, values = getopt.getopt(argumentList, unixOptions, gnuOptions)
@@ -20,6 +20,8 @@ def main():
       sys.exit(2)
 
   agentsOnly = False
+  workers = 1
+  compact = False
   # evaluate given options
   for currentArgument, currentValue in arguments:
       if currentArgument in ("-s", "--server"):
@@ -29,11 +31,15 @@ def main():
       elif currentArgument in ("-p", "--password"):
           password = currentValue
       elif currentArgument in ("-h", "--help"):
-          print ("Please use the following syntax: Export.py -o <output file> -s <source mx IP> -u <username> -p <password>")
+          print ("Please use the following syntax: Export.py -o <output file> -s <source mx IP> -u <username> -p <password> -w <parallel workers> [-c (compact JSON)]")
       elif currentArgument in ("-o", "--output"):
           outputFile = currentValue
       elif currentArgument in ("-a", "--agents"):
           agentsOnly=True
+      elif currentArgument in ("-w", "--workers"):
+          workers = int(currentValue)
+      elif currentArgument in ("-c", "--compact"):
+          compact = True
 
   try :
       source_mx = imperva_sdk.MxConnection(Host=server, Username=username,Password=password)
@@ -42,21 +48,31 @@ def main():
           source_export = source_mx.export_agent_configurations()
       else: #default - export all
           print(("About to export Full configuration from (%s)") % (server))
-          source_export = source_mx.export_to_json(Discard=['web_application_custom', 'web_service_custom','http_protocol_signatures','web_profile'])
+          # The full export is streamed to the output file instead of being built in memory
+          source_export = None
+          try:
+              source_mx.export_to_file(outputFile, Discard=['web_application_custom', 'web_service_custom','http_protocol_signatures','web_profile'], Workers=workers, Compact=compact)
+              print(("Export was successfully written to output file (%s)") % (outputFile))
+          except (IOError, OSError) as e:
+              print (("Error writing export to output file (%s)") % (outputFile))
 
   except RuntimeError as err:
       print (("Error exporting from (%s)") % (server))
       print (err)
       sys.exit(2)
 
-  try:
-      # json.dump() return ASCII-only by default so no encoding is needed
-      with open(outputFile, 'w') as f:
-          f.write(source_export)
-          f.close()
-      print(("Export was successfully written to output file (%s)") % (outputFile))
-  except Exception as e:
-      print (("Error writing export to output file (%s)") % (outputFile))
+  if source_export is not None:
+      try:
+          # json.dump() return ASCII-only by default so no encoding is needed
+          # Write a temporary file first, so an error doesn't leave a truncated output file
+          tempFile = outputFile + '.tmp'
+          with open(tempFile, 'w') as f:
+              f.write(source_export)
+              f.close()
+          getattr(os, 'replace', os.rename)(tempFile, outputFile)
+          print(("Export was successfully written to output file (%s)") % (outputFile))
+      except Exception as e:
+          print (("Error writing export to output file (%s)") % (outputFile))
 
   source_mx.logout()
 
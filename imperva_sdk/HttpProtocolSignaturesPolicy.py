@@ -9,23 +9,6 @@ class HttpProtocolSignaturesPolicy(MxObject):
 
   '''
 
-  # Store created Web Service Custom Policy objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = HttpProtocolSignaturesPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'HttpProtocolSignaturesPolicy':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-  
   def __init__(self, connection=None, Name=None, SendToCd=None, DisplayResponsePage=None, ApplyTo=[], Rules=[], Exceptions=[]):
     super(HttpProtocolSignaturesPolicy, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name)
@@ -38,7 +21,7 @@ class HttpProtocolSignaturesPolicy(MxObject):
   # Override the MxObject __iter__ function to print ApplyTo WebService objects as dictionaries    
   def __iter__(self):
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       if is_parameter.match(field):
         variable_function = getattr(self, field)
         if field == 'ApplyTo':
@@ -258,12 +241,12 @@ class HttpProtocolSignaturesPolicy(MxObject):
           raise MxException("Bad 'ApplyTo' parameter")
       if ApplyToNames: body['applyTo'] = ApplyToNames
       try:
-        connection._mx_api('POST', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json.dumps(body))
+        connection._mx_api('POST', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json_dumps(body))
       except:
         # We have a version that supports this policy but without exceptions, so this is a little hack for export/import
         del body['exceptions']
         Exceptions = []
-        connection._mx_api('POST', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json.dumps(body))
+        connection._mx_api('POST', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json_dumps(body))
       return HttpProtocolSignaturesPolicy(connection=connection, Name=Name, SendToCd=SendToCd, DisplayResponsePage=DisplayResponsePage, ApplyTo=ApplyToObjects, Rules=Rules, Exceptions=Exceptions)
   @staticmethod
   def _delete_http_protocol_signatures_policy(connection, Name=None):
@@ -271,7 +254,7 @@ class HttpProtocolSignaturesPolicy(MxObject):
     pol = connection.get_http_protocol_signatures_policy(Name=Name)
     if pol:
       connection._mx_api('DELETE', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name)
-      connection._instances.remove(pol)
+      connection._instances.discard(pol)
       del pol
     else:
       raise MxException("Policy does not exist")
@@ -282,6 +265,6 @@ class HttpProtocolSignaturesPolicy(MxObject):
       if Value != True and Value != False:
         raise MxException("Parameter '%s' must be True or False" % Parameter)
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/policies/security/httpProtocolSignaturesPolicies/%s' % Name, data=json_dumps(body))
     return True
 
@@ -23,8 +23,8 @@ def main():
   # - further arguments
   argumentList = fullCmdArguments[1:]
 
-  unixOptions = "hi:l:s:u:p:v:a:"
-  gnuOptions = ["help", "input", "logfile", "server", "username", "password", "verbose", "agents"]
+  unixOptions = "hi:l:s:u:p:v:a:w:"
+  gnuOptions = ["help", "input", "logfile", "server", "username", "password", "verbose", "agents", "workers"]
 
   try:
       arguments, values = getopt.getopt(argumentList, unixOptions, gnuOptions)
@@ -36,6 +36,7 @@ def main():
   # default verbose will output only the errors that occure during import
   verbose = VERBOSITY_LEVEL.ERRORS_ONLY
   agentsOnly = False
+  workers = 1
 
   # evaluate given options
   for currentArgument, currentValue in arguments:
@@ -46,7 +47,7 @@ def main():
       elif currentArgument in ("-p", "--password"):
           password = currentValue
       elif currentArgument in ("-h", "--help"):
-          print ("Please use the following syntax: Import.py -i <input file> -l <log file> -s <target mx IP> -u <username> -p <password> -v <verbose>")
+          print ("Please use the following syntax: Import.py -i <input file> -l <log file> -s <target mx IP> -u <username> -p <password> -v <verbose> -w <parallel workers>")
       elif currentArgument in ("-i", "--input"):
           inputFile = currentValue
       elif currentArgument in ("-l", "--logfile"):
@@ -55,6 +56,8 @@ def main():
           verbose = VERBOSITY_LEVEL.ALL if currentValue == '1' else VERBOSITY_LEVEL.ERRORS_ONLY
       elif currentArgument in ("-a", "--agents"):
           agentsOnly = True
+      elif currentArgument in ("-w", "--workers"):
+          workers = int(currentValue)
   try :
       target_mx = imperva_sdk.MxConnection(Host=server, Username=username, Password=password)
   except Exception as e:
@@ -62,15 +65,16 @@ def main():
       sys.exit(2)
 
 
-  try:
-      # json.dump() return ASCII-only by default so no encoding is needed
-      with open(inputFile, 'r') as f:
-          loaded_data = json.load(f)
-          loaded_data_2 = dict_discard(loaded_data,['ProtectedIps','ApplyToAgent'])
-          json_string = json.dumps(loaded_data_2, indent=4, sort_keys=True, separators=(',', ': '))
+  if agentsOnly:
+    try:
+        # json.dump() return ASCII-only by default so no encoding is needed
+        with open(inputFile, 'r') as f:
+            loaded_data = json.load(f)
+            loaded_data_2 = dict_discard(loaded_data,['ProtectedIps','ApplyToAgent'])
+            json_string = json.dumps(loaded_data_2, indent=4, sort_keys=True, separators=(',', ': '))
 
-  except RuntimeError as err:
-      print ("Error loading from file {0}: {1}", inputFile, err)
+    except RuntimeError as err:
+        print ("Error loading from file {0}: {1}", inputFile, err)
 
   try:
       if agentsOnly:
@@ -78,7 +82,8 @@ def main():
           log = target_mx.import_agent_configurations(Json=json_string)
       else:  # default - export all
           print(("About to import Full configuration to (%s)") % (server))
-          log = target_mx.import_from_json(Json=json_string)
+          # The export file is parsed incrementally, so it is never loaded into memory as a whole
+          log = target_mx.import_from_file(inputFile, Workers=workers, Discard=['ProtectedIps','ApplyToAgent'])
 
   except RuntimeError as err:
       print("Error in import: {0}", err)
@@ -0,0 +1,86 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import os
+import json
+import hashlib
+import threading
+from imperva_sdk.core import *
+
+def import_hash(*Values):
+  ''' Returns a hash of the content of an import operation (function name, parameters, etc.) '''
+  content = json.dumps(Values, sort_keys=True, separators=(',', ':'), default=str)
+  return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+class ImportJournal(object):
+  '''
+  On-disk journal of completed import operations, used to resume an interrupted import (see :py:meth:`imperva_sdk.MxConnection.import_from_json`).
+  The journal is a JSON lines file. The first line is a header with the MX host the import runs on ({'Host': host}).
+  Each other line holds the operation key (object identity, e.g. 'sites/site 1/server_groups/sg 1'), a hash of the operation content and the operation log entries.
+  An operation is only skipped on resume if both its key and its content hash match, so changed objects are imported again.
+  Lines are flushed and synced to disk as soon as an operation completes.
+
+  :param Path: Path of the journal file (created if it doesn't exist)
+  :param ReadOnly: Set to `True` to only skip completed operations without recording new ones (e.g. in dry run mode)
+  :param Host: MX host of the import. A journal of an import to another MX is refused (MxException) - its operations weren't completed on this MX
+  '''
+  def __init__(self, Path=None, ReadOnly=False, Host=None):
+    self.Path = Path
+    self.ReadOnly = ReadOnly
+    self.Host = Host
+    self._completed = {}
+    self._lock = threading.Lock()
+    self._file = None
+    self._header = False
+    if os.path.exists(Path):
+      with open(Path, 'r') as f:
+        for line in f:
+          try:
+            entry = json.loads(line)
+            if not self._header:
+              if entry.get('Host') != Host:
+                raise MxException("Import journal '%s' is of an import to '%s', not to '%s' - use another journal file" % (Path, entry.get('Host'), Host))
+              self._header = True
+              continue
+            self._completed[(entry['Key'], entry['Hash'])] = entry['Log']
+          except (ValueError, KeyError, TypeError, AttributeError):
+            # The last line can be incomplete if the import was killed while writing it
+            pass
+
+  def __len__(self):
+    return len(self._completed)
+
+  def get(self, Key, Hash):
+    '''
+    :rtype: list of dict
+    :return: Log entries of the completed operation or None if the operation wasn't completed
+    '''
+    return self._completed.get((Key, Hash))
+
+  def add(self, Key, Hash, Log=[]):
+    ''' Records a completed operation '''
+    if self.ReadOnly:
+      return
+    with self._lock:
+      line = json.dumps({'Key': Key, 'Hash': Hash, 'Log': Log}, default=str) + '\n'
+      # Checked with the lock held, so only one line gets the header when import workers add operations concurrently
+      if not self._header:
+        line = json.dumps({'Host': self.Host}) + '\n' + line
+      if self._file is None:
+        self._file = open(self.Path, 'a+')
+        # Don't append to an incomplete last line
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() > 0:
+          self._file.seek(self._file.tell() - 1)
+          if self._file.read(1) != '\n':
+            self._file.write('\n')
+      self._file.write(line)
+      self._file.flush()
+      os.fsync(self._file.fileno())
+      self._header = True
+      self._completed[(Key, Hash)] = Log
+
+  def close(self):
+    with self._lock:
+      if self._file is not None:
+        self._file.close()
+        self._file = None
@@ -0,0 +1,206 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from imperva_sdk.core import *
+
+#
+# Object types that must be fully imported before other object types can be imported.
+# Keys and values are node tags (see ImportPlan.add). A node waits for all nodes that carry one of its dependency tags.
+#
+ImportDependencies = {
+  'global_object:data_type_dam': ['global_object:table_group_dam'],
+  'global_object:agent_monitoring_rule_dam': ['global_object:data_type_dam', 'global_object:ip_group_dam', 'global_object:lookup_data_set_dam'],
+  # DB applications reference table groups
+  'sites': ['global_object:table_group_dam'],
+  # Policies reference web/db services (ApplyTo), action sets (FollowedAction) and global objects
+  'policy': ['sites', 'action_sets', 'global_object'],
+  'policy:assessment': ['assessment_tests'],
+  'classification_profiles': ['sites', 'global_object:data_type_dam'],
+  'dam_report': ['policy'],
+  'das_object': ['sites', 'global_object', 'policy', 'classification_profiles'],
+}
+
+class ImportNode(object):
+  '''
+  A single import operation (usually one create function call) in an :py:class:`ImportPlan`.
+  `Function` is called with the node and returns a list of log entries. It can store the created object in `node.Result` for dependent nodes.
+  `Key` (object identity) and `Hash` (operation content) identify the operation in an :py:class:`imperva_sdk.ImportJournal.ImportJournal`.
+  If the operation is skipped because it was already completed, `Resolve` is called to get the result when a dependent node needs it.
+  '''
+  def __init__(self, Function=None, Tags=[], DependsOn=[], Index=0, Key=None, Hash=None, Resolve=None):
+    self.Function = Function
+    self.Tags = list(Tags)
+    self.DependsOn = list(DependsOn)
+    self.Index = Index
+    self.Key = Key
+    self.Hash = Hash
+    self.Resolve = Resolve
+    self.Skipped = False
+    self.Result = None
+    self.Log = []
+
+  def __lt__(self, other):
+    return self.Index < other.Index
+
+  def run(self, Journal=None):
+    if Journal is not None and self.Key is not None:
+      log = Journal.get(self.Key, self.Hash)
+      if log is not None:
+        self.Skipped = True
+        self.Log = log
+        return self
+    self.Log = self.Function(self) or []
+    if Journal is not None and self.Key is not None and all(entry.get('Result') == 'SUCCESS' for entry in self.Log):
+      Journal.add(self.Key, self.Hash, self.Log)
+    return self
+
+  def get_result(self):
+    ''' Returns the node result, resolving it if the node was skipped '''
+    if self.Result is None and self.Skipped and self.Resolve:
+      self.Result = self.Resolve()
+    return self.Result
+
+
+class ImportPlan(object):
+  '''
+  Dependency graph of import operations.
+  Nodes run after the nodes they depend on (explicitly or by tag, see :py:data:`ImportDependencies`).
+  Independent nodes can run concurrently. The log is always returned in the order the nodes were added to the plan.
+  '''
+  def __init__(self, Dependencies=ImportDependencies):
+    self.Nodes = []
+    self.Dependencies = Dependencies
+
+  def add(self, Function, Tags=[], DependsOn=[], Key=None, Hash=None, Resolve=None):
+    '''
+    Adds an operation to the plan.
+    :param Function: callable that receives the node and returns a list of log entries
+    :param Tags: list of tags (e.g. ['policy', 'policy:web_service_custom']) used for type dependencies
+    :param DependsOn: list of :py:class:`ImportNode` that must run before this node (e.g. the parent object)
+    :param Key: Object identity for the import journal (nodes without a key are never skipped)
+    :param Hash: Operation content hash for the import journal
+    :param Resolve: callable that returns the node result if the node is skipped (e.g. gets the existing object)
+    :rtype: ImportNode
+    '''
+    node = ImportNode(Function=Function, Tags=Tags, DependsOn=[dep for dep in DependsOn if dep], Index=len(self.Nodes), Key=Key, Hash=Hash, Resolve=Resolve)
+    self.Nodes.append(node)
+    return node
+
+  def _resolve_dependencies(self):
+    tagged = {}
+    for node in self.Nodes:
+      for tag in node.Tags:
+        tagged.setdefault(tag, []).append(node)
+    dependencies = {}
+    for node in self.Nodes:
+      deps = set(node.DependsOn)
+      for tag in node.Tags:
+        for dep_tag in self.Dependencies.get(tag, []):
+          deps.update(tagged.get(dep_tag, []))
+      deps.discard(node)
+      dependencies[node] = deps
+    return dependencies
+
+  def run(self, Workers=1, Journal=None):
+    '''
+    Runs all of the nodes in dependency order.
+    :param Workers: Number of nodes that can run concurrently (default=1)
+    :param Journal: :py:class:`imperva_sdk.ImportJournal.ImportJournal` - completed nodes are recorded and nodes that were already completed are skipped
+    :rtype: list of dict
+    :return: Log entries of all nodes (in plan order)
+    '''
+    dependencies = self._resolve_dependencies()
+    dependents = dict((node, []) for node in self.Nodes)
+    remaining = {}
+    for node, deps in dependencies.items():
+      remaining[node] = len(deps)
+      for dep in deps:
+        dependents[dep].append(node)
+    # Ready nodes are always started in plan order, so a serial run follows the order of the plan
+    ready = [node for node in self.Nodes if remaining[node] == 0]
+    heapq.heapify(ready)
+    done_count = 0
+
+    def release(node):
+      for dependent in dependents[node]:
+        remaining[dependent] -= 1
+        if remaining[dependent] == 0:
+          heapq.heappush(ready, dependent)
+
+    if not Workers or Workers <= 1:
+      while ready:
+        node = heapq.heappop(ready)
+        node.run(Journal)
+        done_count += 1
+        release(node)
+    else:
+      pool = ThreadPoolExecutor(max_workers=Workers)
+      try:
+        running = {}
+        while ready or running:
+          while ready:
+            node = heapq.heappop(ready)
+            running[pool.submit(node.run, Journal)] = node
+          finished, not_finished = wait(list(running), return_when=FIRST_COMPLETED)
+          for future in finished:
+            node = running.pop(future)
+            future.result()
+            done_count += 1
+            release(node)
+      finally:
+        pool.shutdown(wait=True)
+
+    if done_count != len(self.Nodes):
+      raise MxException("Import plan has circular dependencies")
+
+    log = []
+    for node in self.Nodes:
+      log += node.Log
+    return log
+
+  def critical_path(self, Cost):
+    '''
+    Returns the total cost of the longest chain of dependent nodes - the shortest time the plan can run in with unlimited workers.
+    :param Cost: function that returns the cost (e.g. duration) of a node
+    '''
+    dependencies = self._resolve_dependencies()
+    finish = {}
+    for node in self.Nodes:
+      # Iterative depth first walk, dependencies can be added to the plan after their dependents.
+      # A node is finished after all of its dependencies (True entries), nodes on the current path are skipped (circular dependencies)
+      stack = [(node, False)]
+      path = set()
+      while stack:
+        cur_node, deps_finished = stack.pop()
+        if cur_node in finish:
+          continue
+        if deps_finished:
+          finish[cur_node] = Cost(cur_node) + max([finish.get(dep, 0) for dep in dependencies[cur_node]] or [0])
+          path.discard(cur_node)
+        elif cur_node not in path:
+          path.add(cur_node)
+          stack.append((cur_node, True))
+          stack += [(dep, False) for dep in dependencies[cur_node] if dep not in finish]
+    return max(list(finish.values()) or [0])
+
+def sort_import_types(Type, ObjectTypes, Dependencies=ImportDependencies):
+  '''
+  Sorts object types of the same kind (e.g. global object types) so each type comes after the types it depends on.
+  Used when object types are imported one after the other instead of in a single :py:class:`ImportPlan`.
+  :param Type: Object kind (e.g. 'global_object')
+  :param ObjectTypes: list of object types (e.g. ['data_type_dam', 'table_group_dam'])
+  :rtype: list of string
+  '''
+  ordered = []
+  prefix = Type + ':'
+  def visit(object_type, path):
+    if object_type in ordered or object_type in path:
+      return
+    for dep_tag in Dependencies.get(prefix + object_type, []):
+      if dep_tag.startswith(prefix) and dep_tag[len(prefix):] in ObjectTypes:
+        visit(dep_tag[len(prefix):], path + [object_type])
+    ordered.append(object_type)
+  for object_type in ObjectTypes:
+    visit(object_type, [])
+  return ordered
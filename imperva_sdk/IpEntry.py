@@ -7,20 +7,9 @@ class IpEntry(MxObject):
   '''
   MX Ip Entry Class
   '''
-  
-  # Store created Ip entry objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj = super(MxObject, Type).__new__(Type)
-    kwargs['connection']._instances.append(obj)
-    return obj
-  
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for curr_obj in connection._instances:
-      if type(curr_obj).__name__ == 'IpEntry':
-        if curr_obj.Name == Name:
-          return curr_obj
-    return None
+
+  # Ip entries are not unique by name, so they aren't stored in the connection identity map
+  _key_fields = None
 
   def __init__(self, connection=None, Name=None, EntryType=None,
                       IpAddressFrom=None, IpAddressTo=None,
@@ -6,27 +6,9 @@ class IpGroup(MxObject):
   '''
   MX Ip Group Class
   '''
-  
-  # Store created Ip group objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = IpGroup._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for curr_obj in connection._instances:
-      if type(curr_obj).__name__ == 'IpGroup':
-        if curr_obj.Name == Name:
-          return curr_obj
-    return None
 
   def __init__(self, connection=None, Name=None, Entries=[]):
-  
+
     super(IpGroup, self).__init__(connection=connection, Name=Name)
     self._Name = Name
     self._Entries = MxList(Entries)
@@ -89,7 +71,7 @@ class IpGroup(MxObject):
     body = {}
     body['entries'] = Entries
 
-    connection._mx_api('POST', '/conf/ipGroups/%s' % Name, data=json.dumps(body))
+    connection._mx_api('POST', '/conf/ipGroups/%s' % Name, data=json_dumps(body))
     return IpGroup(connection=connection, Name=Name, Entries=Entries)
   
   
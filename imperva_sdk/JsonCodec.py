@@ -0,0 +1,85 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+#
+# JSON encoding and decoding of API requests, responses and exports.
+# A faster JSON library is used if it is installed (orjson, then ujson), otherwise the standard library.
+# Values the faster library can't handle (e.g. integers above 64 bits) fall back to the standard library.
+#
+import json
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+try:
+  import ujson
+except ImportError:
+  ujson = None
+
+JsonBackends = ['orjson', 'ujson', 'json']
+
+def _orjson_dumps(Value, SortKeys=False):
+  options = orjson.OPT_NON_STR_KEYS
+  if SortKeys:
+    options |= orjson.OPT_SORT_KEYS
+  return orjson.dumps(Value, option=options)
+
+def _ujson_dumps(Value, SortKeys=False):
+  return ujson.dumps(Value, sort_keys=SortKeys, ensure_ascii=True, escape_forward_slashes=False)
+
+def _json_dumps(Value, SortKeys=False):
+  return json.dumps(Value, sort_keys=SortKeys, separators=(',', ':'))
+
+_backend = None
+
+def set_json_backend(Name=None):
+  '''
+  Sets the JSON library of imperva_sdk.
+  :type Name: string
+  :param Name: 'orjson', 'ujson' or 'json' (standard library). None for the fastest library that is installed.
+  '''
+  global _backend
+  if Name is None:
+    Name = [name for name in JsonBackends if name == 'json' or globals()[name] is not None][0]
+  if Name not in JsonBackends:
+    raise ValueError("Unknown JSON backend '%s' (must be one of %s)" % (Name, JsonBackends))
+  if Name != 'json' and globals()[Name] is None:
+    raise ValueError("JSON backend '%s' is not installed" % Name)
+  _backend = Name
+
+def get_json_backend():
+  ''' Returns the name of the JSON library in use ('orjson', 'ujson' or 'json') '''
+  return _backend
+
+set_json_backend()
+
+def json_loads(Data):
+  '''
+  Decodes JSON from a string or from UTF-8 bytes (e.g. an API response body, without decoding it to text first).
+  Raises ValueError for invalid JSON, like json.loads.
+  '''
+  try:
+    if _backend == 'orjson':
+      return orjson.loads(Data)
+    if _backend == 'ujson':
+      return ujson.loads(Data)
+  except ValueError:
+    pass
+  if isinstance(Data, bytes) and not isinstance(Data, str):
+    Data = Data.decode('utf-8')
+  return json.loads(Data)
+
+def json_dumps(Value, SortKeys=False):
+  '''
+  Encodes a value to compact JSON text (e.g. an API request body).
+  The text is ASCII-only like json.dumps, so it can be sent as a request body as is.
+  '''
+  try:
+    if _backend == 'orjson':
+      # orjson doesn't escape non-ASCII characters (UnicodeDecodeError) - let the standard library do it
+      return _orjson_dumps(Value, SortKeys=SortKeys).decode('ascii')
+    elif _backend == 'ujson':
+      return _ujson_dumps(Value, SortKeys=SortKeys)
+  except (TypeError, ValueError, OverflowError):
+    pass
+  return _json_dumps(Value, SortKeys=SortKeys)
@@ -0,0 +1,155 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import re
+from imperva_sdk.core import *
+
+# A complete JSON string, a bracket or (when the string continues past the end of the buffer) a lone quote
+_json_token = re.compile(br'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"')
+_json_literal = re.compile(br'[^,:\]}\s]*')
+_json_whitespace = re.compile(br'\s*')
+
+class JsonStreamReader(object):
+  '''
+  Reads a large JSON document (e.g. an imperva_sdk export file) without loading all of it into memory.
+  Containers are scanned for the offsets of their members and only the members that are needed are parsed, one at a time.
+
+  >>> with open('export.json', 'rb') as f:
+  ...   reader = JsonStreamReader(f)
+  ...   sections = reader.index()
+  ...   for key, site in reader.iter_items(sections['sites'][0]):
+  ...     print(site['Name'])
+
+  :param File: file object opened in binary mode (must support seek)
+  :param ChunkSize: Number of bytes to read from the file at a time
+  '''
+  def __init__(self, File=None, ChunkSize=1024*1024):
+    self._file = File
+    self._chunk_size = ChunkSize
+    self._file.seek(0, 2)
+    self._size = self._file.tell()
+    self._file.seek(0)
+    # The buffer holds the file bytes from offset self._start
+    self._buf = b''
+    self._start = 0
+
+  def _fill(self, Offset, Size):
+    ''' Makes sure the buffer holds 'Size' bytes from 'Offset' (or up to the end of the file) '''
+    end = self._start + len(self._buf)
+    if self._start <= Offset and Offset + Size <= end:
+      return
+    if self._start <= Offset <= end:
+      self._buf = self._buf[Offset - self._start:]
+    else:
+      self._buf = b''
+    self._start = Offset
+    self._file.seek(Offset + len(self._buf))
+    while len(self._buf) < Size and self._start + len(self._buf) < self._size:
+      data = self._file.read(max(self._chunk_size, len(self._buf)))
+      if not data:
+        break
+      self._buf += data
+
+  def _char(self, Offset):
+    self._fill(Offset, 1)
+    return self._buf[Offset - self._start:Offset - self._start + 1]
+
+  def _bytes(self, Start, End):
+    self._fill(Start, End - Start)
+    return self._buf[Start - self._start:End - self._start]
+
+  def _skip_whitespace(self, Offset):
+    while True:
+      self._fill(Offset, 1)
+      match = _json_whitespace.match(self._buf, Offset - self._start)
+      Offset = self._start + match.end()
+      if Offset < self._start + len(self._buf) or Offset >= self._size:
+        return Offset
+
+  def _skip_value(self, Offset):
+    ''' Returns the offset right after the JSON value that starts at 'Offset' '''
+    first = self._char(Offset)
+    if not first:
+      raise MxException("Invalid JSON - unexpected end of file")
+    if first not in (b'{', b'[', b'"'):
+      self._fill(Offset, 1024)
+      match = _json_literal.match(self._buf, Offset - self._start)
+      if match.end() == match.start():
+        raise MxException("Invalid JSON - unexpected character at offset %d" % Offset)
+      return self._start + match.end()
+    depth = 0
+    while True:
+      self._fill(Offset, 1)
+      match = _json_token.search(self._buf, Offset - self._start)
+      if match is None:
+        if self._start + len(self._buf) >= self._size:
+          raise MxException("Invalid JSON - unexpected end of file")
+        # Nothing interesting in the rest of the buffer
+        Offset = self._start + len(self._buf)
+        continue
+      token = match.group()
+      if token == b'"':
+        # The string continues past the end of the buffer - read more of it
+        Offset = self._start + match.start()
+        if self._start + len(self._buf) >= self._size:
+          raise MxException("Invalid JSON - unterminated string at offset %d" % Offset)
+        self._fill(Offset, self._start + len(self._buf) - Offset + self._chunk_size)
+        continue
+      Offset = self._start + match.end()
+      if token in (b'{', b'['):
+        depth += 1
+      elif token in (b'}', b']'):
+        depth -= 1
+      if depth == 0:
+        return Offset
+
+  def _iter_members(self, Offset):
+    ''' Yields (key, start, end) of the members of the object (or array, with key None) that starts at 'Offset' '''
+    Offset = self._skip_whitespace(Offset)
+    opening = self._char(Offset)
+    if opening == b'{':
+      closing = b'}'
+    elif opening == b'[':
+      closing = b']'
+    else:
+      raise MxException("Invalid JSON - expected object or array at offset %d" % Offset)
+    Offset = self._skip_whitespace(Offset + 1)
+    if self._char(Offset) == closing:
+      return
+    while True:
+      key = None
+      if closing == b'}':
+        end = self._skip_value(Offset)
+        key = json_loads(self._bytes(Offset, end))
+        Offset = self._skip_whitespace(end)
+        if self._char(Offset) != b':':
+          raise MxException("Invalid JSON - expected ':' at offset %d" % Offset)
+        Offset = self._skip_whitespace(Offset + 1)
+      end = self._skip_value(Offset)
+      yield key, Offset, end
+      Offset = self._skip_whitespace(end)
+      separator = self._char(Offset)
+      if separator == closing:
+        return
+      if separator != b',':
+        raise MxException("Invalid JSON - expected ',' at offset %d" % Offset)
+      Offset = self._skip_whitespace(Offset + 1)
+
+  def index(self, Offset=0):
+    '''
+    Scans an object without parsing its values.
+    :rtype: dict
+    :return: {key: (start offset, end offset)} of the object members
+    '''
+    return dict((key, (start, end)) for key, start, end in self._iter_members(Offset))
+
+  def load(self, Start, End):
+    ''' Parses the JSON value between two offsets (e.g. from :py:meth:`index`) '''
+    return json_loads(self._bytes(Start, End))
+
+  def iter_items(self, Offset=0):
+    '''
+    Parses the members of an object or array one at a time.
+    :rtype: generator of (key, value) - key is None for array elements
+    '''
+    for key, start, end in self._iter_members(Offset):
+      yield key, self.load(start, end)
@@ -15,25 +15,11 @@ class KrpRule(MxObject):
 
   >>> ws.create_krp_rule(Alias="alias name", GatewayGroup="gg name", GatewayPorts=[8443], ServerCertificate="key name", OutboundRules=[{'priority': 1, 'externalHost': 'www.imperva.com', 'urlPrefix': '/login', 'encrypt': True, 'internalIpHost': '192.168.0.1', 'serverPort': 443}])
   '''
-  
-  # Store created KRP Rule objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = KrpRule._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], WebService=kwargs['WebService'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None, Site=None, ServerGroup=None, WebService=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'KrpRule':
-        if cur_obj.Name == Name and cur_obj._Site == Site and cur_obj._ServerGroup == ServerGroup and cur_obj._WebService == WebService:
-          return cur_obj
-    return None
 
-  
+  _key_fields = ('Site', 'ServerGroup', 'WebService', 'Name')
+  # There is no KRP rule update - create_krp_rule deletes the existing rule
+  _replaced_on_update = True
+
   def __init__(self, connection=None, WebService=None, Name=None, ServerGroup=None, Site=None, GatewayGroup=None, Alias=None, GatewayPorts=[], ServerCertificate=None, OutboundRules=[], ClientAuthenticationAuthorities=None):
     super(KrpRule, self).__init__(connection=connection, Name=Name)
     validate_string(WebService=WebService, Site=Site, ServerGroup=ServerGroup, GatewayGroup=GatewayGroup, Alias=Alias)
@@ -164,7 +150,7 @@ class KrpRule(MxObject):
         raise MxException("KRP Rule already exists")
     if ServerCertificate: body['serverCertificate'] = ServerCertificate
     if ClientAuthenticationAuthorities: body['clientAuthenticationAuthorities'] = ClientAuthenticationAuthorities
-    connection._mx_api('POST', '/conf/webServices/%s/%s/%s/krpInboundRules/%s/%s/%d' % (Site, ServerGroup, WebService, GatewayGroup, Alias, GatewayPorts[0]), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/webServices/%s/%s/%s/krpInboundRules/%s/%s/%d' % (Site, ServerGroup, WebService, GatewayGroup, Alias, GatewayPorts[0]), data=json_dumps(body))
     return KrpRule(connection=connection, Name='%s-%s-%s' % (GatewayGroup, Alias, str(GatewayPorts)), WebService=WebService, ServerGroup=ServerGroup, Site=Site, GatewayGroup=GatewayGroup, Alias=Alias, GatewayPorts=GatewayPorts, ServerCertificate=ServerCertificate, OutboundRules=OutboundRules, ClientAuthenticationAuthorities=ClientAuthenticationAuthorities)
   @staticmethod
   def _delete_krp_rule(connection, WebService=None, ServerGroup=None, Site=None, GatewayGroup=None, Alias=None, GatewayPorts=[]):
@@ -173,7 +159,7 @@ class KrpRule(MxObject):
     krp = connection.get_krp_rule(Site=Site, ServerGroup=ServerGroup, WebService=WebService, GatewayGroup=GatewayGroup, Alias=Alias, GatewayPorts=GatewayPorts)
     if krp:
       connection._mx_api('DELETE', '/conf/webServices/%s/%s/%s/krpInboundRules/%s/%s/%d' % (Site, ServerGroup, WebService, GatewayGroup, Alias, GatewayPorts[0]))
-      connection._instances.remove(krp)
+      connection._instances.discard(krp)
       del krp
     else:
       raise MxException("KRP Rule does not exist")
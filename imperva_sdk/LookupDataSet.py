@@ -30,24 +30,6 @@ class LookupDataSet(MxObject):
 
   '''
 
-  # Store created datasets objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = LookupDataSet._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'LookupDataSet':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, Records=[], Columns=[]):
     super(LookupDataSet, self).__init__(connection=connection, Name=Name)
     self._Records = MxList(Records)
@@ -207,7 +189,7 @@ class LookupDataSet(MxObject):
     caseSensitiveStr = 'true' if caseSensitive else 'false'
 
     try:
-      res = connection._mx_api('POST', '/conf/dataSets/createDataset?caseSensitive=%s' % caseSensitiveStr, data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/dataSets/createDataset?caseSensitive=%s' % caseSensitiveStr, data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating lookup data set: %s" % e)
 
@@ -216,7 +198,7 @@ class LookupDataSet(MxObject):
     if Records:
       body['records'] = Records
       try:
-        res = connection._mx_api('POST', '/conf/dataSets/%s/data' % Name , data=json.dumps(body))
+        res = connection._mx_api('POST', '/conf/dataSets/%s/data' % Name , data=json_dumps(body))
       except Exception as e:
         raise MxException("Failed updating lookup data set: %s" % e)
 
@@ -227,7 +209,7 @@ class LookupDataSet(MxObject):
     if Parameter == 'Records':
       if Value:
         # Assume overwrite=true
-        connection._mx_api('PUT', '/conf/dataSets/%s/data?overwrite=true' % Name, data=json.dumps(Value))
+        connection._mx_api('PUT', '/conf/dataSets/%s/data?overwrite=true' % Name, data=json_dumps(Value))
     elif Parameter == 'Columns':
       print("WARNING: lookup data set doesn't support update %s" % Parameter)
 
@@ -1,9 +1,14 @@
 # Copyright 2018 Imperva. All rights reserved.
 
+import os
 import json
 import base64
 import requests
 import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 from imperva_sdk.core                           import *
 from imperva_sdk.Site                           import *
@@ -41,12 +46,23 @@ from imperva_sdk.Tag                            import *
 from imperva_sdk.DiscoveryScan                  import *
 from imperva_sdk.CloudAccount                   import *
 from imperva_sdk.IpGroup                        import *
+from imperva_sdk.ImportPlan                     import *
+from imperva_sdk.JsonStream                     import *
+from imperva_sdk.DryRun                         import *
+from imperva_sdk.ImportJournal                  import *
+from imperva_sdk.RetryPolicy                    import *
+from imperva_sdk.RateLimiter                    import *
+from imperva_sdk.ResponseCache                  import *
+from imperva_sdk.SqliteMirror                   import *
 
 ApiVersion = "v1"
 DefaultMxPort = 8083
 DefaultMxUsername = "admin"
 DefaultMxPassword = "password"
 ConnectionTimeout = 300
+DefaultPoolSize = 10
+# Error descriptions the MX returns for API calls with an expired or invalid session
+SessionExpiredErrors = ('Session expired', 'Session timed out', 'Invalid session', 'not logged in')
 
 #
 # Disable requests library SSL warnings (self signed certificate)
@@ -72,6 +88,128 @@ try:
 except:
   pass
 
+#
+# Recursively remove discarded keys from exported dictionaries
+#
+def _dict_discard(d, Discard=[]):
+  for k in list(d.keys()):
+    if k in Discard:
+      del d[k]
+      continue
+    if isinstance(d[k], dict):
+      _dict_discard(d[k], Discard)
+    elif isinstance(d[k], list):
+      for v in d[k]:
+        if isinstance(v, dict):
+          _dict_discard(v, Discard)
+
+# os.replace is Python 3.3+ - on POSIX os.rename replaces the file atomically as well
+_replace_file = getattr(os, 'replace', os.rename)
+
+#
+# Helpers for calling the get/create/delete functions of an object with the parameters they accept
+#
+def _function_arguments(Function):
+  code = Function.__code__
+  return code.co_varnames[1:code.co_argcount]
+
+def _object_parameters(Function, Object):
+  ''' The parameters of `Function` that identify `Object` (e.g. Name, Site and ServerGroup of a web service) '''
+  parameters = {}
+  for arg in _function_arguments(Function):
+    if '_' + arg in Object.__dict__:
+      parameters[arg] = Object.__dict__['_' + arg]
+    elif is_parameter.match(arg) and hasattr(Object, arg):
+      parameters[arg] = getattr(Object, arg)
+  return parameters
+
+def _get_object_function(Connection, Prefix, ObjectType, Kind):
+  '''
+  Returns the get or delete function of a global object, policy, DAM report or DAS object type (None if there isn't one).
+  The function names aren't consistent - e.g. get_web_service_custom_policy, get_db_audit_policy ('db_audit_dam' policies), get_ip_group and get_assessment_scan.
+  '''
+  base = re.sub('_(dam|das)$', '', ObjectType)
+  for name in ['%s_%s_%s' % (Prefix, ObjectType, Kind), '%s_%s_%s' % (Prefix, base, Kind.split('_')[-1]), '%s_%s' % (Prefix, base)]:
+    if hasattr(Connection, name):
+      return getattr(Connection, name)
+  return None
+
+def _get_all_objects_function(Connection, ObjectType, Kind):
+  return getattr(Connection, 'get_all_%s_%s' % (ObjectType, 'policies' if Kind == 'policy' else Kind + 's'), None)
+
+def _current_parameters(Object, Fields):
+  ''' The values of `Fields` in an MX object, as they appear in a JSON export (child objects are not loaded) '''
+  if 'Profile' in Fields:
+    current = object_to_dict(Object, Depth=1, Include=['Profile'])
+  else:
+    current = object_to_dict(Object, Depth=0)
+  return json_loads(json_dumps(dict((field, current[field]) for field in Fields if field in current)))
+
+#
+# Export JSON is formatted like json.dumps(indent=4, sort_keys=True) so it is easy to compare exports.
+# The helpers below produce the same text in chunks, one list element at a time, for streaming exports.
+# Compact exports have sorted keys without white space, and are encoded with the fastest JSON library (see JsonCodec.py).
+#
+def _dump_json(Value, Level=0, Compact=False):
+  if Compact:
+    return json_dumps(Value, SortKeys=True)
+  text = json.dumps(Value, indent=4, sort_keys=True, separators=(',', ': '))
+  if Level:
+    # JSON strings can't contain raw new lines, so this only indents the structure
+    text = text.replace('\n', '\n' + '    ' * Level)
+  return text
+
+def _json_new_line(Level=0, Compact=False):
+  return '' if Compact else '\n' + '    ' * Level
+
+def _iter_json_list(Items, Level=0, Compact=False):
+  empty = True
+  for item in Items:
+    yield ('[' if empty else ',') + _json_new_line(Level + 1, Compact) + _dump_json(item, Level + 1, Compact)
+    empty = False
+  yield '[]' if empty else _json_new_line(Level, Compact) + ']'
+
+def _iter_json_dict(Items, Level=0, Compact=False):
+  ''' Items are (key, value chunks) tuples sorted by key '''
+  empty = True
+  for key, chunks in Items:
+    yield ('{' if empty else ',') + _json_new_line(Level + 1, Compact) + json.dumps(key) + (':' if Compact else ': ')
+    for chunk in chunks:
+      yield chunk
+    empty = False
+  yield '{}' if empty else _json_new_line(Level, Compact) + '}'
+
+#
+# The MX answers calls with an expired session with 401, a redirect to the login page or a session error
+#
+def _is_session_expired(Response):
+  if Response.status_code in (401, 302, 303):
+    return True
+  if Response.status_code == 200 and 'text/html' in Response.headers.get('Content-Type', ''):
+    return 'login' in (Response.text or '').lower()
+  if Response.status_code not in (200, 404):
+    text = Response.text or ''
+    return any(error in text for error in SessionExpiredErrors)
+  return False
+
+class _PendingRequest(object):
+  ''' GET call that other threads wait for (see MxConnection._coalesce_api_request) '''
+  def __init__(self):
+    self._event = threading.Event()
+    self._response = None
+    self._error = None
+
+  def set(self, Response=None, Error=None):
+    self._response = Response
+    self._error = Error
+    self._event.set()
+
+  def wait(self):
+    self._event.wait()
+    if self._error is not None:
+      raise self._error
+    return self._response
+
 
 class MxConnection(object):
   ''' 
@@ -93,29 +231,88 @@ class MxConnection(object):
   :param Unlicensed: Set to True if the MX did not apply a license yet (default=False)
   :type Debug: boolean
   :param Debug: Print API HTTP debug information (default=False)
+  :type PoolSize: int
+  :param PoolSize: Maximum number of keep-alive connections kept open to the MX (default=10)
+  :type PoolBlock: boolean
+  :param PoolBlock: Set to True to make PoolSize a hard limit on concurrent connections to the MX. API calls will wait for a free connection instead of opening a new one (default=False)
+  :type RetryPolicy: :py:class:`imperva_sdk.RetryPolicy.RetryPolicy`
+  :param RetryPolicy: Retry policy of failed API calls. Set to None to use the default policy (idempotent calls are retried up to 4 times with exponential backoff)
+  :type RateLimiter: :py:class:`imperva_sdk.RateLimiter.RateLimiter`
+  :param RateLimiter: Client side rate limiter of API calls. Set to None for a new rate limiter without limits (limits can be set at any time with `mx.RateLimiter.set_limit`)
+  :type ResponseCache: :py:class:`imperva_sdk.ResponseCache.ResponseCache`
+  :param ResponseCache: HTTP cache of GET responses (default=None - no cache). The MX API doesn't send ETag / Last-Modified headers, so the cache needs 'MaxAge' to store responses, e.g. `imperva_sdk.ResponseCache(MaxAge=60)`.
+                        Use :py:class:`imperva_sdk.PersistentResponseCache.PersistentResponseCache` to keep the responses on disk for the next connections
+  :type CacheMaxObjects: int
+  :param CacheMaxObjects: Maximum number of MX objects stored in the connection, the least recently used objects are removed (default=None - no limit)
+  :type CacheTtl: int or dict
+  :param CacheTtl: Number of seconds a stored MX object is used before it is loaded from the MX again. A number for all objects or a dict of class name to seconds, e.g. `{'WebApplication': 60, None: 600}` (the None key applies to other classes). Default is None - objects are used until they are invalidated (see :py:meth:`imperva_sdk.MxConnection.invalidate`)
   :rtype: imperva_sdk.MxConnection
   :return: MX connection instance
   .. note:: All of the MX objects that are retrieved using the API are stored in the context of the MxConnection instance to prevent redundant API calls.
+  .. note:: All API calls go through a single keep-alive HTTP session, so TCP connections and TLS handshakes to the MX are reused between calls.
+  .. note:: With 'CacheMaxObjects' or 'CacheTtl', an object that was removed from the connection (least recently used or expired) is loaded from the MX as a new instance the next time it is requested.
+            References to the old instance stay valid but aren't updated, so two live instances of the same MX object can exist - get the object again instead of keeping references for a long time.
+  .. note:: If the MX session expires (e.g. a long export or an idle connection), a new session is opened with the connection credentials and the failed call is sent again.
   '''
 
-  def __init__(self, Host=None, Port=DefaultMxPort, Username=DefaultMxUsername, Password=DefaultMxPassword, FirstTime=False, Unlicensed=False, Debug=False):
+  def __init__(self, Host=None, Port=DefaultMxPort, Username=DefaultMxUsername, Password=DefaultMxPassword, FirstTime=False, Unlicensed=False, Debug=False, PoolSize=DefaultPoolSize, PoolBlock=False, RetryPolicy=None, RateLimiter=None, ResponseCache=None, CacheMaxObjects=None, CacheTtl=None):
     # 
     # We store all of the MX objects in '_instances' to prevent duplicate objects and redundant API calls.
     # Because the ID of the object is inconsistent (e.g. can have the same server group names under different sites),
-    # we override the __new__ function in each child class.
+    # objects are stored by their class and '_key_fields' values (see MxObject.__new__).
     #
-    self._instances = []
+    # Dry run recorder of the import that runs in the current thread (see import_from_json and _dry_run_step)
+    self.__DryRun = threading.local()
+    self._instances = MxIdentityMap(MaxObjects=CacheMaxObjects, Ttl=CacheTtl)
+    # Host to application mappings per web service - (Site, ServerGroup, WebService) -> (expiration time, list) (see WebService._get_host_to_app_mappings)
+    self._host_to_app_mappings = {}
+    # Agent monitoring rules by agent name and tag - (API call generation, expiration time, index) (see AgentMonitoringRule._get_agent_monitoring_rules_index)
+    self._agent_monitoring_rules_index = None
+
+    #
+    # All API calls share one pooled keep-alive session so we don't pay a TCP + TLS handshake per call
+    #
+    self._session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=PoolSize, pool_block=PoolBlock)
+    self._session.mount('https://', adapter)
+    self._session.mount('http://', adapter)
+
+    #
+    # Failed API calls are sent again according to the retry policy (see RetryPolicy.py)
+    #
+    self.RetryPolicy = RetryPolicy
+    self.__ApiStats = {'Calls': 0, 'Retries': 0, 'RecoveredCalls': 0, 'FailedCalls': 0, 'Reauthentications': 0, 'CoalescedCalls': 0, 'NotModifiedCalls': 0, 'CachedCalls': 0}
+    self.__ApiStatsLock = threading.Lock()
+    # All API calls (including retries) wait for the rate limiter (see RateLimiter.py)
+    self.RateLimiter = RateLimiter
+    # GET responses that are still fresh (or that the MX didn't change) are not downloaded again (see ResponseCache.py)
+    self.ResponseCache = ResponseCache
+    #
+    # Identical GET calls that run at the same time share one request ((generation, url) -> _PendingRequest).
+    # Every change (POST, PUT or DELETE) starts a new generation, so a GET never joins a call that started before the change.
+    # Inside request_batch() GET responses are also kept until the batch ends or the configuration changes.
+    #
+    self.__PendingGets = {}
+    self.__BatchResponses = None
+    self.__BatchDepth = 0
+    self.__BatchGeneration = 0
+    self.__CoalesceLock = threading.Lock()
 
     #
     # Authenticate to MX and save session cookie
     #
     self.Host = Host
     self.__Port = Port
+    # Cached responses are stored per MX user (see ResponseCache.py)
+    self.__Username = Username
     self.__Debug = Debug
     self.__IsAuthenticated = False
     auth_string = '%s:%s' % (Username, Password)
+    # Credentials are kept to open a new session if the MX session expires
+    self.__Authorization = 'Basic %s' % base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+    self.__AuthLock = threading.Lock()
     self.__Headers = {
-      "Authorization": 'Basic %s' % base64.b64encode(auth_string.encode('utf-8')).decode('utf-8'),
+      "Authorization": self.__Authorization,
       "Content-Type": "application/json"
     }
     # If first time we set the password and create a new login
@@ -126,17 +323,7 @@ class MxConnection(object):
       except:
         # Bypass some API problems with first time password
         pass
-    auth_url = '/auth/session'
-    response = self._mx_api('POST', auth_url)
-    if not response:
-      raise MxException("Failed connecting to MX")
-    try:
-      self.__Headers['Cookie'] = response['session-id']
-    except:
-      try:
-        self.__Headers['Cookie'] = response['sessionId']
-      except:
-        raise MxException("Failed authenticating to MX")
+    self.__authenticate()
     del self.__Headers['Authorization']
     if Unlicensed:
       self.__Version = "Unknown"
@@ -158,6 +345,36 @@ class MxConnection(object):
   def Debug(self, value):
     self.__Debug = value
 
+  def __authenticate(self):
+    ''' Opens an MX session and saves the session cookie '''
+    headers = {
+      "Authorization": self.__Authorization,
+      "Content-Type": "application/json"
+    }
+    response = self._mx_api('POST', '/auth/session', headers=headers)
+    if not response:
+      raise MxException("Failed connecting to MX")
+    try:
+      self.__Headers['Cookie'] = response['session-id']
+    except:
+      try:
+        self.__Headers['Cookie'] = response['sessionId']
+      except:
+        raise MxException("Failed authenticating to MX")
+
+  def _reauthenticate(self, Cookie=None):
+    '''
+    Opens a new MX session after the current one expired.
+    Only one thread authenticates - calls that failed with the same (expired) cookie just use the new session.
+    '''
+    with self.__AuthLock:
+      if self.__Headers.get('Cookie') != Cookie:
+        return
+      if self.__Debug:
+        print ("  MX session expired - authenticating")
+      self.__authenticate()
+      self._count_api_call(Reauthentications=1)
+
   #
   # MX Connection Parameters
   #  
@@ -177,6 +394,56 @@ class MxConnection(object):
   def IsAuthenticated(self):
     ''' MX connection authentication status (read only) '''
     return self.__IsAuthenticated
+  @property
+  def RetryPolicy(self):
+    ''' Retry policy of failed API calls (:py:class:`imperva_sdk.RetryPolicy.RetryPolicy`) '''
+    return self.__RetryPolicy
+  @RetryPolicy.setter
+  def RetryPolicy(self, value):
+    self.__RetryPolicy = value if value is not None else RetryPolicy()
+  @property
+  def RateLimiter(self):
+    '''
+    Client side rate limiter of API calls (:py:class:`imperva_sdk.RateLimiter.RateLimiter`)
+    >>> mx.RateLimiter.set_limit(Rate=10, MaxInFlight=2)
+    >>> mx.RateLimiter.set_limit(Prefix='/conf/webProfile', Rate=1)
+    '''
+    return self.__RateLimiter
+  @RateLimiter.setter
+  def RateLimiter(self, value):
+    self.__RateLimiter = value if value is not None else RateLimiter()
+  @property
+  def ResponseCache(self):
+    '''
+    HTTP cache of GET responses (:py:class:`imperva_sdk.ResponseCache.ResponseCache`), None if responses aren't cached
+    >>> mx.ResponseCache = imperva_sdk.ResponseCache(MaxAge=60)
+    >>> mx.ResponseCache.Size
+    1048576
+    '''
+    return self.__ResponseCache
+  @ResponseCache.setter
+  def ResponseCache(self, value):
+    self.__ResponseCache = value
+  @property
+  def ApiStats(self):
+    '''
+    API call counters (read only)
+    >>> mx.ApiStats
+    {'Calls': 1520, 'Retries': 3, 'RecoveredCalls': 2, 'FailedCalls': 0, 'Reauthentications': 1}
+    'Calls' - API calls sent to the MX (not including retries), 'Retries' - times a call was sent again,
+    'RecoveredCalls' - calls that succeeded after a retry, 'FailedCalls' - calls that were retried and still failed,
+    'Reauthentications' - times a new MX session was opened because the session expired,
+    'CoalescedCalls' - GET calls that used the response of an identical call (running at the same time or in the same request batch),
+    'NotModifiedCalls' - GET calls that the MX answered with '304 Not Modified' (the response was taken from the response cache),
+    'CachedCalls' - GET calls that were not sent because the response cache had a response younger than its 'MaxAge'
+    '''
+    with self.__ApiStatsLock:
+      return dict(self.__ApiStats)
+
+  def _count_api_call(self, **kwargs):
+    with self.__ApiStatsLock:
+      for counter in kwargs:
+        self.__ApiStats[counter] += kwargs[counter]
 
   def logout(self):
     ''' Close connection to MX '''
@@ -186,14 +453,88 @@ class MxConnection(object):
       except:
         pass
     self.__IsAuthenticated = False
-    for mx_object in self._instances:
-      del mx_object
-    self._instances = []
+    self._instances.clear()
+    self._host_to_app_mappings.clear()
+    self._agent_monitoring_rules_index = None
+    if self.ResponseCache is not None:
+      self.ResponseCache.close()
+    try:
+      self._session.close()
+    except:
+      pass
 
   def __del__(self):
     self.logout()
 
+  def invalidate(self, Object=None):
+    '''
+    Removes stored MX objects from the connection, so they are loaded from the MX the next time they are used.
+    Objects that are already referenced by the caller are not changed (see :py:meth:`imperva_sdk.MxConnection.refresh`).
+
+    >>> mx.invalidate(web_service)
+    >>> mx.invalidate(imperva_sdk.WebApplication)
+    >>> mx.invalidate()
+
+    :param Object: MX object, MX object class (or class name) to invalidate all the objects of a type, or None to invalidate all objects
+    '''
+    if Object is None:
+      self._instances.clear()
+    elif isinstance(Object, MxObject):
+      self._instances.discard(Object)
+    else:
+      self._instances.discard_type(getattr(Object, '__name__', Object))
+    # Cached API responses that objects are built from
+    self._host_to_app_mappings.clear()
+    self._agent_monitoring_rules_index = None
+    self._invalidate_request_batch()
+
+  def refresh(self, Object=None):
+    '''
+    Loads an MX object from the MX again and updates it in place.
+
+    >>> mx.refresh(server_group)
+    >>> server_group.OperationMode
+    'active'
+
+    :param Object: MX object (site, server group, policy, etc.)
+    :rtype: MX object
+    :return: The updated object or None if the object doesn't exist in the MX anymore
+    '''
+    snake_name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', type(Object).__name__).lower()
+    get_function = getattr(self, 'get_' + snake_name, None)
+    if get_function is None or not Object._key_fields:
+      raise MxException("Refresh is not supported for '%s' objects" % type(Object).__name__)
+    # The get function parameters that identify the object (e.g. Name, Site, ServerGroup)
+    parameters = _object_parameters(get_function, Object)
+    self.invalidate(Object)
+    loaded = get_function(**parameters)
+    if loaded is None:
+      return None
+    with self._instances.lock:
+      self._instances.discard(loaded)
+      Object.__dict__.update(loaded.__dict__)
+      self._instances.append(Object)
+    return Object
+
+  @property
+  def _instances(self):
+    # A dry run import has its own identity map, so its simulated changes never reach the objects that callers hold
+    dry_run = self._dry_run
+    return dry_run.Instances if dry_run is not None else self.__Instances
+  @_instances.setter
+  def _instances(self, Instances):
+    self.__Instances = Instances
+
+  @property
+  def _dry_run(self):
+    return getattr(self.__DryRun, 'Recorder', None)
+  @_dry_run.setter
+  def _dry_run(self, Recorder):
+    self.__DryRun.Recorder = Recorder
+
   def _mx_api(self, method, path, **kwargs):
+    # Only calls that use the connection session can be replayed after authenticating again
+    session_call = "headers" not in kwargs and self.__IsAuthenticated
     if "headers" not in kwargs: kwargs["headers"] = self.__Headers
     if "timeout" not in kwargs: kwargs["timeout"] = ConnectionTimeout
     if "verify" not in kwargs: kwargs["verify"] = False
@@ -209,6 +550,13 @@ class MxConnection(object):
       api_version = ApiVersion
 
     url = "https://%s:%d%s/%s%s" % (self.Host, self.__Port, prefix, api_version, path)
+
+    # In dry run mode, changes are only recorded (logging in again is sent - it doesn't change the configuration)
+    dry_run = self._dry_run
+    if dry_run is not None:
+      if method != 'GET' and not path.startswith('/auth/'):
+        return dry_run.write(method, url, kwargs.get('data'))
+      start_time = time.time()
     
     if self.__Debug:
       print ("%s %s" % (method, url))
@@ -217,43 +565,181 @@ class MxConnection(object):
       if "data" in kwargs:
         print ("  body - %s" % kwargs["data"])
 
-    if method == 'POST':
-      try:
-        response = requests.post(url, **kwargs)
-      except Exception as e:
-        raise MxException("MX Connection Error - %s" % str(e))
-    elif method == 'GET':
-      try:
-        response = requests.get(url, **kwargs)
-      except:
-        raise MxException("MX Connection Error")
-    elif method == 'DELETE':
-      try:
-        response = requests.delete(url, **kwargs)
-      except:
-        raise MxException("MX Connection Error")
-    elif method == 'PUT':
-      try:
-        response = requests.put(url, **kwargs)
-      except:
-        raise MxException("MX Connection Error")
-    else:
+    if method not in ('POST', 'GET', 'DELETE', 'PUT'):
       raise MxException("Unhandled HTTP method '%s'" % method)
+    if session_call and method == 'GET' and "data" not in kwargs:
+      response = self._coalesce_api_request(url, path, **kwargs)
+    else:
+      # Logging in and out doesn't change the configuration
+      change = method != 'GET' and not path.startswith('/auth/')
+      if method != 'GET':
+        self._invalidate_request_batch()
+        if change and self.ResponseCache is not None:
+          self.ResponseCache.expire(url)
+      try:
+        response = self._session_api_request(method, url, path, session_call, **kwargs)
+      finally:
+        if method != 'GET':
+          # GET calls that started while the change was sent may have read (and cached) the previous configuration
+          self._invalidate_request_batch()
+          if change and self.ResponseCache is not None:
+            self.ResponseCache.expire(url)
+    if dry_run is not None:
+      dry_run.read(method, url, kwargs.get('data'), time.time() - start_time)
     if response.status_code == 200:
       try:
-        return json.loads(response.text)
+        # Decode the response bytes directly (no text decoding) unless they aren't UTF-8
+        return json_loads(response.content)
       except:
-        return None
+        try:
+          return json_loads(response.text)
+        except:
+          return None
     elif response.status_code == 404:
       raise MxExceptionNotFound("404 - API URL not found")
     else:
       error_message = "Unknown Error (response code = %d)" % response.status_code
       try:
-        response_json = json.loads(response.text)
+        response_json = json_loads(response.content)
         error_message = response_json['errors']
       except:
         pass
       raise MxException("MX returned errors - %s" % str(error_message))
+
+  def _session_api_request(self, method, url, path, session_call, **kwargs):
+    ''' Sends an API call and sends it again in a new session if the MX session expired '''
+    cookie = kwargs["headers"].get('Cookie')
+    response = self._send_api_request(method, url, path, **kwargs)
+    if session_call and _is_session_expired(response):
+      self._reauthenticate(Cookie=cookie)
+      response = self._send_api_request(method, url, path, **kwargs)
+    return response
+
+  def _coalesce_api_request(self, url, path, **kwargs):
+    '''
+    Sends a GET call, unless an identical call is already running (or was sent in the current request batch) - then its response is used.
+    Callers only read the shared response (the JSON is parsed separately for each caller).
+    '''
+    with self.__CoalesceLock:
+      if self.__BatchResponses is not None and url in self.__BatchResponses:
+        self._count_api_call(CoalescedCalls=1)
+        return self.__BatchResponses[url]
+      generation = self.__BatchGeneration
+      pending = self.__PendingGets.get((generation, url))
+      owner = pending is None
+      if owner:
+        pending = _PendingRequest()
+        self.__PendingGets[(generation, url)] = pending
+    if not owner:
+      self._count_api_call(CoalescedCalls=1)
+      return pending.wait()
+    try:
+      response = self._session_api_request('GET', url, path, True, **kwargs)
+    except BaseException as e:
+      with self.__CoalesceLock:
+        del self.__PendingGets[(generation, url)]
+      pending.set(Error=e)
+      raise
+    with self.__CoalesceLock:
+      del self.__PendingGets[(generation, url)]
+      # Don't keep a response that may be older than a configuration change
+      if self.__BatchResponses is not None and generation == self.__BatchGeneration and response.status_code == 200:
+        self.__BatchResponses[url] = response
+    pending.set(Response=response)
+    return response
+
+  @property
+  def _request_generation(self):
+    ''' Number that changes whenever the MX configuration is changed through the connection (or the connection objects are invalidated) '''
+    return self.__BatchGeneration
+
+  def _invalidate_request_batch(self):
+    with self.__CoalesceLock:
+      self.__BatchGeneration += 1
+      if self.__BatchResponses is not None:
+        self.__BatchResponses.clear()
+
+  @contextmanager
+  def request_batch(self):
+    '''
+    Context in which GET API responses are reused, so objects that are read many times (e.g. the same web service for every policy 'ApplyTo' entry) are only requested once.
+    Any API call that changes the MX configuration clears the stored responses. Batches can be nested and used from multiple threads.
+
+    >>> with mx.request_batch():
+    ...   policies = mx.get_all_web_service_custom_policies()
+    '''
+    with self.__CoalesceLock:
+      if self.__BatchDepth == 0:
+        self.__BatchResponses = {}
+      self.__BatchDepth += 1
+    try:
+      yield self
+    finally:
+      with self.__CoalesceLock:
+        self.__BatchDepth -= 1
+        if self.__BatchDepth == 0:
+          self.__BatchResponses = None
+
+  def _send_api_request(self, method, url, path, **kwargs):
+    '''
+    Sends an API call and retries it according to the retry policy.
+    Returns the last response - the caller handles error responses.
+    '''
+    policy = self.RetryPolicy
+    rate_limiter = self.RateLimiter
+    cache = self.ResponseCache if method == 'GET' and "data" not in kwargs else None
+    if cache is not None:
+      response = cache.get_fresh(url, User=self.__Username)
+      if response is not None:
+        self._count_api_call(CachedCalls=1)
+        return response
+      validators = cache.get_validators(url, User=self.__Username)
+      if validators:
+        kwargs = dict(kwargs, headers=dict(kwargs["headers"], **validators))
+    self._count_api_call(Calls=1)
+    # All attempts and the delays between them share the timeout of the call, so retries never make a call wait longer than a single attempt could
+    timeout = kwargs.get("timeout")
+    deadline = time.time() + timeout if isinstance(timeout, (int, float)) else None
+    attempt = 0
+    while True:
+      attempt += 1
+      response = None
+      limits = rate_limiter.acquire(path)
+      if deadline is not None:
+        kwargs["timeout"] = max(deadline - time.time(), 1)
+      try:
+        response = self._session.request(method, url, **kwargs)
+        error = None
+      except Exception as e:
+        error = e
+      finally:
+        rate_limiter.release(limits)
+      if not policy.is_retryable(method, attempt, Response=response):
+        break
+      delay = policy.get_delay(attempt, Response=response)
+      if deadline is not None and time.time() + delay >= deadline:
+        break
+      if self.__Debug:
+        print ("  retry %d of %s %s in %.2f seconds - %s" % (attempt, method, url, delay, error if error else "response code %d" % response.status_code))
+      self._count_api_call(Retries=1)
+      time.sleep(delay)
+    if attempt > 1:
+      if error is None and response.status_code == 200:
+        self._count_api_call(RecoveredCalls=1)
+      else:
+        self._count_api_call(FailedCalls=1)
+    if error is not None:
+      raise MxException("MX Connection Error - %s" % str(error))
+    if cache is not None:
+      if response.status_code == 304:
+        if not cache.revalidate(url, response, User=self.__Username):
+          # The cached response was removed in the meantime - get the whole response
+          kwargs["headers"] = dict((header, value) for header, value in kwargs["headers"].items() if not header.startswith('If-'))
+          return self._send_api_request(method, url, path, **kwargs)
+        self._count_api_call(NotModifiedCalls=1)
+      elif response.status_code == 200:
+        cache.store(url, response, User=self.__Username)
+    return response
   
   def get_all_sites(self):
     '''
@@ -406,6 +892,12 @@ class MxConnection(object):
     '''
     return WebService._delete_web_service(connection=self, Name=Name, ServerGroup=ServerGroup, Site=Site)
 
+  def _get_host_to_app_mappings(self, Name=None, ServerGroup=None, Site=None):
+    return WebService._get_host_to_app_mappings(connection=self, Name=Name, ServerGroup=ServerGroup, Site=Site)
+
+  def _invalidate_host_to_app_mappings(self, Site=None, ServerGroup=None, Name=None):
+    return WebService._invalidate_host_to_app_mappings(connection=self, Site=Site, ServerGroup=ServerGroup, Name=Name)
+
   def get_all_db_services(self, ServerGroup=None, Site=None):
     return DbService._get_all_db_services(connection=self, ServerGroup=ServerGroup, Site=Site)
 
@@ -814,7 +1306,7 @@ class MxConnection(object):
     :return: (list of dict) Log with details of all import events and their outcome.
     """
     try:
-      json_config = json.loads(Json)
+      json_config = json_loads(Json)
     except:
       raise MxException("Invalid JSON configuration")
 
@@ -1559,7 +2051,7 @@ class MxConnection(object):
     :return: (list of dict) Log with details of all import events and their outcome.
     """
     try:
-      json_config = json.loads(Json)
+      json_config = json_loads(Json)
     except:
       raise MxException("Invalid JSON configuration")
 
@@ -1797,9 +2289,30 @@ class MxConnection(object):
     :param AgentName: Agent name
     :param AgentTags: list of all the agent's tags
     :return: List of AgentMonitoringRule objects that belong to the agent
+    .. note:: The rules are indexed by agent and tag. The index is used until a change is made through the connection or for the TTL of AgentMonitoringRule objects (see 'CacheTtl' - 60 seconds without it), so rules changed by other clients are seen after the TTL.
     '''
     return AgentMonitoringRule._get_all_agent_monitoring_rules_by_agent(connection=self, AgentName=AgentName, AgentTags=AgentTags)
 
+  def get_all_agent_monitoring_rules_by_agents(self, Agents=None):
+    '''
+    Agent monitoring rules of many agents at once (the rules are only listed once).
+
+    >>> rules = mx.get_all_agent_monitoring_rules_by_agents()
+    >>> rules['agent1']
+    [<imperva_sdk 'AgentMonitoringRule' Object - 'testRuleFromSDK'>]
+
+    :type Agents: list of :obj:`imperva_sdk.AgentConfiguration.AgentConfiguration` or dict
+    :param Agents: Agent configurations or {agent name: list of the agent's tags}. None for all agents
+    :rtype: dict
+    :return: {agent name: list of AgentMonitoringRule objects that belong to the agent}
+    '''
+    if Agents is None:
+      Agents = self.get_all_agent_configurations()
+    if not isinstance(Agents, dict):
+      Agents = dict((agent.Name, agent.Tags) for agent in Agents)
+    index = AgentMonitoringRule._get_agent_monitoring_rules_index(connection=self)
+    return dict((name, AgentMonitoringRule._get_all_agent_monitoring_rules_by_agent(connection=self, AgentName=name, AgentTags=Agents[name], Index=index)) for name in Agents)
+
   def get_agent_monitoring_rule(self, Name):
     '''
     :type Name: string
@@ -1915,10 +2428,18 @@ class MxConnection(object):
 
   # ==================================== END DAM GLOBAL OBJECTS ================================================
 
+  def _get_all_functions(self):
+    ''' Returns the names of the "get_all" functions (computed once per class and used to list the object types) '''
+    functions = type(self).__dict__.get('_get_all_function_names')
+    if functions is None:
+      functions = tuple(item for item in dir(type(self)) if item.startswith('get_all'))
+      type(self)._get_all_function_names = functions
+    return functions
+
   def get_all_dam_policies_types(self):
     ''' Returns all DAM available policies types '''
     types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all') and cur_item.endswith('_dam_policies'):
         types.append(cur_item.replace('get_all_','').replace('_dam_policies',''))
     return types
@@ -1926,7 +2447,7 @@ class MxConnection(object):
   def get_all_dam_reports_types(self):
     ''' Returns all available DAM report types '''
     types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all_') and cur_item.endswith('_dam_reports'):
         types.append(cur_item.replace('get_all_','').replace('_dam_reports',''))
     return types
@@ -1934,7 +2455,7 @@ class MxConnection(object):
   def get_all_dam_global_objects_types(self):
     ''' Returns all DAM available global_object types '''
     types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all') and cur_item.endswith('_dam_global_objects') and cur_item != 'get_all_global_objects':
         types.append(cur_item.replace('get_all_','').replace('_dam_global_objects',''))
     return types
@@ -1942,7 +2463,7 @@ class MxConnection(object):
   def get_all_das_objects_types(self):
     ''' Returns all available DAS object types '''
     types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all_') and cur_item.endswith('_das_objects') and cur_item != 'get_all_das_objects_types':
         types.append(cur_item.replace('get_all_','').replace('_das_objects',''))
     return types
@@ -1950,7 +2471,7 @@ class MxConnection(object):
   def get_all_global_object_types(self):
     ''' Returns all available global_object types '''
     types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all_') and cur_item.endswith('_global_objects') and cur_item != 'get_all_global_objects':
         types.append(cur_item.replace('get_all_','').replace('_global_objects',''))
     return types
@@ -1966,7 +2487,7 @@ class MxConnection(object):
   def get_all_policy_types(self):
     ''' Returns all available policy types '''
     policy_types = []
-    for cur_item in dir(self):
+    for cur_item in self._get_all_functions():
       if cur_item.startswith('get_all_') and cur_item.endswith('_policies') and cur_item != 'get_all_policies':
         policy_types.append(cur_item.replace('get_all_','').replace('_policies',''))
     return policy_types
@@ -1999,6 +2520,7 @@ class MxConnection(object):
       if LicenseFile or LicenseContent:
         raise MxException("Must provide only 1 license parameter (Content, File or URL)")
       try:
+        # Not through the MX session - its connection pool is kept for the MX host
         response = requests.get(LicenseURL, verify=False, timeout=ConnectionTimeout)
         lic_data = response.text
         LicenseContent = base64.b64encode(lic_data.encode('utf-8')).decode('utf-8')
@@ -2019,7 +2541,7 @@ class MxConnection(object):
     if not LicenseContent:
       raise MxException("No license content provided")
     body = { 'licenseContent': LicenseContent }
-    self._mx_api('POST', url, timeout=1800, data=json.dumps(body))
+    self._mx_api('POST', url, timeout=1800, data=json_dumps(body))
     return True
 
   def _export_objects_to_dict(self, object_type, context):
@@ -2052,10 +2574,11 @@ class MxConnection(object):
     return json_like_obj
 
 
-  def export_to_json(self, Discard=[]):
+  def export_to_json(self, Discard=[], Workers=1, Compact=False, Depth=None, Include=None):
     '''
     Export MX configuration to a JSON string.
     .. note:: The function only exports objects that are implemented in imperva_sdk. It is not the entire MX configuration.
+    .. note:: For large configurations, use :py:meth:`imperva_sdk.MxConnection.export_to_file` or :py:meth:`imperva_sdk.MxConnection.iter_export_to_json` to avoid holding the entire export in memory.
     >>> import pprint
     >>> import json
     >>> export = mx.export_to_json(Dicard=['policies'])
@@ -2119,112 +2642,256 @@ class MxConnection(object):
     
     :type Discard: list of string
     :param Discard: Objects or attributes to discard from export. For example, you can choose not to export all policy information by passing `['policies']` or only discard certain attributes of policy objects by passing `['MatchCriteria', 'ApplyTo']`
+    :type Workers: int
+    :param Workers: Number of threads used to export independent objects (sites, policy types, global object types, etc.) in parallel. The output is identical to a serial export (default=1)
+    :type Compact: boolean
+    :param Compact: Set to True to export JSON without indentation and white space. Compact exports are smaller and faster to encode (default=False)
+    :type Depth: int
+    :param Depth: Number of object levels to export under each site (1 - server groups, 2 - web and DB services, 3 - applications, rules and connections, 4 - web application profiles). Deeper objects are not loaded from the MX at all (default=None - all levels)
+    :type Include: list of string
+    :param Include: Site tree objects to export (e.g. `['server_groups', 'web_services']` or `['server_groups', 'web_services', 'web_applications', 'Profile']`). Objects that are not in the list, and objects under them, are not loaded from the MX (default=None - all objects)
     :rtype: JSON string
     :return: string in JSON format representing MX configuration export (and can be used by :py:meth:`imperva_sdk.MxConnection.import_from_json` function)
     
     '''
-    def dict_discard(d, Discard=[]):
-      for k in d.keys():
-        if k in Discard:
-          del d[k]
-          continue
-        if isinstance(d[k], dict):
-          dict_discard(d[k], Discard)
-        elif isinstance(d[k], list):
-          for v in d[k]:
-            if isinstance(v, dict):
-              dict_discard(v, Discard)
-
-    tmp_json = {
-      'metadata': {
-        'Host': self.Host,
-        'Version': self.Version,
-        'Challenge': self.Challenge,
-        'SdkVersion': imperva_sdk_version(),
-        'ExportTime': time.strftime("%Y-%m-%d %H:%M:%S")
-      }
+    return ''.join(self.iter_export_to_json(Discard=Discard, Workers=Workers, Compact=Compact, Depth=Depth, Include=Include))
+
+  def export_to_file(self, File=None, Discard=[], Workers=1, Compact=False, Depth=None, Include=None):
+    '''
+    Export MX configuration to a JSON file. The export is written incrementally (per site, policy, global object, etc.), so the whole configuration is never held in memory.
+    The file content is identical to the string returned by :py:meth:`imperva_sdk.MxConnection.export_to_json`.
+
+    >>> mx.export_to_file('/tmp/export.json', Discard=['policies'])
+
+    :type File: string or file object
+    :param File: Path of the output file or an open (text) file object. A path is written to a temporary file in the same directory that replaces the output file when the export is complete (the previous file is kept if the export fails)
+    :type Discard: list of string
+    :param Discard: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Workers: int
+    :param Workers: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Compact: boolean
+    :param Compact: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Depth: int
+    :param Depth: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Include: list of string
+    :param Include: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    '''
+    if hasattr(File, 'write'):
+      for chunk in self.iter_export_to_json(Discard=Discard, Workers=Workers, Compact=Compact, Depth=Depth, Include=Include):
+        File.write(chunk)
+    else:
+      # Written to a temporary file in the same directory that replaces the file when the export is complete,
+      # so a failed export doesn't leave a truncated file (or destroy the previous export)
+      temp_file = '%s.%d.%d.tmp' % (File, os.getpid(), threading.current_thread().ident)
+      try:
+        # The export JSON is ASCII-only so no encoding is needed
+        with open(temp_file, 'w') as f:
+          for chunk in self.iter_export_to_json(Discard=Discard, Workers=Workers, Compact=Compact, Depth=Depth, Include=Include):
+            f.write(chunk)
+        _replace_file(temp_file, File)
+      except BaseException:
+        if os.path.exists(temp_file):
+          os.remove(temp_file)
+        raise
+
+  def iter_export_to_json(self, Discard=[], Workers=1, Compact=False, Depth=None, Include=None):
+    '''
+    Generator version of :py:meth:`imperva_sdk.MxConnection.export_to_json`. Yields the export JSON string in chunks.
+    Objects are exported while the JSON is consumed, so only the current site / object (or a small window of them when Workers > 1) is held in memory.
+
+    >>> with open('/tmp/export.json', 'w') as f:
+    ...   for chunk in mx.iter_export_to_json():
+    ...     f.write(chunk)
+
+    :type Discard: list of string
+    :param Discard: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Workers: int
+    :param Workers: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Compact: boolean
+    :param Compact: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Depth: int
+    :param Depth: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :type Include: list of string
+    :param Include: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :rtype: generator of string
+    '''
+    for chunk in self._iter_export_chunks(Discard=Discard, Workers=Workers, Compact=Compact, Depth=Depth, Include=Include):
+      yield chunk
+
+  def _iter_export_chunks(self, Discard=[], Workers=1, Compact=False, Depth=None, Include=None):
+    sections, tasks = self._export_tasks(Discard=Discard, Depth=Depth, Include=Include)
+    sections['metadata'] = {
+      'Host': self.Host,
+      'Version': self.Version,
+      'Challenge': self.Challenge,
+      'SdkVersion': imperva_sdk_version(),
+      'ExportTime': time.strftime("%Y-%m-%d %H:%M:%S")
     }
-    tmp_json['sites'] = []
+
+    # Run the tasks in the order their results are written - sorted sections, sorted keys in dict sections
+    section_names = sorted(sections)
+    def task_order(task):
+      section, key, function = task
+      if isinstance(sections[section], dict) and key is not None:
+        return (section_names.index(section), key)
+      return (section_names.index(section), '')
+    tasks.sort(key=task_order)
+    results = self._iter_export_tasks([function for section, key, function in tasks], Workers=Workers)
+
+    def section_chunks(section):
+      section_tasks = [task for task in tasks if task[0] == section]
+      if not section_tasks:
+        return [_dump_json(sections[section], 1, Compact)]
+      elif section_tasks[0][1] is None:
+        return [_dump_json(next(results), 1, Compact)]
+      elif isinstance(sections[section], list):
+        return _iter_json_list((next(results) for task in section_tasks), 1, Compact)
+      else:
+        return _iter_json_dict(((key, _iter_json_list(next(results), 2, Compact)) for section, key, function in section_tasks), 1, Compact)
+
+    for chunk in _iter_json_dict(((section, section_chunks(section)) for section in section_names), 0, Compact):
+      yield chunk
+
+  def _iter_export_tasks(self, tasks, Workers=1):
+    '''
+    Runs the export task functions and yields their results in the same order as the tasks.
+    With Workers > 1 the tasks run concurrently on a bounded thread pool, only a small window of tasks runs ahead of the consumer.
+    '''
+    if not Workers or Workers <= 1:
+      for task in tasks:
+        yield task()
+      return
+    def run_task(task):
+      result = task()
+      # Generators must be consumed in the worker thread
+      return result if isinstance(result, (list, dict)) else list(result)
+    pool = ThreadPoolExecutor(max_workers=Workers)
+    pending = deque()
+    try:
+      for task in tasks:
+        pending.append(pool.submit(run_task, task))
+        if len(pending) >= 2 * Workers:
+          yield pending.popleft().result()
+      while pending:
+        yield pending.popleft().result()
+    finally:
+      for future in pending:
+        future.cancel()
+      pool.shutdown(wait=True)
+
+  def _export_tasks(self, Discard=[], Depth=None, Include=None):
+    '''
+    Breaks the export into independent tasks - one per site, policy type, global object type, etc.
+    :return: (sections, tasks) - the empty export sections and a list of (section, key, function) tuples.
+             The result of each function is appended to list sections or stored under `key` in dict sections (as a list of objects).
+             If `key` is None, the result is the entire section.
+    '''
+    sections = {
+      'sites': [],
+      'action_sets': {},
+      'assessment_tests': [],
+      'policies': {},
+      'classification_profiles': [],
+      'global_objects': {},
+      'dam_reports': {},
+      'das_objects': {}
+    }
+    tasks = []
+
+    #
+    # Discarded child objects and profiles are not loaded from the MX at all (Exclude),
+    # discarded attributes are removed after the objects are loaded (_dict_discard)
+    #
+    def export_site(site):
+      site_dict = object_to_dict(site, Depth=Depth, Include=Include, Exclude=Discard)
+      _dict_discard(site_dict, Discard)
+      return site_dict
+    def export_objects(get_function):
+      # Generator, so a streaming export only holds one object at a time
+      try:
+        for cur_object in get_function():
+          obj_dict = object_to_dict(cur_object, Exclude=Discard)
+          _dict_discard(obj_dict, Discard)
+          yield obj_dict
+      except Exception:
+        # Some versions don't have all policy / global object APIs
+        pass
+    def export_without_discard(get_function):
+      try:
+        return [dict(cur_object) for cur_object in get_function()]
+      except:
+        # Some versions don't have all assessment_tests / classification_profiles APIs
+        return []
+
     if 'sites' not in Discard:
-      sites = self.get_all_sites()
-      for site in sites:
-        site_dict = dict(site)
-        dict_discard(site_dict, Discard)
-        tmp_json['sites'].append(site_dict)
+      for site in self.get_all_sites():
+        tasks.append(('sites', site.Name, lambda site=site: export_site(site)))
 
-    tmp_json['action_sets'] = {}
     if 'action_sets' not in Discard:
-      res = self._export_action_sets()
-      tmp_json['action_sets'] = res['action_sets']
+      tasks.append(('action_sets', None, lambda: self._export_action_sets()['action_sets']))
 
-    tmp_json['assessment_tests'] = []
     if 'assessment_tests' not in Discard:
-      try:
-        tests = self.get_all_assessment_tests()
-        for test in tests:
-          test_dict = dict(test)
-          tmp_json['assessment_tests'].append(test_dict)
-      except:
-        # Some versions don't have all assessment_tests APIs
-        pass
+      tasks.append(('assessment_tests', None, lambda: export_without_discard(self.get_all_assessment_tests)))
 
-    tmp_json['policies'] = {}
     if 'policies' not in Discard:
-      policy_types = self.get_all_policy_types()
-      for policy_type in policy_types:
-        tmp_json['policies'][policy_type] = []
-        if policy_type not in Discard:
-          try:
-            get_pol_func = getattr(self, 'get_all_' + policy_type + '_policies')
-            policies = get_pol_func()
-            for cur_policy in policies:
-              pol_dict = dict(cur_policy)
-              dict_discard(pol_dict, Discard)
-              tmp_json['policies'][policy_type].append(pol_dict)
-          except:
-            # Some versions don't have all policy APIs
-            pass
-
-    tmp_json['classification_profiles'] = []
+      for policy_type in self.get_all_policy_types():
+        if policy_type in Discard:
+          tasks.append(('policies', policy_type, lambda: []))
+        else:
+          get_pol_func = getattr(self, 'get_all_' + policy_type + '_policies')
+          tasks.append(('policies', policy_type, lambda get_pol_func=get_pol_func: export_objects(get_pol_func)))
+
     if 'classification_profiles' not in Discard:
-      try:
-        profiles = self.get_all_classification_profiles()
-        for profile in profiles:
-          profile_dict = dict(profile)
-          tmp_json['classification_profiles'].append(profile_dict)
-      except:
-        # Some versions don't have all assessment_tests APIs
-        pass
+      tasks.append(('classification_profiles', None, lambda: export_without_discard(self.get_all_classification_profiles)))
 
-    tmp_json['global_objects'] = {}
     if 'global_objects' not in Discard:
-      object_types = self.get_all_global_object_types()
-      for object_type in object_types:
-        tmp_json['global_objects'][object_type] = []
-        if object_type not in Discard:
-          try:
-            get_pol_func = getattr(self, 'get_all_' + object_type + '_global_objects')
-            objects = get_pol_func()
-            for cur_object in objects:
-              obj_dict = dict(cur_object)
-              dict_discard(obj_dict, Discard)
-              tmp_json['global_objects'][object_type].append(obj_dict)
-          except:
-            # Some versions don't have all Global Object APIs
-            pass
-
-    tmp_json['dam_reports'] = {}
+      for object_type in self.get_all_global_object_types():
+        if object_type in Discard:
+          tasks.append(('global_objects', object_type, lambda: []))
+        else:
+          get_obj_func = getattr(self, 'get_all_' + object_type + '_global_objects')
+          tasks.append(('global_objects', object_type, lambda get_obj_func=get_obj_func: export_objects(get_obj_func)))
+
     if 'reports' not in Discard:
-      res = self._export_objects_to_dict('reports', 'dam')
-      tmp_json['dam_reports'].update(res['dam_reports'])
+      tasks.append(('dam_reports', None, lambda: self._export_objects_to_dict('reports', 'dam')['dam_reports']))
 
-    tmp_json['das_objects'] = {}
     if 'das_objects' not in Discard:
-      res = self._export_objects_to_dict('objects', 'das')
-      tmp_json['das_objects'].update(res['das_objects'])
+      tasks.append(('das_objects', None, lambda: self._export_objects_to_dict('objects', 'das')['das_objects']))
+
+    return sections, tasks
+
+  def sync_to_sqlite(self, Path=None, Discard=[], Workers=1):
+    '''
+    Copies the MX configuration (sites, server groups, services, applications, policies, global objects and agents) to indexed tables of a local SQLite file,
+    so questions like "which web services is policy X applied to" or "which agents have tag Y" don't need API calls. Syncing an existing file only writes the rows that changed.
 
-    # format and sort output json to allow easy comparison
-    return json.dumps(tmp_json, indent=4, sort_keys=True, separators=(',', ': '))
+    >>> mirror = mx.sync_to_sqlite('/var/tmp/mx.db', Discard=['Profile'])
+    >>> mirror.get_policy_services('Default Web Worm Policy')
+    [{'site': 'site', 'server_group': 'server group', 'service': 'web service', 'application': None}]
+
+    :type Path: string or :py:class:`imperva_sdk.SqliteMirror.SqliteMirror`
+    :param Path: Path of the SQLite file (or an open mirror)
+    :type Discard: list of string
+    :param Discard: Objects or attributes that are not copied (see :py:meth:`imperva_sdk.MxConnection.export_to_json`), 'agent_configurations' to skip agents. The mirror tables of discarded objects keep their rows
+    :type Workers: int
+    :param Workers: See :py:meth:`imperva_sdk.MxConnection.export_to_json`
+    :rtype: :py:class:`imperva_sdk.SqliteMirror.SqliteMirror`
+    :return: The mirror (see :py:meth:`imperva_sdk.SqliteMirror.SqliteMirror.query`)
+    '''
+    mirror = Path if isinstance(Path, SqliteMirror) else SqliteMirror(Path)
+    export = json_loads(self.export_to_json(Discard=Discard, Workers=Workers, Compact=True))
+    # Discarded sections are empty in the export - keep what the mirror has
+    for section in Discard:
+      export.pop(section, None)
+    agents = None
+    if 'agent_configurations' not in Discard:
+      try:
+        agents = [dict(agent) for agent in self.get_all_agent_configurations()]
+      except:
+        # Some versions don't have the agents API
+        pass
+    mirror.sync(Export=export, Agents=agents, Discard=Discard)
+    return mirror
 
   def _import_object_from_json(self, Json=None, ObjectType=None, Context=None, Type=None, update=True):
     """
@@ -2232,14 +2899,14 @@ class MxConnection(object):
     note: The function only imports objects that are implemented in imperva_sdk. It is not the entire MX configuration.
     """
     try:
-      json_config = json.loads(Json)
+      json_config = json_loads(Json)
     except:
       raise MxException("Invalid JSON configuration")
 
     full_object_name = Context + '_' + ObjectType
     return self._create_objects_from_json(Objects=json_config[full_object_name], Type= Context+'_'+Type, update=update)
 
-  def import_from_json(self, Json=None, update=True):
+  def import_from_json(self, Json=None, update=True, Workers=1, SkipUnchanged=False, DryRun=False, Journal=None, Delete=False):
     '''
     Import MX configuration from valid JSON string. It is a good idea to use :py:meth:`imperva_sdk.MxConnection.export_to_json` as the basis for creating the JSON structure.
     .. note:: The function only imports objects that are implemented in imperva_sdk. It is not the entire MX configuration.
@@ -2254,51 +2921,394 @@ class MxConnection(object):
     :param Json: valid imperva_sdk JSON export
     :type update: boolean
     :param update: Set to `True` to update existing resources (default in import function). If set to `False`, existing resources will cause import operations to fail.
-    :rtype: list of dict
+    :type Workers: int
+    :param Workers: Number of import operations that can run concurrently. Objects are only created after the objects they depend on (e.g. server groups after their site, data types after table groups, policies after action sets and services). The log is returned in the same order as a serial import (default=1)
+    :type SkipUnchanged: boolean
+    :param SkipUnchanged: Set to `True` to compare the configuration with the MX first (see :py:meth:`imperva_sdk.MxConnection.diff_from_json`) and only import new and changed objects. Unchanged objects are not imported and changed objects are only sent their changed parameters (default=False)
+    :type DryRun: boolean
+    :param DryRun: Set to `True` to plan the import without changing the MX. Only GET API calls are sent (to check which objects exist), other calls are recorded. Only the calls of the import are recorded - other threads can use the connection as usual.
+                   The dry run loads the objects it uses into a separate cache, so objects that were loaded before (e.g. held by the caller) never get the simulated changes (default=False)
+    :rtype: list of dict (dict in dry run mode)
     :return: Log with details of all import events and their outcome.
+             In dry run mode - 'Calls' (ordered list of API calls with 'Method', 'Url', 'BodySize' and 'Phase'), 'Phases' (number of calls per phase and method), 'AverageLatency' (of the GET calls), 'EstimatedDuration' (seconds, assuming all calls take the average latency) and 'Log'.
+
+    :type Journal: string
+    :param Journal: Path of an import journal file. Completed operations are recorded in the journal, so if the import is interrupted, running it again with the same journal skips the operations that were already completed (unless the object changed in the JSON). The journal can only be used with the MX it was created for. A dry run only reads the journal (default=None)
+    :type Delete: boolean
+    :param Delete: Set to `True` to also delete the objects that only exist in the MX (the 'DELETE' entries of :py:meth:`imperva_sdk.MxConnection.diff_from_json`). Requires `SkipUnchanged`.
+                   Objects are deleted one at a time after all other operations. Use with `DryRun` first to review the deletions (default=False)
+
+    >>> plan = mx.import_from_json(export, DryRun=True)
+    >>> plan['Phases']['sites']
+    {'GET': 42, 'POST': 12, 'PUT': 3}
+    >>> log = mx.import_from_json(export, Journal='/tmp/import.journal')
+    .. note:: For large exports, use :py:meth:`imperva_sdk.MxConnection.import_from_file` to avoid loading the entire export into memory.
     '''
     try:
-      json_config = json.loads(Json)
+      json_config = json_loads(Json)
       imperva_sdk_version = json_config['metadata']['SdkVersion']
     except:
       raise MxException("Invalid JSON configuration")
+    if Delete and not SkipUnchanged:
+      raise MxException("Delete can only be used with SkipUnchanged")
+
+    if DryRun:
+      if self._dry_run is not None:
+        raise MxException("A dry run import is already running")
+      self._dry_run = DryRunRecorder()
+    journal = ImportJournal(Journal, ReadOnly=DryRun, Host=self.Host) if Journal else None
+    try:
+      if SkipUnchanged:
+        json_config, report, deletions = self._diff_from_config(json_config, Workers=Workers)
+      plan = self._plan_import_from_json(json_config, update=update)
+      if Delete:
+        self._plan_deletions(plan, deletions)
+      log = plan.run(Workers=Workers, Journal=journal)
+      if DryRun:
+        return self._dry_run.report(plan, Log=log, Workers=Workers)
+      return log
+    finally:
+      if journal:
+        journal.close()
+      if DryRun:
+        self._dry_run = None
+
+  def diff_from_json(self, Json=None, Workers=1):
+    '''
+    Compare MX configuration in a JSON string (e.g. an export from another MX) with the current MX configuration.
+    Only the objects in the JSON are loaded from the MX - a GET per object and a listing of each non-empty object list in the JSON (to find objects that only exist in the MX).
+    Only parameters that appear in the JSON are compared. Empty object lists aren't compared (exports have empty lists for discarded objects), so objects under them are never reported as deleted.
+
+    >>> report = mx.diff_from_json(export)
+    >>> [entry for entry in report if entry['Action'] != 'UNCHANGED']
+    [{'Function': 'create_server_group', 'Object Name': 'sg1', 'Parent': 'site1', 'Action': 'UPDATE', 'Changes': ['OperationMode']}, {'Function': 'delete_server_group', 'Object Name': 'sg2', 'Parent': 'site1', 'Action': 'DELETE'}]
+
+    :type Json: string
+    :param Json: valid imperva_sdk JSON export
+    :type Workers: int
+    :param Workers: Number of threads used to load the current objects from the MX (default=1)
+    :rtype: list of dict
+    :return: An entry per object in the JSON (in import order) with the 'Action' that import would take - 'CREATE', 'UPDATE' (with the changed parameters in 'Changes') or 'UNCHANGED',
+             and a 'DELETE' entry per object that only exists in the MX (deleted by import with `Delete`).
+             Parameters that are empty in the JSON but not in the MX are listed in 'NotApplied' - they aren't cleared (import with `SkipUnchanged` keeps the MX value).
+    '''
+    try:
+      json_config = json_loads(Json)
+    except:
+      raise MxException("Invalid JSON configuration")
+    return self._diff_from_config(json_config, Workers=Workers)[1]
+
+  def _diff_from_config(self, json_config, Workers=1):
+    '''
+    Compares an import configuration with the MX configuration.
+    :return: (changes, report, deletions) - `changes` is an import configuration with the new objects (with all of their parameters), the changed objects
+             (with the changed parameters - the other parameters are None, so the update keeps their MX value) and the unchanged objects that have changed children,
+             `report` is the list returned by :py:meth:`diff_from_json` and `deletions` has a (report entry, delete function, parameters) tuple per object that only exists in the MX
+    '''
+    def get_current(get_function, cur_object):
+      arguments = _function_arguments(get_function)
+      if 'Name' in arguments:
+        parameters = {'Name': cur_object.get('Name')}
+      else:
+        # Objects without a name parameter are identified by other parameters (e.g. KRP rules by GatewayGroup, Alias and GatewayPorts)
+        parameters = dict((arg, cur_object[arg]) for arg in arguments if arg in cur_object)
+      try:
+        return get_function(**parameters)
+      except MxExceptionNotFound:
+        return None
+
+    def diff_object(report, cur_object, current_object, parent_object, function_name, parent):
+      parameters = dict((field, cur_object[field]) for field in cur_object if is_parameter.match(field))
+      not_applied = []
+      if current_object is None:
+        action = 'CREATE'
+        changed_parameters = parameters
+      else:
+        current_parameters = _current_parameters(current_object, list(parameters))
+        empty = (None, '', [], {})
+        changes = [field for field in parameters if field != 'Name' and current_parameters.get(field) != parameters[field]]
+        # Most create functions skip empty values (e.g. 'if ProtectedIps:'), so parameters are never cleared - the MX value is kept
+        not_applied = [field for field in changes if parameters[field] in empty and current_parameters.get(field) not in empty]
+        changes = [field for field in changes if parameters[field] not in empty]
+        action = 'UPDATE' if changes else 'UNCHANGED'
+        if current_object._replaced_on_update:
+          # The object is deleted and created again (e.g. KRP rules), so it needs all of its parameters
+          changed_parameters = dict(parameters)
+          changed_parameters.update((field, current_parameters[field]) for field in not_applied)
+        else:
+          # The update only sets parameters that aren't None, so only the changed parameters are sent
+          create_function = getattr(parent_object, function_name)
+          changed_parameters = dict((arg, None) for arg in _function_arguments(create_function) if is_parameter.match(arg))
+          changed_parameters.update((field, parameters[field]) for field in ['Name'] + changes)
+      entry = {'Function': function_name, 'Object Name': cur_object.get('Name'), 'Action': action}
+      if parent:
+        entry['Parent'] = parent
+      if action == 'UPDATE':
+        entry['Changes'] = sorted(changes)
+      if not_applied:
+        entry['NotApplied'] = sorted(not_applied)
+      report.append(entry)
+      return action, changed_parameters
+
+    def find_deleted(report, deletions, parent_object, objects, object_type, parent, object_kind=None):
+      # Empty lists aren't compared - exports have empty lists for discarded objects
+      if parent_object is None or not objects:
+        return None
+      if object_kind:
+        get_all_function = _get_all_objects_function(self, object_type, object_kind)
+        delete_function = _get_object_function(self, 'delete', object_type, object_kind)
+        function_name = delete_function.__name__ if delete_function else 'delete_%s_%s' % (object_type, object_kind)
+      else:
+        get_all_function = getattr(parent_object, 'get_all_' + object_type, None)
+        function_name = 'delete_' + object_type[:-1]
+        delete_function = getattr(parent_object, function_name, None)
+      if get_all_function is None:
+        return None
+      names = set(cur_object.get('Name') for cur_object in objects)
+      for current_object in get_all_function():
+        if current_object is None or current_object.Name in names:
+          continue
+        entry = {'Function': function_name, 'Object Name': current_object.Name, 'Action': 'DELETE'}
+        if parent:
+          entry['Parent'] = parent
+        report.append(entry)
+        deletions.append((entry, delete_function, _object_parameters(delete_function, current_object) if delete_function else None))
+      return None
 
-    log = self._create_objects_from_json(Objects=json_config['global_objects'], Type="global_object", update=update)
-    log += self._create_tree_from_json(Dict={'sites': json_config['sites']}, ParentObject=self, update=update)
-    log += self._create_tree_from_json(Dict={'action_sets': json_config['action_sets']}, ParentObject=self, update=update)
-    log += self._create_tree_from_json(Dict={'assessment_tests': json_config['assessment_tests']}, ParentObject=self, update=update)
-    log += self._create_objects_from_json(Objects=json_config['policies'], Type="policy", update=update)
-    log += self._create_tree_from_json(Dict={'classification_profiles': json_config['classification_profiles']}, ParentObject=self, update=update)
-    log += self.import_dam_reports(Json)
-    log += self.import_das_objects(Json)
+    def diff_tree(report, deletions, parent_object, cur_object, object_type, parent=''):
+      current_object = None
+      if parent_object is not None:
+        current_object = get_current(getattr(parent_object, 'get_' + object_type[:-1]), cur_object)
+      action, changed_object = diff_object(report, cur_object, current_object, parent_object, 'create_' + object_type[:-1], parent)
+      path = '/'.join([x for x in (parent, cur_object.get('Name')) if x])
+      for field in cur_object:
+        if not is_parameter.match(field):
+          changed_children = []
+          for child in cur_object[field]:
+            changed_child = diff_tree(report, deletions, current_object, child, field, path)
+            if changed_child is not None:
+              changed_children.append(changed_child)
+          find_deleted(report, deletions, current_object, cur_object[field], field, path)
+          if changed_children:
+            changed_object[field] = changed_children
+      if action != 'UNCHANGED' or any(not is_parameter.match(field) for field in changed_object):
+        return changed_object
+      return None
+
+    def diff_objects(report, deletions, cur_object, object_type, object_kind):
+      get_function = _get_object_function(self, 'get', object_type, object_kind)
+      current_object = get_current(get_function, cur_object) if get_function else None
+      action, changed_object = diff_object(report, cur_object, current_object, self, 'create_%s_%s' % (object_type, object_kind), '')
+      return changed_object if action != 'UNCHANGED' else None
+
+    # Each top level object (and each listing) is a task, so the objects can be loaded concurrently. The results are merged in task order.
+    def diff_task(function, *args):
+      def task():
+        report = []
+        deletions = []
+        return [function(report, deletions, *args), report, deletions]
+      return task
+
+    # Same order as the import (see _plan_import_from_json)
+    changes = {'metadata': json_config.get('metadata')}
+    targets = []
+    tasks = []
+    for section, object_kind in [('global_objects', 'global_object'), ('sites', None), ('action_sets', None), ('assessment_tests', None),
+                                 ('policies', 'policy'), ('classification_profiles', None), ('dam_reports', 'dam_report'), ('das_objects', 'das_object')]:
+      if object_kind is None:
+        changes[section] = []
+        objects = json_config.get(section) or []
+        for cur_object in objects:
+          targets.append(changes[section])
+          tasks.append(diff_task(diff_tree, self, cur_object, section))
+        targets.append(None)
+        tasks.append(diff_task(find_deleted, self, objects, section, ''))
+      else:
+        changes[section] = {}
+        for object_type in json_config.get(section) or {}:
+          changes[section][object_type] = []
+          objects = json_config[section][object_type]
+          for cur_object in objects:
+            targets.append(changes[section][object_type])
+            tasks.append(diff_task(diff_objects, cur_object, object_type, object_kind))
+          targets.append(None)
+          tasks.append(diff_task(find_deleted, self, objects, object_type, '', object_kind))
+
+    report = []
+    deletions = []
+    for (changed_object, task_report, task_deletions), target in zip(self._iter_export_tasks(tasks, Workers), targets):
+      if changed_object is not None:
+        target.append(changed_object)
+      report += task_report
+      deletions += task_deletions
+    return changes, report, deletions
+
+  def import_from_file(self, File=None, update=True, Workers=1, Discard=[], Journal=None):
+    '''
+    Import MX configuration from a JSON export file (e.g. created by :py:meth:`imperva_sdk.MxConnection.export_to_file`).
+    Unlike :py:meth:`imperva_sdk.MxConnection.import_from_json`, the file is not loaded into memory - objects are parsed and imported one at a time (or a few at a time when Workers > 1),
+    so memory usage doesn't depend on the size of the export.
+    .. note:: The function only imports objects that are implemented in imperva_sdk. It is not the entire MX configuration.
+
+    >>> mx1.export_to_file('/tmp/export.json')
+    >>> log = mx2.import_from_file('/tmp/export.json', Discard=['ProtectedIps'])
+
+    :type File: string or file object
+    :param File: Path of the export file or a file object opened in binary mode
+    :type update: boolean
+    :param update: See :py:meth:`imperva_sdk.MxConnection.import_from_json`
+    :type Workers: int
+    :param Workers: Number of import operations that can run concurrently (default=1)
+    :type Discard: list of string
+    :param Discard: Attributes to discard from the imported objects (e.g. `['ProtectedIps', 'ApplyToAgent']`)
+    :type Journal: string
+    :param Journal: Path of an import journal file to resume an interrupted import (see :py:meth:`imperva_sdk.MxConnection.import_from_json`)
+    :rtype: list of dict
+    :return: Log with details of all import events and their outcome (in import order).
+    '''
+    journal = ImportJournal(Journal, Host=self.Host) if Journal else None
+    try:
+      if hasattr(File, 'read'):
+        return self._import_from_stream(JsonStreamReader(File), update=update, Workers=Workers, Discard=Discard, Journal=journal)
+      with open(File, 'rb') as f:
+        return self._import_from_stream(JsonStreamReader(f), update=update, Workers=Workers, Discard=Discard, Journal=journal)
+    finally:
+      if journal:
+        journal.close()
+
+  def _import_from_stream(self, Reader, update=True, Workers=1, Discard=[], Journal=None):
+    try:
+      sections = Reader.index()
+      imperva_sdk_version = Reader.load(*sections['metadata'])['SdkVersion']
+    except:
+      raise MxException("Invalid JSON configuration")
 
+    batch_size = max(1, Workers)
+    def batches(items):
+      batch = []
+      for key, cur_object in items:
+        _dict_discard(cur_object, Discard)
+        batch.append(cur_object)
+        if len(batch) >= batch_size:
+          yield batch
+          batch = []
+      if batch:
+        yield batch
+
+    # Sections are imported in dependency order (see _plan_import_from_json), object types within a section as well
+    log = []
+    for section, object_kind in [('global_objects', 'global_object'), ('sites', None), ('action_sets', None), ('assessment_tests', None),
+                                 ('policies', 'policy'), ('classification_profiles', None), ('dam_reports', 'dam_report'), ('das_objects', 'das_object')]:
+      if section not in sections:
+        continue
+      if object_kind is None:
+        for batch in batches(Reader.iter_items(sections[section][0])):
+          plan = ImportPlan()
+          self._plan_tree_from_json(plan, Dict={section: batch}, ParentObject=self, update=update, Tags=[section])
+          log += plan.run(Workers=Workers, Journal=Journal)
+      else:
+        object_types = Reader.index(sections[section][0])
+        # DAM reports and DAS objects are always imported with update=True
+        object_update = update if object_kind in ('global_object', 'policy') else True
+        for object_type in sort_import_types(object_kind, sorted(object_types)):
+          for batch in batches(Reader.iter_items(object_types[object_type][0])):
+            plan = ImportPlan()
+            self._plan_objects_from_json(plan, Objects={object_type: batch}, Type=object_kind, update=object_update)
+            log += plan.run(Workers=Workers, Journal=Journal)
     return log
 
+  def _plan_import_from_json(self, json_config, update=True):
+    '''
+    Builds the dependency graph (:py:class:`imperva_sdk.ImportPlan.ImportPlan`) of a full import.
+    Nodes are added in the order of a serial import.
+    '''
+    plan = ImportPlan()
+    self._plan_objects_from_json(plan, Objects=json_config['global_objects'], Type="global_object", update=update)
+    self._plan_tree_from_json(plan, Dict={'sites': json_config['sites']}, ParentObject=self, update=update, Tags=['sites'])
+    self._plan_tree_from_json(plan, Dict={'action_sets': json_config['action_sets']}, ParentObject=self, update=update, Tags=['action_sets'])
+    self._plan_tree_from_json(plan, Dict={'assessment_tests': json_config['assessment_tests']}, ParentObject=self, update=update, Tags=['assessment_tests'])
+    self._plan_objects_from_json(plan, Objects=json_config['policies'], Type="policy", update=update)
+    self._plan_tree_from_json(plan, Dict={'classification_profiles': json_config['classification_profiles']}, ParentObject=self, update=update, Tags=['classification_profiles'])
+    # DAM reports and DAS objects are always imported with update=True
+    self._plan_objects_from_json(plan, Objects=json_config['dam_reports'], Type="dam_report")
+    self._plan_objects_from_json(plan, Objects=json_config['das_objects'], Type="das_object")
+    return plan
+
+  def _plan_deletions(self, Plan, Deletions):
+    '''
+    Adds a node per object that only exists in the MX (see _diff_from_config) to the import plan.
+    Objects are deleted after all other nodes, one at a time and in reverse import order (e.g. policies before the global objects they use).
+    '''
+    previous = list(Plan.Nodes)
+    for entry, delete_function, parameters in reversed(Deletions):
+      def delete_object(node, entry=entry, delete_function=delete_function, parameters=parameters):
+        log_entry = dict((field, entry[field]) for field in ['Function', 'Object Name', 'Parent'] if field in entry)
+        if delete_function is None:
+          log_entry['Result'] = "ERROR"
+          log_entry['Error Message'] = "Delete is not supported for this object type"
+          return [log_entry]
+        try:
+          delete_function(**parameters)
+          log_entry['Result'] = "SUCCESS"
+        except Exception as e:
+          log_entry['Result'] = "ERROR"
+          log_entry['Error Message'] = str(e)
+        return [log_entry]
+      key = '/'.join([x for x in ('delete', entry.get('Parent'), entry['Function'], entry['Object Name']) if x])
+      node = Plan.add(self._dry_run_step(delete_object), Tags=['delete'], DependsOn=previous, Key=key, Hash=import_hash(entry['Function'], parameters))
+      previous = [node]
+
   def _create_objects_from_json(self, Objects=None, Type=None, update=True):
-    log = []
+    plan = ImportPlan()
+    self._plan_objects_from_json(plan, Objects=Objects, Type=Type, update=update)
+    return plan.run()
+
+  def _plan_objects_from_json(self, Plan, Objects=None, Type=None, update=True):
+    '''
+    Adds a node for each object to the import plan. Nodes are tagged by `Type` and `Type:object_type` (e.g. 'policy:web_service_custom').
+    '''
+    nodes = []
     for object_type in Objects:
       create_name = 'create_' + object_type
       if Type:
         create_name += '_' + Type
 
       create_function = getattr(self, create_name)
+      tags = [Type, '%s:%s' % (Type, object_type)] if Type else [object_type]
       for cur_object in Objects[object_type]:
-        log_entry = {
-          'Function': create_name,
-          'Object Name': cur_object['Name']
-        }
-        try:
-          cur_object['update'] = update
-          create_function(**cur_object)
-          log_entry['Result'] = "SUCCESS"
-        except Exception as e:
-          log_entry['Result'] = "ERROR"
-          log_entry['Error Message'] = str(e)
-        log.append(log_entry)
-    return log
+        def create_object(node, create_name=create_name, create_function=create_function, cur_object=cur_object):
+          log_entry = {
+            'Function': create_name,
+            'Object Name': cur_object['Name']
+          }
+          try:
+            parameters = dict(cur_object)
+            parameters['update'] = update
+            node.Result = create_function(**parameters)
+            log_entry['Result'] = "SUCCESS"
+          except Exception as e:
+            log_entry['Result'] = "ERROR"
+            log_entry['Error Message'] = str(e)
+          return [log_entry]
+        nodes.append(Plan.add(self._dry_run_step(create_object), Tags=tags, Key='%s/%s' % (create_name, cur_object['Name']),
+                              Hash=import_hash(create_name, cur_object, update)))
+    return nodes
 
   def _create_tree_from_json(self, Dict=None, ParentObject=None, update=True):
-    log = []
+    plan = ImportPlan()
+    self._plan_tree_from_json(plan, Dict=Dict, ParentObject=ParentObject, update=update)
+    return plan.run()
+
+  def _plan_tree_from_json(self, Plan, Dict=None, ParentObject=None, ParentNode=None, update=True, Tags=[], Path=''):
+    '''
+    Adds a node for each object in the tree to the import plan. Child nodes depend on the node that creates their parent object.
+    The parent object is `ParentObject` for the top level and the result of `ParentNode` for children.
+    `Path` is the location of `Dict` in the tree (e.g. 'sites/site 1'), used as the object identity in the import journal.
+    '''
+    def get_parent_object():
+      return ParentNode.get_result() if ParentNode else ParentObject
+
+    nodes = []
     for object_type in Dict:
       for cur_object in Dict[object_type]:
         parent_object_parameters = {}
@@ -2308,24 +3318,38 @@ class MxConnection(object):
             parent_object_parameters[field] = cur_object[field]
           else:
             child_objects[field] = cur_object[field]
-        parent_object = None
-        log_entry = {
-          'Function': "create_" + object_type[:-1],
-          'Parameters': ",".join(["%s=%s" % (x, parent_object_parameters[x]) for x in parent_object_parameters]),
-          'Parent': str(ParentObject)
-        }
-        try:
-          create_function = getattr(ParentObject, "create_" + object_type[:-1])
-          parent_object_parameters['update'] = update
 
-          parent_object = create_function(**parent_object_parameters)
-          log_entry['Result'] = "SUCCESS"
-        except Exception as e:
-          log_entry['Result'] = "ERROR"
-          log_entry['Error Message'] = str(e)
-        log.append(log_entry)
+        def create_object(node, object_type=object_type, parent_object_parameters=parent_object_parameters):
+          parent_object = get_parent_object()
+          log_entry = {
+            'Function': "create_" + object_type[:-1],
+            'Parameters': ",".join(["%s=%s" % (x, parent_object_parameters[x]) for x in parent_object_parameters]),
+            'Parent': str(parent_object)
+          }
+          try:
+            create_function = getattr(parent_object, "create_" + object_type[:-1])
+            parameters = dict(parent_object_parameters)
+            parameters['update'] = update
+            node.Result = create_function(**parameters)
+            log_entry['Result'] = "SUCCESS"
+          except Exception as e:
+            log_entry['Result'] = "ERROR"
+            log_entry['Error Message'] = str(e)
+          return [log_entry]
 
-        log += self._create_tree_from_json(child_objects, parent_object)
+        def placeholder(node, object_type=object_type, parent_object_parameters=parent_object_parameters):
+          self._dry_run_placeholder(object_type, get_parent_object(), parent_object_parameters)
+
+        # If the object was imported before an interrupted import, its children get it from the MX
+        def resolve(object_type=object_type, parent_object_parameters=parent_object_parameters):
+          get_function = getattr(get_parent_object(), "get_" + object_type[:-1])
+          return get_function(Name=parent_object_parameters.get('Name'))
+
+        key = '/'.join([x for x in (Path, object_type, str(parent_object_parameters.get('Name'))) if x])
+        node = Plan.add(self._dry_run_step(create_object, Placeholder=placeholder), Tags=Tags, DependsOn=[ParentNode],
+                        Key=key, Hash=import_hash("create_" + object_type[:-1], parent_object_parameters, update), Resolve=resolve)
+        children = self._plan_tree_from_json(Plan, Dict=child_objects, ParentNode=node, Tags=Tags, Path=key)
+        nodes += [node] + children
 
         #-----------------------------------------------------------------------
         # Unfortunately, there are cases in which you must update the created
@@ -2340,18 +3364,72 @@ class MxConnection(object):
         #-----------------------------------------------------------------------
 
         funcname = "create_" + object_type[:-1] + "_pc"
-        if funcname in dir(ParentObject):
-          try:
-            log_entry['Function'] = funcname
-            create_function = getattr(ParentObject, funcname)
-            parent_object = create_function(**parent_object_parameters)
-            log_entry['Result'] = "SUCCESS"
-          except Exception as e:
-            log_entry['Result'] = "ERROR"
-            log_entry['Error Message'] = str(e)
-          log.append(log_entry)
+        if hasattr(self, funcname):
+          def post_children(node, create_node=node, funcname=funcname, parent_object_parameters=parent_object_parameters):
+            parent_object = get_parent_object()
+            if not hasattr(parent_object, funcname):
+              return []
+            log_entry = dict(create_node.Log[0])
+            log_entry.pop('Error Message', None)
+            try:
+              log_entry['Function'] = funcname
+              create_function = getattr(parent_object, funcname)
+              parameters = dict(parent_object_parameters)
+              parameters['update'] = update
+              create_function(**parameters)
+              log_entry['Result'] = "SUCCESS"
+            except Exception as e:
+              log_entry['Result'] = "ERROR"
+              log_entry['Error Message'] = str(e)
+            return [log_entry]
+          nodes.append(Plan.add(self._dry_run_step(post_children), Tags=Tags, DependsOn=[node] + children,
+                                Key=key + '/' + funcname, Hash=import_hash(funcname, parent_object_parameters, update)))
+
+    return nodes
+
+  def _dry_run_step(self, Function, Placeholder=None):
+    '''
+    Wraps the function of an import plan node so that in dry run mode its API calls are recorded for the node.
+    `Placeholder(node)` is called when the node makes its first change, to store a placeholder for the object it would have created.
+    '''
+    # The plan is built in the thread of the import - its nodes run in worker threads with the same recorder
+    dry_run = self._dry_run
+    if dry_run is None:
+      return Function
+    def step(node):
+      thread_dry_run = self._dry_run
+      self._dry_run = dry_run
+      dry_run.begin(node, Placeholder=(lambda: Placeholder(node)) if Placeholder else None)
+      try:
+        return Function(node)
+      finally:
+        dry_run.end()
+        self._dry_run = thread_dry_run
+    return step
 
-    return log
+  def _dry_run_placeholder(self, ObjectType, ParentObject, Parameters):
+    '''
+    Stores an object that a dry run import would have created (e.g. 'server_groups' under a site), so its children can be "created" as well.
+    The object only has its identifying parameters (see MxObject._key_fields).
+    '''
+    class_name = ''.join(word.capitalize() for word in ObjectType[:-1].split('_'))
+    object_class = globals().get(class_name)
+    if not isinstance(object_class, type) or not issubclass(object_class, MxObject) or not object_class._key_fields:
+      return
+    key = {'Name': Parameters.get('Name')}
+    for field in object_class._key_fields:
+      if field == 'Name':
+        continue
+      if type(ParentObject).__name__ == field:
+        key[field] = ParentObject.Name
+      else:
+        key[field] = getattr(ParentObject, '_' + field, None)
+    if object_class._exists(connection=self, **key) is None:
+      try:
+        # Stored in the identity map of the dry run
+        object_class(connection=self, **key)
+      except Exception:
+        pass
 
   def _get_mx_proxy_settings(self):
     '''
@@ -2394,7 +3472,7 @@ class MxConnection(object):
       'domain': Domain
     }
 
-    self._mx_api('PUT', '/conf/systemDefinitions/httpProxy', data=json.dumps(body))
+    self._mx_api('PUT', '/conf/systemDefinitions/httpProxy', data=json_dumps(body))
 
     return True
 
@@ -2409,6 +3487,6 @@ class MxConnection(object):
       'value': Enabled
     }
 
-    self._mx_api('PUT', '/conf/systemDefinitions/hybrid-waf', data=json.dumps(body))
+    self._mx_api('PUT', '/conf/systemDefinitions/hybrid-waf', data=json_dumps(body))
 
     return True
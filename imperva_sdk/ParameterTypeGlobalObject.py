@@ -9,23 +9,6 @@ class ParameterTypeGlobalObject(MxObject):
 
   '''
 
-  # Store created Parameter Type Global Object objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = ParameterTypeGlobalObject._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'ParameterTypeGlobalObject':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-  
   def __init__(self, connection=None, Name=None, Regex=None):
     super(ParameterTypeGlobalObject, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name)
@@ -96,7 +79,7 @@ class ParameterTypeGlobalObject(MxObject):
       body = {
         'regularExpression': Regex
       }
-      connection._mx_api('POST', '/conf/globalObjects/parameterTypeConfiguration/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/globalObjects/parameterTypeConfiguration/%s' % Name, data=json_dumps(body))
       return ParameterTypeGlobalObject(connection=connection, Name=Name, Regex=Regex)
   @staticmethod
   def _delete_parameter_type_global_object(connection, Name=None):
@@ -104,7 +87,7 @@ class ParameterTypeGlobalObject(MxObject):
     obj = connection.get_parameter_type_global_object(Name=Name)
     if obj:
       connection._mx_api('DELETE', '/conf/globalObjects/parameterTypeConfiguration/%s' % Name)
-      connection._instances.remove(obj)
+      connection._instances.discard(obj)
       del obj
     else:
       raise MxException("Parameter Type Configuration does not exist")
@@ -112,6 +95,6 @@ class ParameterTypeGlobalObject(MxObject):
   @staticmethod
   def _update_parameter_type_global_object(connection, Name=None, Parameter=None, Value=None):
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/globalObjects/parameterTypeConfiguration/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/globalObjects/parameterTypeConfiguration/%s' % Name, data=json_dumps(body))
     return True
 
@@ -0,0 +1,137 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import os
+import json
+import time
+from imperva_sdk.core import *
+from imperva_sdk.ResponseCache import *
+from imperva_sdk.ResponseCache import _url_host
+
+try:
+  import sqlite3
+except ImportError:
+  sqlite3 = None
+
+# API paths with credentials in their responses (SSL private keys and passwords, DB and cloud account passwords, proxy password) - never stored in the file
+PrivateResponsePaths = ('/sslCertificates', '/dbConnections', '/cloudAccounts', '/logCollectors', '/httpProxy')
+
+class PersistentResponseCache(ResponseCache):
+  '''
+  :py:class:`imperva_sdk.ResponseCache.ResponseCache` that is stored in an SQLite file, so new connections (and other processes) start with the responses of previous ones.
+  Responses are stored by MX host, MX user and URL. One file can be shared by connections to several MXs and with several users.
+  Responses of API paths that hold credentials (see :py:data:`PrivateResponsePaths`) are never stored.
+
+  >>> cache = imperva_sdk.PersistentResponseCache('/var/tmp/mx-cache.db', MaxAge=600)
+  >>> mx = imperva_sdk.MxConnection(Host="192.168.0.1", ResponseCache=cache)
+
+  :type Path: string
+  :param Path: Path of the SQLite file (created if it doesn't exist, readable only by the current user)
+  :type MaxBytes: int
+  :param MaxBytes: Maximum total size of the stored response bodies in bytes (default=64MB)
+  :type MaxAge: float
+  :param MaxAge: Number of seconds a stored response is used without asking the MX (see :py:class:`imperva_sdk.ResponseCache.ResponseCache`).
+                 Required - the MX API doesn't send ETag / Last-Modified headers, so without it the next connections could never use the stored responses
+  .. note:: The file holds the MX configuration as returned by the API - keep it private. Changes made to the MX by other clients are only seen after 'MaxAge'.
+  '''
+  def __init__(self, Path=None, MaxBytes=DefaultCacheMaxBytes, MaxAge=None):
+    if sqlite3 is None:
+      raise MxException("PersistentResponseCache requires the Python sqlite3 module")
+    if not Path:
+      raise MxException("PersistentResponseCache requires the Path of the SQLite file")
+    if not MaxAge or MaxAge <= 0:
+      raise MxException("PersistentResponseCache requires MaxAge (the MX doesn't send validators, so stored responses are only used for 'MaxAge' seconds)")
+    self.Path = Path
+    self._db = None
+    super(PersistentResponseCache, self).__init__(MaxBytes=MaxBytes, MaxAge=MaxAge)
+
+  def _get_db(self):
+    ''' Opens the SQLite file (again after close) - called with the lock held '''
+    if self._db is None:
+      if not os.path.exists(self.Path):
+        os.close(os.open(self.Path, os.O_CREAT | os.O_RDWR, 0o600))
+      self._db = sqlite3.connect(self.Path, timeout=30, check_same_thread=False)
+      self._db.execute('PRAGMA journal_mode=WAL')
+      self._db.execute('PRAGMA synchronous=NORMAL')
+      # Files of older versions have a 'responses' table keyed by URL only - its responses can't be told apart by user
+      self._db.execute('DROP TABLE IF EXISTS responses')
+      self._db.execute('CREATE TABLE IF NOT EXISTS user_responses (host TEXT, user TEXT, url TEXT, validators TEXT, content BLOB, encoding TEXT, stored REAL, used REAL, size INTEGER, PRIMARY KEY (host, user, url))')
+      self._db.execute('CREATE INDEX IF NOT EXISTS user_responses_used ON user_responses (used)')
+      self._db.commit()
+    return self._db
+
+  def __len__(self):
+    with self._lock:
+      return self._get_db().execute('SELECT COUNT(*) FROM user_responses').fetchone()[0]
+
+  @property
+  def Size(self):
+    ''' Total size of the stored response bodies in bytes (read only) '''
+    with self._lock:
+      return self._get_size()
+
+  def _get_size(self):
+    return self._get_db().execute('SELECT COALESCE(SUM(size), 0) FROM user_responses').fetchone()[0]
+
+  def clear(self):
+    with self._lock:
+      db = self._get_db()
+      db.execute('DELETE FROM user_responses')
+      db.commit()
+
+  def close(self):
+    ''' Closes the SQLite file - the stored responses are kept for the next connection '''
+    with self._lock:
+      if self._db is not None:
+        self._db.close()
+        self._db = None
+
+  def store(self, Url, Response, User=None):
+    if any(path in Url for path in PrivateResponsePaths):
+      self.remove(Url, User)
+      return
+    super(PersistentResponseCache, self).store(Url, Response, User=User)
+
+  def _get_entry(self, Url, User):
+    with self._lock:
+      db = self._get_db()
+      key = (_url_host(Url), User or '', Url)
+      row = db.execute('SELECT validators, content, encoding, stored FROM user_responses WHERE host = ? AND user = ? AND url = ?', key).fetchone()
+      if row is None:
+        return None
+      db.execute('UPDATE user_responses SET used = ? WHERE host = ? AND user = ? AND url = ?', (time.time(),) + key)
+      db.commit()
+    return (json.loads(row[0]), bytes(row[1]), row[2], row[3])
+
+  def _put_entry(self, Url, User, Entry):
+    validators, content, encoding, stored = Entry
+    with self._lock:
+      db = self._get_db()
+      db.execute('INSERT OR REPLACE INTO user_responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (_url_host(Url), User or '', Url, json.dumps(validators), sqlite3.Binary(content), encoding, stored, time.time(), len(content)))
+      self._trim()
+      db.commit()
+
+  def _expire_entries(self, Host):
+    with self._lock:
+      db = self._get_db()
+      db.execute('UPDATE user_responses SET stored = 0 WHERE host = ?', (Host,))
+      db.commit()
+
+  def _trim(self):
+    db = self._get_db()
+    excess = self._get_size() - self._max_bytes
+    if excess <= 0:
+      return
+    # Remove the least recently used responses
+    removed = 0
+    for host, user, url, size in db.execute('SELECT host, user, url, size FROM user_responses ORDER BY used').fetchall():
+      if removed >= excess:
+        break
+      db.execute('DELETE FROM user_responses WHERE host = ? AND user = ? AND url = ?', (host, user, url))
+      removed += size
+    db.commit()
+
+  def _remove(self, Key):
+    user, url = Key
+    db = self._get_db()
+    db.execute('DELETE FROM user_responses WHERE host = ? AND user = ? AND url = ?', (_url_host(url), user or '', url))
+    db.commit()
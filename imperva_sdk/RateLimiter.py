@@ -0,0 +1,178 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import time
+import threading
+from imperva_sdk.core import *
+
+_clock = getattr(time, 'monotonic', time.time)
+
+class RateLimit(object):
+  '''
+  Token bucket rate limit with a maximum number of in-flight calls. The bucket starts full, so the first 'Burst' calls are sent at once.
+  Limits can be changed while calls are running - waiting calls use the new limit.
+
+  :type Rate: float
+  :param Rate: Maximum average number of calls per second (None for no rate limit)
+  :type Burst: int
+  :param Burst: Number of calls that can be sent at once before the rate limit applies (default=Rate, at least 1)
+  :type MaxInFlight: int
+  :param MaxInFlight: Maximum number of concurrent calls (None for no limit)
+  '''
+  def __init__(self, Rate=None, Burst=None, MaxInFlight=None):
+    self._condition = threading.Condition()
+    self._in_flight = 0
+    # Full (configure caps the tokens at Burst)
+    self._tokens = float('inf')
+    self._updated = _clock()
+    self.configure(Rate=Rate, Burst=Burst, MaxInFlight=MaxInFlight)
+
+  def __repr__(self):
+    return "<imperva_sdk 'RateLimit' Object - Rate=%s, Burst=%s, MaxInFlight=%s>" % (self.Rate, self.Burst, self.MaxInFlight)
+
+  def configure(self, Rate=None, Burst=None, MaxInFlight=None):
+    ''' Changes the limit (same parameters as the constructor) '''
+    if Rate is not None and Rate <= 0:
+      raise MxException("Rate must be a positive number of calls per second")
+    if MaxInFlight is not None and MaxInFlight < 1:
+      raise MxException("MaxInFlight must be at least 1")
+    with self._condition:
+      self._refill()
+      self.Rate = Rate
+      # The Burst parameter (None if it is derived from Rate) - kept by RateLimiter.set_limit when only other parameters change
+      self._burst = Burst
+      self.Burst = max(1, Burst if Burst is not None else int(Rate or 1))
+      self.MaxInFlight = MaxInFlight
+      if Rate is None:
+        self._tokens = float(self.Burst)
+      else:
+        self._tokens = min(self._tokens, float(self.Burst))
+      self._condition.notify_all()
+
+  @property
+  def InFlight(self):
+    ''' Number of calls that are running (read only) '''
+    return self._in_flight
+
+  def _refill(self):
+    now = _clock()
+    if self.__dict__.get('Rate'):
+      self._tokens = min(float(self.Burst), self._tokens + (now - self._updated) * self.Rate)
+    self._updated = now
+
+  def acquire(self):
+    ''' Waits until a call can be sent '''
+    with self._condition:
+      while True:
+        self._refill()
+        timeout = None
+        if self.MaxInFlight is None or self._in_flight < self.MaxInFlight:
+          if self.Rate is None:
+            break
+          if self._tokens >= 1:
+            self._tokens -= 1
+            break
+          timeout = (1 - self._tokens) / self.Rate
+        self._condition.wait(timeout)
+      self._in_flight += 1
+
+  def release(self):
+    ''' Marks a call that was sent with :py:meth:`acquire` as done '''
+    with self._condition:
+      self._in_flight -= 1
+      self._condition.notify_all()
+
+class RateLimiter(object):
+  '''
+  Client side rate limiter of the MX API calls of a connection (see :py:attr:`imperva_sdk.MxConnection.RateLimiter`).
+  A call waits for the global limit and for the limit of the longest URL prefix that matches its path (e.g. '/conf/webProfile').
+  There are no limits by default.
+
+  >>> mx.RateLimiter.set_limit(Rate=20, MaxInFlight=4)
+  >>> mx.RateLimiter.set_limit(Prefix='/conf/webProfile', Rate=2)
+  >>> mx.RateLimiter.remove_limit()
+  '''
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._global = None
+    self._prefixes = {}
+
+  def set_limit(self, Prefix=None, Rate=None, Burst=None, MaxInFlight=None):
+    '''
+    Sets (or changes) a limit. When a limit is changed, parameters that are None keep their current value (use :py:meth:`remove_limit` to clear them).
+
+    >>> mx.RateLimiter.set_limit(Rate=20)
+    >>> mx.RateLimiter.set_limit(MaxInFlight=4)
+    >>> mx.RateLimiter.get_limits()[None]
+    <imperva_sdk 'RateLimit' Object - Rate=20, Burst=20, MaxInFlight=4>
+
+    :type Prefix: string
+    :param Prefix: API path prefix (e.g. '/conf/webProfile') the limit applies to. None for the global limit of all calls
+    :param Rate: Maximum average number of calls per second (None for no rate limit)
+    :param Burst: Number of calls that can be sent at once before the rate limit applies (default=Rate)
+    :param MaxInFlight: Maximum number of concurrent calls (None for no limit)
+    '''
+    with self._lock:
+      limit = self._global if Prefix is None else self._prefixes.get(Prefix)
+      if limit is None:
+        limit = RateLimit(Rate=Rate, Burst=Burst, MaxInFlight=MaxInFlight)
+        if Prefix is None:
+          self._global = limit
+        else:
+          self._prefixes[Prefix] = limit
+      else:
+        limit.configure(Rate=Rate if Rate is not None else limit.Rate,
+                        Burst=Burst if Burst is not None else limit._burst,
+                        MaxInFlight=MaxInFlight if MaxInFlight is not None else limit.MaxInFlight)
+
+  def remove_limit(self, Prefix=None):
+    ''' Removes a limit (the global limit if Prefix is None). Calls that are waiting for the limit are released. '''
+    with self._lock:
+      if Prefix is None:
+        limit, self._global = self._global, None
+      else:
+        limit = self._prefixes.pop(Prefix, None)
+    if limit is not None:
+      limit.configure()
+
+  def get_limits(self):
+    '''
+    :rtype: dict
+    :return: {prefix: :py:class:`RateLimit`} of all limits (the global limit prefix is None)
+    '''
+    with self._lock:
+      limits = dict(self._prefixes)
+      if self._global is not None:
+        limits[None] = self._global
+    return limits
+
+  def _get_path_limits(self, Path):
+    with self._lock:
+      limits = []
+      prefixes = [prefix for prefix in self._prefixes if Path.startswith(prefix)]
+      if prefixes:
+        limits.append(self._prefixes[max(prefixes, key=len)])
+      if self._global is not None:
+        limits.append(self._global)
+    return limits
+
+  def acquire(self, Path=''):
+    '''
+    Waits until a call to the API path can be sent.
+    :rtype: list of :py:class:`RateLimit`
+    :return: The limits that were acquired - pass them to :py:meth:`release` when the call is done
+    '''
+    limits = self._get_path_limits(Path)
+    acquired = []
+    try:
+      # The prefix limit is taken first, so calls waiting for it don't hold a global in-flight slot
+      for limit in limits:
+        limit.acquire()
+        acquired.append(limit)
+    except:
+      self.release(acquired)
+      raise
+    return acquired
+
+  def release(self, Limits=[]):
+    for limit in Limits:
+      limit.release()
@@ -0,0 +1,172 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import time
+import threading
+from collections import OrderedDict
+from requests.models import Response as HttpResponse
+from imperva_sdk.core import *
+
+# Default maximum size of the cached response bodies (bytes)
+DefaultCacheMaxBytes = 64 * 1024 * 1024
+
+def _url_host(Url):
+  ''' The scheme, host and port of a URL (e.g. 'https://10.0.0.1:8083/') '''
+  return Url[:Url.find('/', Url.find('//') + 2) + 1]
+
+class ResponseCache(object):
+  '''
+  HTTP cache of MX API GET responses (see :py:attr:`imperva_sdk.MxConnection.ResponseCache`). Connections don't cache responses unless they are given a cache.
+  Responses with an 'ETag' or 'Last-Modified' header are stored. The next GET of the same URL is a conditional request
+  ('If-None-Match' / 'If-Modified-Since') and a '304 Not Modified' response is answered from the cache, so the body isn't downloaded again.
+  The least recently used responses are removed when the cached bodies exceed 'MaxBytes'.
+  Responses are stored by MX user and URL (which includes the MX host), so a cache can be shared by connections with different users.
+
+  >>> mx = imperva_sdk.MxConnection(Host="192.168.0.1", ResponseCache=imperva_sdk.ResponseCache(MaxAge=60))
+
+  :type MaxBytes: int
+  :param MaxBytes: Maximum total size of the cached response bodies in bytes. Set to 0 to disable the cache (default=64MB)
+  :type MaxAge: float
+  :param MaxAge: Number of seconds a stored response is used without asking the MX. Any change made through the connection (POST, PUT or DELETE) ends this period for all stored responses of the MX.
+                 When set, responses without validators are stored as well (default=0 - always revalidate)
+  .. note:: Responses without 'ETag' and 'Last-Modified' headers can't be revalidated by the MX, so they are only cached if 'MaxAge' is set.
+            The MX API doesn't send these headers, so a cache without 'MaxAge' stores nothing.
+  '''
+  def __init__(self, MaxBytes=DefaultCacheMaxBytes, MaxAge=0):
+    # (user, url) -> (validator headers, body, encoding, store time)
+    self._entries = OrderedDict()
+    self._size = 0
+    self._lock = threading.Lock()
+    self.MaxAge = MaxAge
+    self.MaxBytes = MaxBytes
+
+  def __repr__(self):
+    return "<imperva_sdk '%s' Object - %d responses, %d/%d bytes>" % (type(self).__name__, len(self), self.Size, self.MaxBytes)
+
+  def __len__(self):
+    return len(self._entries)
+
+  @property
+  def MaxBytes(self):
+    ''' Maximum total size of the cached response bodies in bytes (least recently used responses are removed when it is lowered) '''
+    return self._max_bytes
+  @MaxBytes.setter
+  def MaxBytes(self, value):
+    with self._lock:
+      self._max_bytes = value
+      self._trim()
+
+  @property
+  def Size(self):
+    ''' Total size of the cached response bodies in bytes (read only) '''
+    return self._size
+
+  def get_validators(self, Url, User=None):
+    '''
+    :rtype: dict
+    :return: Conditional request headers for a GET of the URL by the MX user (empty if the URL isn't cached)
+    '''
+    entry = self._get_entry(Url, User)
+    if entry is None:
+      return {}
+    validators = entry[0]
+    headers = {}
+    if 'ETag' in validators:
+      headers['If-None-Match'] = validators['ETag']
+    if 'Last-Modified' in validators:
+      headers['If-Modified-Since'] = validators['Last-Modified']
+    return headers
+
+  def get_fresh(self, Url, User=None):
+    '''
+    :rtype: `requests` response
+    :return: The stored response of the URL if it was stored less than 'MaxAge' seconds ago, otherwise None (the MX must be asked)
+    '''
+    if not self.MaxAge:
+      return None
+    entry = self._get_entry(Url, User)
+    if entry is None or time.time() - entry[3] >= self.MaxAge:
+      return None
+    response = HttpResponse()
+    response.url = Url
+    response.status_code = 200
+    response.reason = 'OK'
+    response._content = entry[1]
+    response.encoding = entry[2]
+    return response
+
+  def store(self, Url, Response, User=None):
+    ''' Stores a 200 GET response if it has validators or 'MaxAge' is set (otherwise a previous response of the URL is removed) '''
+    validators = dict((header, Response.headers[header]) for header in ('ETag', 'Last-Modified') if Response.headers.get(header))
+    content = Response.content
+    if (validators or self.MaxAge) and len(content) <= self.MaxBytes:
+      self._put_entry(Url, User, (validators, content, Response.encoding, time.time()))
+    else:
+      self.remove(Url, User)
+
+  def revalidate(self, Url, Response, User=None):
+    '''
+    Turns a '304 Not Modified' response into the cached 200 response of the URL.
+    :rtype: boolean
+    :return: False if the URL isn't cached (anymore)
+    '''
+    entry = self._get_entry(Url, User)
+    if entry is None:
+      return False
+    validators, content, encoding, stored = entry
+    # The MX confirmed the response, so it can be used for another 'MaxAge' period
+    self._put_entry(Url, User, (validators, content, encoding, time.time()))
+    Response.status_code = 200
+    Response.reason = 'OK'
+    Response._content = content
+    Response.encoding = encoding
+    return True
+
+  def expire(self, Url):
+    ''' Called when the configuration of the MX of the URL changes - stored responses of the MX (of all users) must be revalidated before they are used '''
+    self._expire_entries(_url_host(Url))
+
+  def remove(self, Url, User=None):
+    with self._lock:
+      self._remove((User, Url))
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._size = 0
+
+  def close(self):
+    ''' Called when the connection logs out '''
+    self.clear()
+
+  #
+  # Storage of the cache entries (in memory) - (validator headers, body, encoding, store time) tuples by (user, URL)
+  #
+  def _get_entry(self, Url, User):
+    with self._lock:
+      entry = self._entries.pop((User, Url), None)
+      if entry is not None:
+        # Most recently used
+        self._entries[(User, Url)] = entry
+      return entry
+
+  def _put_entry(self, Url, User, Entry):
+    with self._lock:
+      self._remove((User, Url))
+      self._entries[(User, Url)] = Entry
+      self._size += len(Entry[1])
+      self._trim()
+
+  def _expire_entries(self, Host):
+    with self._lock:
+      for key, entry in list(self._entries.items()):
+        if key[1].startswith(Host):
+          self._entries[key] = entry[:3] + (0,)
+
+  def _trim(self):
+    while self._size > self._max_bytes:
+      self._remove(next(iter(self._entries)))
+
+  def _remove(self, Key):
+    entry = self._entries.pop(Key, None)
+    if entry is not None:
+      self._size -= len(entry[1])
@@ -0,0 +1,97 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import time
+import random
+import email.utils
+from imperva_sdk.core import *
+
+# HTTP response codes that usually mean the MX is temporarily overloaded or restarting
+DefaultRetryStatus = (429, 500, 502, 503, 504)
+# Error descriptions (in the MX error response) of requests that can be sent again
+DefaultRetryErrors = ('System is busy',)
+
+class RetryPolicy(object):
+  '''
+  Retry policy of MX API calls (see :py:class:`imperva_sdk.MxConnection`).
+  Calls that fail with a connection error or with a temporary error response are sent again after an exponential backoff delay with random jitter.
+
+  >>> policy = imperva_sdk.RetryPolicy(MaxAttempts=5, BackoffFactor=1)
+  >>> mx = imperva_sdk.MxConnection(Host="192.168.0.1", RetryPolicy=policy)
+
+  :type Methods: list of string
+  :param Methods: HTTP methods that are retried. By default only idempotent methods are retried, because a POST that failed with a connection error may have been applied by the MX (default=['GET', 'PUT', 'DELETE'])
+  :type MaxAttempts: int
+  :param MaxAttempts: Maximum number of times a call is sent (including the first time). Set to 1 to disable retries (default=4)
+  :type BackoffFactor: float
+  :param BackoffFactor: Delay before the first retry in seconds. The delay is doubled for each retry (default=0.5)
+  :type MaxBackoff: float
+  :param MaxBackoff: Maximum delay between retries in seconds, also applied to 'Retry-After' response headers (default=30)
+  :type Jitter: boolean
+  :param Jitter: Wait a random time between 0 and the backoff delay, so concurrent calls don't retry at the same time (default=True)
+  :type RetryStatus: list of int
+  :param RetryStatus: HTTP response codes that are retried (default=[429, 500, 502, 503, 504])
+  :type RetryErrors: list of string
+  :param RetryErrors: MX error descriptions that are retried regardless of the response code (default=['System is busy'])
+  .. note:: All attempts of a call and the delays between them must finish within the timeout of the call (300 seconds for most calls). Each attempt only waits for the time that is left, and no attempt is sent once it is used up.
+  '''
+  def __init__(self, Methods=['GET', 'PUT', 'DELETE'], MaxAttempts=4, BackoffFactor=0.5, MaxBackoff=30, Jitter=True, RetryStatus=DefaultRetryStatus, RetryErrors=DefaultRetryErrors):
+    self.Methods = [method.upper() for method in Methods]
+    self.MaxAttempts = max(1, MaxAttempts)
+    self.BackoffFactor = BackoffFactor
+    self.MaxBackoff = MaxBackoff
+    self.Jitter = Jitter
+    self.RetryStatus = list(RetryStatus)
+    self.RetryErrors = list(RetryErrors)
+
+  def __repr__(self):
+    return "<imperva_sdk 'RetryPolicy' Object - %s x%d>" % ('/'.join(self.Methods), self.MaxAttempts)
+
+  def is_retryable(self, Method, Attempt, Response=None):
+    '''
+    :param Method: HTTP method of the call
+    :param Attempt: Number of times the call was sent
+    :param Response: `requests` response of the call (None if the call failed with a connection error)
+    :rtype: boolean
+    :return: True if the call should be sent again
+    '''
+    if Method.upper() not in self.Methods or Attempt >= self.MaxAttempts:
+      return False
+    if Response is None:
+      return True
+    if Response.status_code in (200, 404):
+      return False
+    if Response.status_code in self.RetryStatus:
+      return True
+    text = Response.text or ''
+    return any(error in text for error in self.RetryErrors)
+
+  def get_delay(self, Attempt, Response=None):
+    '''
+    :param Attempt: Number of times the call was sent
+    :param Response: `requests` response of the call (None if the call failed with a connection error)
+    :rtype: float
+    :return: Number of seconds to wait before sending the call again
+    '''
+    retry_after = _parse_retry_after(Response)
+    if retry_after is not None:
+      return min(retry_after, self.MaxBackoff)
+    delay = min(self.BackoffFactor * (2 ** (Attempt - 1)), self.MaxBackoff)
+    if self.Jitter:
+      delay = random.uniform(0, delay)
+    return delay
+
+def _parse_retry_after(Response):
+  ''' Returns the 'Retry-After' header of a response in seconds (the header can be seconds or an HTTP date) '''
+  if Response is None:
+    return None
+  value = Response.headers.get('Retry-After')
+  if not value:
+    return None
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+  date = email.utils.parsedate_tz(value)
+  if date is None:
+    return None
+  return max(0.0, email.utils.mktime_tz(date) - time.time())
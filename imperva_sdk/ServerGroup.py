@@ -11,23 +11,8 @@ class ServerGroup(MxObject):
   >>> sg.OperationMode = 'active'
   '''
 
-  # Store created server group objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = ServerGroup._exists(connection=kwargs['connection'], Site=kwargs['Site'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Site=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'ServerGroup':
-        if cur_obj.Name == Name and cur_obj._Site == Site:
-          return cur_obj
-    return None
-    
+  _key_fields = ('Site', 'Name')
+
   def __init__(self, connection=None, Name=None, Site=None, OperationMode=None, ProtectedIps=[], ServerIps=[]):
     super(ServerGroup, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name, Site=Site)
@@ -48,6 +33,7 @@ class ServerGroup(MxObject):
   def Name(self, Name):
     validate_string(Name=Name)
     ServerGroup._update_server_group(self._connection, Name=self._Name, Site=self._Site, Parameter='name', Value=Name)
+    self._connection._invalidate_host_to_app_mappings(Site=self._Site, ServerGroup=self._Name)
     self._Name = Name
 
   @property
@@ -69,7 +55,7 @@ class ServerGroup(MxObject):
     for new_ip in ProtectedIps:
       if new_ip not in self._ProtectedIps:
         # Create new protected IP
-        self._connection._mx_api('POST', '/conf/serverGroups/%s/%s/protectedIPs/%s?gatewayGroup=%s' % (self._Site, self._Name, new_ip['ip'], new_ip['gateway-group']), data=json.dumps({}))
+        self._connection._mx_api('POST', '/conf/serverGroups/%s/%s/protectedIPs/%s?gatewayGroup=%s' % (self._Site, self._Name, new_ip['ip'], new_ip['gateway-group']), data=json_dumps({}))
     self._ProtectedIps = ProtectedIps
 
   @property
@@ -86,7 +72,7 @@ class ServerGroup(MxObject):
     for new_ip in ServerIps:
       if new_ip not in self._ServerIps:
         # Create new server IP
-        self._connection._mx_api('POST', '/conf/serverGroups/%s/%s/servers/%s' % (self._Site, self._Name, new_ip), data=json.dumps({}))
+        self._connection._mx_api('POST', '/conf/serverGroups/%s/%s/servers/%s' % (self._Site, self._Name, new_ip), data=json_dumps({}))
     self._ServerIps = ServerIps
 
 
@@ -159,7 +145,8 @@ class ServerGroup(MxObject):
     sg = connection.get_server_group(Name=Name, Site=Site)
     if sg:
       connection._mx_api('DELETE', '/conf/serverGroups/%s/%s' % (Site, Name))
-      connection._instances.remove(sg)
+      connection._invalidate_host_to_app_mappings(Site=Site, ServerGroup=Name)
+      connection._instances.discard(sg)
       del sg
     else:
       raise MxException("Server Group '%s' does not exist" % Name)
@@ -167,7 +154,7 @@ class ServerGroup(MxObject):
   @staticmethod
   def _update_server_group(connection, Name=None, Site=None, Parameter=None, Value=None):
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/serverGroups/%s/%s' % (Site, Name), data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/serverGroups/%s/%s' % (Site, Name), data=json_dumps(body))
     return True
   
   #
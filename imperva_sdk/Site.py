@@ -12,23 +12,6 @@ class Site(MxObject):
 
   '''
 
-  # Store created site objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = Site._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'Site':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None):
     super(Site, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name)
@@ -45,6 +28,7 @@ class Site(MxObject):
   def Name(self, Name):
     validate_string(Name=Name)
     Site._update_site(connection=self._connection, Name=self.Name, Parameter='name', Value=Name)
+    self._connection._invalidate_host_to_app_mappings(Site=self._Name)
     self._Name = Name
 
   #	
@@ -94,7 +78,8 @@ class Site(MxObject):
     site_exists = connection.get_site(Name=Name)
     if site_exists:
       connection._mx_api('DELETE', '/conf/sites/%s' % Name)
-      connection._instances.remove(site_exists)
+      connection._invalidate_host_to_app_mappings(Site=Name)
+      connection._instances.discard(site_exists)
       del site_exists
     else:
       raise MxException("Site '%s' does not exist" % Name)
@@ -102,7 +87,7 @@ class Site(MxObject):
   @staticmethod
   def _update_site(connection, Name=None, Parameter=None, Value=None):
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/sites/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/sites/%s' % Name, data=json_dumps(body))
     return True
         
   #
@@ -0,0 +1,233 @@
+# Copyright 2018 Imperva. All rights reserved.
+
+import json
+import time
+import threading
+from imperva_sdk.core import *
+
+try:
+  import sqlite3
+except ImportError:
+  sqlite3 = None
+
+#
+# Mirror tables - (table name, key columns, other columns).
+# Object tables have a 'data' column with the object parameters (JSON, without child objects).
+#
+_mirror_tables = [
+  ('sites', ('name',), ('data',)),
+  ('server_groups', ('site', 'name'), ('operation_mode', 'data')),
+  ('web_services', ('site', 'server_group', 'name'), ('data',)),
+  ('web_applications', ('site', 'server_group', 'web_service', 'name'), ('data',)),
+  ('db_services', ('site', 'server_group', 'name'), ('data',)),
+  ('db_applications', ('site', 'server_group', 'db_service', 'name'), ('data',)),
+  ('policies', ('type', 'name'), ('enabled', 'data')),
+  # Services and applications that policies are applied to
+  ('policy_apply_to', ('policy_type', 'policy_name', 'site', 'server_group', 'service', 'application'), ()),
+  ('global_objects', ('type', 'name'), ('data',)),
+  ('agents', ('name',), ('ip', 'data')),
+  ('agent_tags', ('agent', 'tag'), ())
+]
+
+_mirror_indexes = [
+  ('policy_apply_to', ('site', 'server_group', 'service')),
+  ('policy_apply_to', ('policy_name',)),
+  ('agent_tags', ('tag',)),
+  ('web_applications', ('name',)),
+  ('web_services', ('name',))
+]
+
+#
+# Child object tables and the Discard values that remove them from the export (the table itself, its parent object types or the attribute it is built from)
+#
+_discarded_tables = [
+  ('server_groups', ('server_groups',)),
+  ('web_services', ('server_groups', 'web_services')),
+  ('web_applications', ('server_groups', 'web_services', 'web_applications')),
+  ('db_services', ('server_groups', 'db_services')),
+  ('db_applications', ('server_groups', 'db_services', 'db_applications')),
+  ('policy_apply_to', ('ApplyTo',))
+]
+
+def _parameters_json(Dict):
+  ''' JSON of the object parameters (child object lists are stored in their own tables) '''
+  return json.dumps(dict((key, value) for key, value in Dict.items() if is_parameter.match(key)), sort_keys=True)
+
+def _agent_tags(Tags):
+  if isinstance(Tags, dict):
+    Tags = Tags.get('tags') or []
+  for tag in Tags or []:
+    if isinstance(tag, dict):
+      tag = tag.get('name')
+    if tag:
+      yield tag
+
+class SqliteMirror(object):
+  '''
+  Local SQLite copy of the MX configuration with indexed tables (see :py:meth:`imperva_sdk.MxConnection.sync_to_sqlite`).
+  Every sync only writes the rows that changed since the previous sync.
+
+  >>> mirror = mx.sync_to_sqlite('/var/tmp/mx.db', Discard=['Profile'])
+  >>> mirror.get_policy_services('Default Web Worm Policy')
+  [{'site': 'site', 'server_group': 'server group', 'service': 'web service', 'application': None}]
+  >>> mirror.get_agents_by_tag('production')
+  ['agent1', 'agent2']
+  >>> mirror.query('SELECT name FROM web_applications WHERE web_service = ?', 'web service')
+  [{'name': 'Default Web Application'}]
+
+  Tables (the 'data' column holds the object parameters as JSON):
+
+  * sites (name, data)
+  * server_groups (site, name, operation_mode, data)
+  * web_services (site, server_group, name, data)
+  * web_applications (site, server_group, web_service, name, data)
+  * db_services (site, server_group, name, data)
+  * db_applications (site, server_group, db_service, name, data)
+  * policies (type, name, enabled, data)
+  * policy_apply_to (policy_type, policy_name, site, server_group, service, application)
+  * global_objects (type, name, data)
+  * agents (name, ip, data)
+  * agent_tags (agent, tag)
+  * sync_info (name, value) - 'Host', 'SyncTime' and 'Export' (the export JSON of the last sync, only kept for incremental syncs)
+
+  :type Path: string
+  :param Path: Path of the SQLite file (created if it doesn't exist)
+  '''
+  def __init__(self, Path=None):
+    if sqlite3 is None:
+      raise MxException("SqliteMirror requires the Python sqlite3 module")
+    self.Path = Path
+    self._lock = threading.Lock()
+    self._db = sqlite3.connect(Path, timeout=30, check_same_thread=False)
+    for table, keys, columns in _mirror_tables:
+      self._db.execute('CREATE TABLE IF NOT EXISTS %s (%s, PRIMARY KEY (%s))' % (table, ', '.join(keys + columns), ', '.join(keys)))
+    for table, columns in _mirror_indexes:
+      self._db.execute('CREATE INDEX IF NOT EXISTS %s_%s ON %s (%s)' % (table, '_'.join(columns), table, ', '.join(columns)))
+    self._db.execute('CREATE TABLE IF NOT EXISTS sync_info (name PRIMARY KEY, value)')
+    self._db.commit()
+
+  def __repr__(self):
+    return "<imperva_sdk 'SqliteMirror' Object - '%s'>" % self.Path
+
+  def close(self):
+    with self._lock:
+      self._db.close()
+
+  def get_sync_info(self, Name):
+    ''' :return: Sync information value ('Host' or 'SyncTime') or None if the mirror wasn't synced yet '''
+    with self._lock:
+      row = self._db.execute('SELECT value FROM sync_info WHERE name = ?', (Name,)).fetchone()
+    return row[0] if row else None
+
+  def sync(self, Export=None, Agents=None, Discard=[]):
+    '''
+    Updates the mirror to an MX export. Only rows that changed are written.
+    :type Export: dict
+    :param Export: MX export (see :py:meth:`imperva_sdk.MxConnection.export_to_json`)
+    :type Agents: list of dict
+    :param Agents: Agent configurations (dictionaries of :py:class:`imperva_sdk.AgentConfiguration.AgentConfiguration` objects). None to keep the mirrored agents
+    :type Discard: list of string
+    :param Discard: Objects or attributes that were discarded from the export (e.g. 'web_applications') - their tables are kept as they are
+    :rtype: dict
+    :return: Number of (written, deleted) rows per table
+    '''
+    rows = self._export_rows(Export, Agents, Discard=Discard)
+    stats = {}
+    with self._lock:
+      try:
+        for table, keys, columns in _mirror_tables:
+          if table in rows:
+            stats[table] = self._sync_table(table, keys, columns, rows[table])
+        info = {'Host': Export.get('metadata', {}).get('Host'), 'SyncTime': time.strftime("%Y-%m-%d %H:%M:%S")}
+        self._db.executemany('INSERT OR REPLACE INTO sync_info VALUES (?, ?)', list(info.items()))
+        self._db.commit()
+      except:
+        self._db.rollback()
+        raise
+    return stats
+
+  def _sync_table(self, Table, Keys, Columns, Rows):
+    all_columns = Keys + Columns
+    existing = set(self._db.execute('SELECT %s FROM %s' % (', '.join(all_columns), Table)).fetchall())
+    new = set(Rows)
+    new_keys = set(row[:len(Keys)] for row in new)
+    deleted = [row[:len(Keys)] for row in existing - new if row[:len(Keys)] not in new_keys]
+    written = list(new - existing)
+    # NULL keys can't be matched with '=' - 'IS' matches them
+    self._db.executemany('DELETE FROM %s WHERE %s' % (Table, ' AND '.join('%s IS ?' % key for key in Keys)), deleted)
+    self._db.executemany('INSERT OR REPLACE INTO %s VALUES (%s)' % (Table, ', '.join('?' * len(all_columns))), written)
+    return (len(written), len(deleted))
+
+  def _export_rows(self, Export, Agents=None, Discard=[]):
+    ''' Rows of the mirror tables ({table: list of tuples}) - tables that are not in the export (or were discarded from it) are left as they are '''
+    rows = {}
+    if 'sites' in Export:
+      for table in ('sites', 'server_groups', 'web_services', 'web_applications', 'db_services', 'db_applications'):
+        rows[table] = []
+      for site in Export['sites']:
+        rows['sites'].append((site['Name'], _parameters_json(site)))
+        for sg in site.get('server_groups') or []:
+          rows['server_groups'].append((site['Name'], sg['Name'], sg.get('OperationMode'), _parameters_json(sg)))
+          for ws in sg.get('web_services') or []:
+            rows['web_services'].append((site['Name'], sg['Name'], ws['Name'], _parameters_json(ws)))
+            for wa in ws.get('web_applications') or []:
+              rows['web_applications'].append((site['Name'], sg['Name'], ws['Name'], wa['Name'], _parameters_json(wa)))
+          for dbs in sg.get('db_services') or []:
+            rows['db_services'].append((site['Name'], sg['Name'], dbs['Name'], _parameters_json(dbs)))
+            for dba in dbs.get('db_applications') or []:
+              rows['db_applications'].append((site['Name'], sg['Name'], dbs['Name'], dba['Name'], _parameters_json(dba)))
+    if 'policies' in Export:
+      rows['policies'] = []
+      rows['policy_apply_to'] = []
+      for policy_type in Export['policies']:
+        for policy in Export['policies'][policy_type]:
+          rows['policies'].append((policy_type, policy['Name'], policy.get('Enabled'), _parameters_json(policy)))
+          for apply_to in policy.get('ApplyTo') or []:
+            if isinstance(apply_to, dict):
+              rows['policy_apply_to'].append((policy_type, policy['Name'], apply_to.get('siteName'), apply_to.get('serverGroupName'),
+                                              apply_to.get('webServiceName', apply_to.get('dbServiceName')),
+                                              apply_to.get('webApplicationName', apply_to.get('dbApplicationName'))))
+    if 'global_objects' in Export:
+      rows['global_objects'] = []
+      for object_type in Export['global_objects']:
+        for global_object in Export['global_objects'][object_type]:
+          rows['global_objects'].append((object_type, global_object['Name'], _parameters_json(global_object)))
+    if Agents is not None:
+      rows['agents'] = []
+      rows['agent_tags'] = []
+      for agent in Agents:
+        rows['agents'].append((agent['Name'], agent.get('Ip'), _parameters_json(agent)))
+        for tag in set(_agent_tags(agent.get('Tags'))):
+          rows['agent_tags'].append((agent['Name'], tag))
+    # Objects under a discarded object type aren't in the export either
+    for table, discarded in _discarded_tables:
+      if table in rows and set(discarded) & set(Discard):
+        del rows[table]
+    # Duplicate keys (e.g. the same service twice in a policy) are stored once
+    for table in rows:
+      rows[table] = list(set(rows[table]))
+    return rows
+
+  def query(self, Sql, *Parameters):
+    '''
+    Runs an SQL query on the mirror.
+    :rtype: list of dict
+    :return: The result rows as {column: value} dictionaries
+    '''
+    with self._lock:
+      cursor = self._db.execute(Sql, Parameters)
+      columns = [column[0] for column in cursor.description or []]
+      return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+  def get_policy_services(self, PolicyName=None):
+    ''' :return: Services (and applications) that the policy is applied to - list of {'site', 'server_group', 'service', 'application'} '''
+    return self.query('SELECT site, server_group, service, application FROM policy_apply_to WHERE policy_name = ? ORDER BY site, server_group, service, application', PolicyName)
+
+  def get_service_policies(self, Site=None, ServerGroup=None, Service=None):
+    ''' :return: Policies that are applied to the service or its applications - list of {'type', 'name', 'enabled'} '''
+    return self.query('SELECT DISTINCT policies.type, policies.name, policies.enabled FROM policy_apply_to JOIN policies ON policies.type = policy_type AND policies.name = policy_name '
+                      'WHERE site = ? AND server_group = ? AND service = ? ORDER BY policies.type, policies.name', Site, ServerGroup, Service)
+
+  def get_agents_by_tag(self, Tag=None):
+    ''' :return: Names of the agents that have the tag '''
+    return [row['agent'] for row in self.query('SELECT agent FROM agent_tags WHERE tag = ? ORDER BY agent', Tag)]
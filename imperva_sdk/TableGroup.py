@@ -28,23 +28,6 @@ class TableGroup(MxObject):
 
   '''
 
-  # Store created Policy objects in_instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = TableGroup._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'TableGroup':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-
   def __init__(self, connection=None, Name=None, IsSensitive=None, DataType=None, ServiceTypes=[], Records=[]):
     super(TableGroup, self).__init__(connection=connection, Name=Name)
     self._IsSensitive = IsSensitive
@@ -195,7 +178,7 @@ class TableGroup(MxObject):
     body['serviceTypes'] = ServiceTypes
 
     try:
-      res = connection._mx_api('POST', '/conf/tableGroups', data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/tableGroups', data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed creating table group: %s" % e)
 
@@ -204,7 +187,7 @@ class TableGroup(MxObject):
     body['records'] = Records
 
     try:
-      res = connection._mx_api('POST', '/conf/tableGroups/%s/data' % Name , data=json.dumps(body))
+      res = connection._mx_api('POST', '/conf/tableGroups/%s/data' % Name , data=json_dumps(body))
     except Exception as e:
       raise MxException("Failed updating table group: %s" % e)
 
@@ -216,7 +199,7 @@ class TableGroup(MxObject):
     if Parameter == 'Records':
       if Value:
         # Assume overwrite=true
-        connection._mx_api('PUT', '/conf/tableGroups/%s/data?overwrite=true' % Name, data=json.dumps(Value))
+        connection._mx_api('PUT', '/conf/tableGroups/%s/data?overwrite=true' % Name, data=json_dumps(Value))
 
     # table group doesn't support update IsSensitive/DataType/ServiceTypes
 
@@ -8,25 +8,11 @@ class TrpRule(MxObject):
   MX TRP (Transparent Reverse Proxy) Rules Class 
 
   '''
-  
-  # Store created TRP Rule objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = TrpRule._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], WebService=kwargs['WebService'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None, Site=None, ServerGroup=None, WebService=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'TrpRule':
-        if cur_obj.Name == Name and cur_obj._Site == Site and cur_obj._ServerGroup == ServerGroup and cur_obj._WebService == WebService:
-          return cur_obj
-    return None
 
-  
+  _key_fields = ('Site', 'ServerGroup', 'WebService', 'Name')
+  # There is no TRP rule update - create_trp_rule deletes the existing rule
+  _replaced_on_update = True
+
   def __init__(self, connection=None, WebService=None, Name=None, ServerGroup=None, Site=None, ListenerPorts=[], ServerIp=None, ServerSidePort=None, EncryptServerConnection=None, Certificate=None):
     super(TrpRule, self).__init__(connection=connection, Name=Name)
     self._Name = Name
@@ -117,14 +103,14 @@ class TrpRule(MxObject):
       'serverSidePort': ServerSidePort
     }
     if Certificate: body['certificate'] = Certificate
-    connection._mx_api('POST', '/conf/webServices/%s/%s/%s/trpRules/%s/%d' % (Site, ServerGroup, WebService, ServerIp, ListenerPorts[0]), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/webServices/%s/%s/%s/trpRules/%s/%d' % (Site, ServerGroup, WebService, ServerIp, ListenerPorts[0]), data=json_dumps(body))
     return TrpRule(connection=connection, Name='%s-%s' % (ServerIp, str(ListenerPorts)), WebService=WebService, ServerGroup=ServerGroup, Site=Site, ListenerPorts=ListenerPorts, ServerIp=ServerIp, ServerSidePort=ServerSidePort, EncryptServerConnection=EncryptServerConnection, Certificate=Certificate)
   @staticmethod
   def _delete_trp_rule(connection, WebService=None, ServerGroup=None, Site=None, ServerIp=None, ListenerPorts=[]):
     trp = connection.get_trp_rule(Site=Site, ServerGroup=ServerGroup, WebService=WebService, ServerIp=ServerIp, ListenerPorts=ListenerPorts)
     if trp:
       connection._mx_api('DELETE', '/conf/webServices/%s/%s/%s/trpRules/%s/%d' % (Site, ServerGroup, WebService, ServerIp, ListenerPorts[0]))
-      connection._instances.remove(trp)
+      connection._instances.discard(trp)
       del trp
     else:
       raise MxException("TRP Rule does not exist")
@@ -14,24 +14,9 @@ class WebApplication(MxObject):
   >>> wa.LearnSettings = 'LearnAllExceptStatics'
 
   '''
-  
-  # Store created WebApplication objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = WebApplication._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], WebService=kwargs['WebService'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None, Site=None, ServerGroup=None, WebService=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'WebApplication':
-        if cur_obj.Name == Name and cur_obj._Site == Site and cur_obj._ServerGroup == ServerGroup and cur_obj._WebService == WebService:
-          return cur_obj
-    return None
-  
+
+  _key_fields = ('Site', 'ServerGroup', 'WebService', 'Name')
+
   def __init__(self, connection=None, WebService=None, Name=None, ServerGroup=None, Site=None, LearnSettings=None, ParseOcspRequests=False, RestrictMonitoringToUrls=None, IgnoreUrlsDirectories=None, Mappings=[]):
     super(WebApplication, self).__init__(connection=connection, Name=Name)
     validate_string(WebService=WebService, Site=Site, ServerGroup=ServerGroup, Name=Name)
@@ -45,10 +30,10 @@ class WebApplication(MxObject):
     self._IgnoreUrlsDirectories = IgnoreUrlsDirectories
     self._Mappings = Mappings
 
-  # Overriding iter (dict) function to handle profile and mappings properly
-  def __iter__(self):
+  # Overriding the dict function to handle profile and mappings properly
+  def _to_dict(self, Depth=None, Include=None, Exclude=None):
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       # Only variables should start with a capital letter
       if is_parameter.match(field):
         variable_function = getattr(self, field)
@@ -56,18 +41,20 @@ class WebApplication(MxObject):
       # If the object has a "get_all" function, we need to build the child objects
       elif field.startswith('get_all_'):
         child_title = field.replace('get_all_', '')
+        if not child_in_scope(child_title, Depth=Depth, Include=Include, Exclude=Exclude):
+          continue
         iters[child_title] = []
         get_all_function = getattr(self, field)
         children = get_all_function()
         for child in children:
-          iters[child_title].append(dict(child))
-    try:
-      iters["Profile"] = self.get_profile()
-    except MxExceptionNotFound:
-      # Probably working with old version of MX that doesn't have profile APIs
-      pass
-    for x,y in iters.items():
-      yield x, y
+          iters[child_title].append(child_to_dict(child, Depth=Depth, Include=Include, Exclude=Exclude))
+    if child_in_scope('Profile', Depth=Depth, Include=Include, Exclude=Exclude):
+      try:
+        iters["Profile"] = self.get_profile()
+      except MxExceptionNotFound:
+        # Probably working with old version of MX that doesn't have profile APIs
+        pass
+    return iters
 
   #
   # Web Application parameters
@@ -106,6 +93,7 @@ class WebApplication(MxObject):
   def Name(self, Name):
     if Name != self._Name:
       self._connection._update_web_application(Name=self._Name, Site=self._Site, ServerGroup=self._ServerGroup, WebService=self._WebService, Parameter='appName', Value=Name)
+      self._connection._invalidate_host_to_app_mappings(Site=self._Site, ServerGroup=self._ServerGroup, Name=self._WebService)
       self._Name = Name
   @LearnSettings.setter
   def LearnSettings(self, LearnSettings):
@@ -138,7 +126,8 @@ class WebApplication(MxObject):
           'host': new_map['host'],
           'hostMatchType': new_map['hostMatchType']
         }
-        self._connection._mx_api('POST', '/conf/webServices/%s/%s/%s/hostToAppMappings/%s/%d' % (self._Site, self._ServerGroup, self._WebService, self._Name, new_map['priority']), data=json.dumps(body))
+        self._connection._mx_api('POST', '/conf/webServices/%s/%s/%s/hostToAppMappings/%s/%d' % (self._Site, self._ServerGroup, self._WebService, self._Name, new_map['priority']), data=json_dumps(body))
+    self._connection._invalidate_host_to_app_mappings(Site=self._Site, ServerGroup=self._ServerGroup, Name=self._WebService)
       
   #
   # Web Application internal functions
@@ -169,8 +158,8 @@ class WebApplication(MxObject):
     if 'ignoreUrlsDirectories' not in wa_json: wa_json['ignoreUrlsDirectories'] = None
     # get mappings
     Mappings = []
-    service_mappings = connection._mx_api('GET', '/conf/webServices/%s/%s/%s/hostToAppMappings' % (Site, ServerGroup, WebService))
-    for cur_map in service_mappings["hostToAppMappings"]:
+    service_mappings = connection._get_host_to_app_mappings(Site=Site, ServerGroup=ServerGroup, Name=WebService)
+    for cur_map in service_mappings:
       if cur_map["application"] == Name:
         del cur_map["application"]
         Mappings.append(cur_map)
@@ -198,7 +187,7 @@ class WebApplication(MxObject):
     if ParseOcspRequests: body['parseOCSPRequests'] = ParseOcspRequests
     if RestrictMonitoringToUrls: body['restrictMonitoringToUrl'] = RestrictMonitoringToUrls
     if IgnoreUrlsDirectories: body['ignoreUrlsDirectories'] = IgnoreUrlsDirectories
-    connection._mx_api('POST', '/conf/webApplications/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/webApplications/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Name), data=json_dumps(body))
     wa = WebApplication(connection=connection, Name=Name, WebService=WebService, ServerGroup=ServerGroup, Site=Site, LearnSettings=LearnSettings, ParseOcspRequests=ParseOcspRequests, RestrictMonitoringToUrls=RestrictMonitoringToUrls, IgnoreUrlsDirectories=IgnoreUrlsDirectories)
     if Profile:
       try:
@@ -214,7 +203,8 @@ class WebApplication(MxObject):
     wa = connection.get_web_application(Site=Site, ServerGroup=ServerGroup, WebService=WebService, Name=Name)
     if wa:
       connection._mx_api('DELETE', '/conf/webApplications/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Name))
-      connection._instances.remove(wa)
+      connection._invalidate_host_to_app_mappings(Site=Site, ServerGroup=ServerGroup, Name=WebService)
+      connection._instances.discard(wa)
       del wa
     else:
       raise MxException("Web Application does not exist")
@@ -222,7 +212,7 @@ class WebApplication(MxObject):
   @staticmethod
   def _update_web_application(connection, WebService=None, ServerGroup=None, Site=None, Name=None, Parameter=None, Value=None):
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/webApplications/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Name), data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/webApplications/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Name), data=json_dumps(body))
     return True
   @staticmethod
   def _get_profile(connection, WebService=None, ServerGroup=None, Site=None, Application=None):
@@ -238,8 +228,8 @@ class WebApplication(MxObject):
       Profile = _swagger2profile(SwaggerJson)
     directories = list(Profile['directories'])
     del Profile['directories']
-    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Application), data=json.dumps(Profile), timeout=1800)
-    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s/directories' % (Site, ServerGroup, WebService, Application), data=json.dumps(directories))
+    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s' % (Site, ServerGroup, WebService, Application), data=json_dumps(Profile), timeout=1800)
+    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s/directories' % (Site, ServerGroup, WebService, Application), data=json_dumps(directories))
     return None
   @staticmethod
   def _get_profile_url(connection, WebService=None, ServerGroup=None, Site=None, Application=None, UrlName=None):
@@ -254,7 +244,7 @@ class WebApplication(MxObject):
     return True
   @staticmethod
   def _update_profile_url(connection, WebService=None, ServerGroup=None, Site=None, Application=None, UrlProfile=None, UrlName=None):
-    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s/url/%s' % (Site, ServerGroup, WebService, Application, UrlName), data=json.dumps(UrlProfile))
+    connection._mx_api('PUT', '/conf/webProfile/%s/%s/%s/%s/url/%s' % (Site, ServerGroup, WebService, Application, UrlName), data=json_dumps(UrlProfile))
     return None
 
   #
@@ -10,23 +10,6 @@ class WebProfilePolicy(MxObject):
 
     '''
 
-    # Store created Web Profile Policy objects in _instances to prevent duplicate instances and redundant API calls
-    def __new__(Type, *args, **kwargs):
-        obj_exists = WebProfilePolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-        if obj_exists:
-            return obj_exists
-        else:
-            obj = super(MxObject, Type).__new__(Type)
-            kwargs['connection']._instances.append(obj)
-            return obj
-
-    @staticmethod
-    def _exists(connection=None, Name=None):
-        for cur_obj in connection._instances:
-            if type(cur_obj).__name__ == 'WebProfilePolicy':
-                if cur_obj.Name == Name:
-                    return cur_obj
-        return None
     def __init__(self, connection=None, Name=None, SendToCd=None, Rules=[], Exceptions=[], ApuConfig={}, DisableLearning=None,
                  DisplayResponsePage=None, ApplyTo=[]):
         super(WebProfilePolicy, self).__init__(connection=connection, Name=Name)
@@ -42,7 +25,7 @@ class WebProfilePolicy(MxObject):
     # Override the MxObject __iter__ function to print ApplyTo WebApplication objects as dictionaries
     def __iter__(self):
         iters = {}
-        for field in dir(self):
+        for field in self._get_fields():
             if is_parameter.match(field):
                 variable_function = getattr(self, field)
                 if field == 'ApplyTo':
@@ -324,13 +307,13 @@ class WebProfilePolicy(MxObject):
             if ApplyToNames: body['applyTo'] = ApplyToNames
             try:
                 connection._mx_api('POST', '/conf/policies/security/webProfilePolicies/%s' % Name,
-                               data=json.dumps(body))
+                               data=json_dumps(body))
             except:
                 # Some versions of the API does not support Exceptions
                 del body['exceptions']
                 Exceptions = []
                 connection._mx_api('POST', '/conf/policies/security/webProfilePolicies/%s' % Name,
-                                   data=json.dumps(body))
+                                   data=json_dumps(body))
             return WebProfilePolicy(connection=connection, Name=Name, SendToCd=SendToCd,
                                     DisableLearning=DisableLearning, DisplayResponsePage=DisplayResponsePage,
                                     ApplyTo=ApplyToObjects, Rules=Rules, Exceptions=Exceptions, ApuConfig=ApuConfig)
@@ -341,7 +324,7 @@ class WebProfilePolicy(MxObject):
         pol = connection.get_web_profile_policy(Name=Name)
         if pol:
             connection._mx_api('DELETE', '/conf/policies/security/webProfilePolicies/%s' % Name)
-            connection._instances.remove(pol)
+            connection._instances.discard(pol)
             del pol
         else:
             raise MxException("Policy does not exist")
@@ -354,6 +337,6 @@ class WebProfilePolicy(MxObject):
                 raise MxException("Parameter '%s' must be True or False" % Parameter)
         body = {Parameter: Value}
         connection._mx_api('PUT', '/conf/policies/security/webProfilePolicies/%s' % Name,
-                           data=json.dumps(body))
+                           data=json_dumps(body))
         return True
 
@@ -2,6 +2,7 @@
 
 import json
 from imperva_sdk.core import *
+from imperva_sdk.core import _clock
 
 class WebService(MxObject):
   ''' 
@@ -20,24 +21,9 @@ class WebService(MxObject):
   [{'certificate': '', 'format': 'pem', 'private': '', 'hsm': False, 'sslKeyName': 'key name', 'password': ''}]
 
   '''
-  
-  # Store created web service objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = WebService._exists(connection=kwargs['connection'], Site=kwargs['Site'], ServerGroup=kwargs['ServerGroup'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Site=None, ServerGroup=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'WebService':
-        if cur_obj.Name == Name and cur_obj._ServerGroup == ServerGroup and cur_obj._Site == Site:
-          return cur_obj
-    return None
-      
+
+  _key_fields = ('Site', 'ServerGroup', 'Name')
+
   def __init__(self, connection=None, Name=None, ServerGroup=None, Site=None, Ports=[], SslPorts=[], ForwardedConnections={}, ForwardedClientIp={}, SslKeys=[], TrpMode=None):
     super(WebService, self).__init__(connection=connection, Name=Name)
     validate_string(Site=Site, ServerGroup=ServerGroup)
@@ -123,12 +109,13 @@ class WebService(MxObject):
   @Name.setter
   def Name(self, Name):
     validate_string(Name=Name)
-    body = json.dumps({'name': Name})
+    body = json_dumps({'name': Name})
     self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s' % (self._Site, self._ServerGroup, self._Name), data=body)
+    WebService._invalidate_host_to_app_mappings(self._connection, Site=self._Site, ServerGroup=self._ServerGroup, Name=self._Name)
     self._Name = Name
   @TrpMode.setter
   def TrpMode(self, TrpMode):
-    body = json.dumps({'trpMode': TrpMode})
+    body = json_dumps({'trpMode': TrpMode})
     self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s' % (self._Site, self._ServerGroup, self._Name), data=body)
     self._TrpMode = TrpMode
 
@@ -206,16 +193,16 @@ class WebService(MxObject):
     if Ports: body['ports'] = Ports
     if SslPorts: body['sslPorts'] = SslPorts
     if TrpMode: body['trpMode'] = TrpMode
-    connection._mx_api('POST', '/conf/webServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json.dumps(body))
+    connection._mx_api('POST', '/conf/webServices/%s/%s/%s' % (Site, ServerGroup, Name), data=json_dumps(body))
     if ForwardedConnections:
       for fconnection in ForwardedConnections['forwardedConnections']:
         if 'operation' not in fconnection:
           fconnection['operation'] = 'add'
-      connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (Site, ServerGroup, Name), data=json.dumps(ForwardedConnections))
+      connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (Site, ServerGroup, Name), data=json_dumps(ForwardedConnections))
       for fconnection in ForwardedConnections['forwardedConnections']:
         del fconnection['operation']
     if ForwardedClientIp:
-      connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (Site, ServerGroup, Name), data=json.dumps(ForwardedClientIp))
+      connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (Site, ServerGroup, Name), data=json_dumps(ForwardedClientIp))
     if SslKeys:
       for ssl_key in SslKeys:
         try:
@@ -229,7 +216,7 @@ class WebService(MxObject):
           if 'hsm' in ssl_key: post_key['hsm'] = ssl_key['hsm']
         except Exception as e:
           raise MxException("SslKey missing required parameter '%s'" % str(e))
-        connection._mx_api('POST', '/conf/webServices/%s/%s/%s/sslCertificates/%s' % (Site, ServerGroup, Name, key_name), data=json.dumps(post_key))
+        connection._mx_api('POST', '/conf/webServices/%s/%s/%s/sslCertificates/%s' % (Site, ServerGroup, Name, key_name), data=json_dumps(post_key))
       SslKeys = WebService._get_ssl_keys(connection, Name=Name, ServerGroup=ServerGroup, Site=Site)
     return WebService(connection=connection, Name=Name, ServerGroup=ServerGroup, Site=Site, Ports=Ports, SslPorts=SslPorts, ForwardedConnections=ForwardedConnections, ForwardedClientIp=ForwardedClientIp, SslKeys=SslKeys, TrpMode=TrpMode)
   @staticmethod
@@ -238,11 +225,37 @@ class WebService(MxObject):
     ws = connection.get_web_service(Name=Name, Site=Site, ServerGroup=ServerGroup)
     if ws:
       connection._mx_api('DELETE', '/conf/webServices/%s/%s/%s' % (Site, ServerGroup, Name))
-      connection._instances.remove(ws)
+      WebService._invalidate_host_to_app_mappings(connection, Site=Site, ServerGroup=ServerGroup, Name=Name)
+      connection._instances.discard(ws)
       del ws
     else:
       raise MxException("Web Service '%s' does not exist" % Name)
     return True
+  @staticmethod
+  def _get_host_to_app_mappings(connection, Name=None, ServerGroup=None, Site=None):
+    '''
+    Returns the host to application mappings of a web service. The mappings are fetched once per web service and reused
+    for all of its applications (see WebApplication._get_web_application) until they are changed through the connection,
+    the connection is invalidated / refreshed or the TTL of WebApplication objects passes (see MxConnection 'CacheTtl').
+    '''
+    key = (Site, ServerGroup, Name)
+    stored = connection._host_to_app_mappings.get(key)
+    if stored is not None and (stored[0] is None or _clock() < stored[0]):
+      mappings = stored[1]
+    else:
+      ttl = connection._instances._get_ttl('WebApplication')
+      expiration = _clock() + ttl if ttl is not None else None
+      res = connection._mx_api('GET', '/conf/webServices/%s/%s/%s/hostToAppMappings' % (Site, ServerGroup, Name))
+      mappings = res["hostToAppMappings"]
+      connection._host_to_app_mappings[key] = (expiration, mappings)
+    # Callers get their own copy of the mappings
+    return [dict(cur_map) for cur_map in mappings]
+  @staticmethod
+  def _invalidate_host_to_app_mappings(connection, Site=None, ServerGroup=None, Name=None):
+    ''' Removes the stored mappings of a web service (or of all web services in a server group / site) '''
+    for key in list(connection._host_to_app_mappings):
+      if key[0] == Site and ServerGroup in (None, key[1]) and Name in (None, key[2]):
+        connection._host_to_app_mappings.pop(key, None)
 
   #
   # Web Service child functions
@@ -299,10 +312,10 @@ class WebService(MxObject):
         if current_fconnection['headerName'] == 'X-Forwarded-For' and current_fconnection['proxyIpGroup'] == '':
           del ForwardedConnections['forwardedConnections']
           break
-    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (self._Site, self._ServerGroup, self.Name), data=json.dumps(ForwardedConnections))
+    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (self._Site, self._ServerGroup, self.Name), data=json_dumps(ForwardedConnections))
     self._ForwardedConnections = {'useHttpForwardingHeader': True, 'forwardedConnections': [{'headerName': 'X-Forwarded-For', 'proxyIpGroup': ''}]}
     ForwardedClientIp = {'forwardHeaderName': 'X-Forwarded-For', 'forwardClientIP': True}
-    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (self._Site, self._ServerGroup, self.Name), data=json.dumps(ForwardedClientIp))
+    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (self._Site, self._ServerGroup, self.Name), data=json_dumps(ForwardedClientIp))
     self._ForwardedClientIp = ForwardedClientIp
     return True
   def krp_xff_disable(self):
@@ -317,10 +330,10 @@ class WebService(MxObject):
         if current_fconnection['headerName'] == 'X-Forwarded-For' and current_fconnection['proxyIpGroup'] == '':
           ForwardedConnections['forwardedConnections'] = [{'headerName': 'X-Forwarded-For', 'proxyIpGroup': '', 'operation': 'remove'}]
           break
-    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (self._Site, self._ServerGroup, self.Name), data=json.dumps(ForwardedConnections))
+    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedConnections' % (self._Site, self._ServerGroup, self.Name), data=json_dumps(ForwardedConnections))
     self._ForwardedConnections = {}
     ForwardedClientIp = {'forwardHeaderName': 'X-Forwarded-For', 'forwardClientIP': False}
-    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (self._Site, self._ServerGroup, self.Name), data=json.dumps(ForwardedClientIp))
+    self._connection._mx_api('PUT', '/conf/webServices/%s/%s/%s/forwardedClientIp' % (self._Site, self._ServerGroup, self.Name), data=json_dumps(ForwardedClientIp))
     self._ForwardedClientIp = {}
     return True
   def upload_ssl_certificate(self, SslKeyName=None, Hsm=False, Private=None, Certificate=None):
@@ -331,7 +344,7 @@ class WebService(MxObject):
       'private': Private,
       'certificate': Certificate
     }
-    self._connection._mx_api('POST', '/conf/webServices/%s/%s/%s/sslCertificates/%s' % (self._Site, self._ServerGroup, self.Name, SslKeyName), data=json.dumps(ssl_key))
+    self._connection._mx_api('POST', '/conf/webServices/%s/%s/%s/sslCertificates/%s' % (self._Site, self._ServerGroup, self.Name, SslKeyName), data=json_dumps(ssl_key))
     self._SslKeys = WebService._get_ssl_keys(self._connection, Name=self.Name, ServerGroup=self._ServerGroup, Site=self._Site)
     return True
   def delete_ssl_certificate(self, SslKeyName=None):
@@ -26,23 +26,6 @@ class WebServiceCustomPolicy(MxObject):
 
   '''
 
-  # Store created Web Service Custom Policy objects in _instances to prevent duplicate instances and redundant API calls
-  def __new__(Type, *args, **kwargs):
-    obj_exists = WebServiceCustomPolicy._exists(connection=kwargs['connection'], Name=kwargs['Name'])
-    if obj_exists:
-      return obj_exists
-    else:
-      obj = super(MxObject, Type).__new__(Type)
-      kwargs['connection']._instances.append(obj)
-      return obj
-  @staticmethod
-  def _exists(connection=None, Name=None):
-    for cur_obj in connection._instances:
-      if type(cur_obj).__name__ == 'WebServiceCustomPolicy':
-        if cur_obj.Name == Name:
-          return cur_obj
-    return None
-  
   def __init__(self, connection=None, Name=None, Enabled=None, Severity=None, Action=None, FollowedAction=None, SendToCd=None, DisplayResponsePage=None, ApplyTo=[], MatchCriteria=[], OneAlertPerSession=None):
     super(WebServiceCustomPolicy, self).__init__(connection=connection, Name=Name)
     validate_string(Name=Name, Severity=Severity, Action=Action)
@@ -59,7 +42,7 @@ class WebServiceCustomPolicy(MxObject):
   # Override the MxObject __iter__ function to print ApplyTo WebService objects as dictionaries    
   def __iter__(self):
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       if is_parameter.match(field):
         variable_function = getattr(self, field)
         if field == 'ApplyTo':
@@ -309,7 +292,7 @@ class WebServiceCustomPolicy(MxObject):
         else:
           raise MxException("Bad 'ApplyTo' parameter")
       if ApplyToNames: body['applyTo'] = ApplyToNames
-      connection._mx_api('POST', '/conf/webServiceCustomPolicies/%s' % Name, data=json.dumps(body))
+      connection._mx_api('POST', '/conf/webServiceCustomPolicies/%s' % Name, data=json_dumps(body))
       return WebServiceCustomPolicy(connection=connection, Name=Name, Enabled=Enabled, Severity=Severity, Action=Action, FollowedAction=FollowedAction, SendToCd=None, DisplayResponsePage=DisplayResponsePage, ApplyTo=ApplyToObjects, MatchCriteria=MatchCriteria, OneAlertPerSession=OneAlertPerSession)
   @staticmethod
   def _delete_web_service_custom_policy(connection, Name=None):
@@ -317,7 +300,7 @@ class WebServiceCustomPolicy(MxObject):
     pol = connection.get_web_service_custom_policy(Name=Name)
     if pol:
       connection._mx_api('DELETE', '/conf/webServiceCustomPolicies/%s' % Name)
-      connection._instances.remove(pol)
+      connection._instances.discard(pol)
       del pol
     else:
       raise MxException("Policy does not exist")
@@ -334,6 +317,6 @@ class WebServiceCustomPolicy(MxObject):
       if Value not in ['high', 'medium', 'low', 'informative', 'noAlert']:
         raise MxException("Parameter '%s' must be one of %s" % (Parameter, str(['high', 'medium', 'low', 'informative', 'noAlert'])))
     body = { Parameter: Value }
-    connection._mx_api('PUT', '/conf/webServiceCustomPolicies/%s' % Name, data=json.dumps(body))
+    connection._mx_api('PUT', '/conf/webServiceCustomPolicies/%s' % Name, data=json_dumps(body))
     return True
 
@@ -2,6 +2,12 @@
  
 from imperva_sdk.core import *
 from imperva_sdk.MxConnection import MxConnection
+from imperva_sdk.RetryPolicy import RetryPolicy
+from imperva_sdk.RateLimiter import RateLimiter
+from imperva_sdk.ResponseCache import ResponseCache
+from imperva_sdk.PersistentResponseCache import PersistentResponseCache
+from imperva_sdk.SqliteMirror import SqliteMirror
+from imperva_sdk.JsonCodec import set_json_backend, get_json_backend
 
 __version__ = '0.1.8'
 __author__ = "Imperva Inc."
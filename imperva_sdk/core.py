@@ -2,6 +2,10 @@
 
 import re
 import os
+import time
+import threading
+from collections import OrderedDict
+from imperva_sdk.JsonCodec import json_loads, json_dumps
 valid_string_pattern = re.compile(r'^[a-zA-Z0-9 _\.\'\-\[\]\,\(\)\:\+]*$')
 
 #
@@ -13,7 +17,45 @@ is_parameter = re.compile(r'^[A-Z].*$')
 
 class MxObject(object):
   ''' Parent MX Class '''
-  
+
+  #
+  # Parameters that identify the object in the MX (e.g. server group names are only unique within a site).
+  # The values are used as the object key in the connection identity map (see MxIdentityMap).
+  # Classes that set _key_fields to None are not stored in the identity map.
+  #
+  _key_fields = ('Name',)
+  # Classes whose update deletes the object and creates it again (so an update needs all of the parameters)
+  _replaced_on_update = False
+
+  # Return the stored instance (if we already have it) to prevent duplicate objects and redundant API calls
+  def __new__(Type, *args, **kwargs):
+    connection = kwargs.get('connection')
+    if Type._key_fields is None or connection is None:
+      return super(MxObject, Type).__new__(Type)
+    key = tuple(kwargs.get(field) for field in Type._key_fields)
+    instances = connection._instances
+    with instances.lock:
+      obj = instances.get(Type.__name__, key)
+      if obj is None:
+        obj = super(MxObject, Type).__new__(Type)
+        instances.add(obj, key)
+    return obj
+
+  @classmethod
+  def _exists(Type, connection=None, **kwargs):
+    if Type._key_fields is None:
+      return None
+    key = tuple(kwargs.get(field) for field in Type._key_fields)
+    return connection._instances.get(Type.__name__, key)
+
+  # Keep the identity map key up to date when a key parameter changes (e.g. object rename)
+  def __setattr__(self, name, value):
+    object.__setattr__(self, name, value)
+    if name[:1] == '_' and self._key_fields and name[1:] in self._key_fields:
+      connection = self.__dict__.get('_connection')
+      if connection is not None:
+        connection._instances.rekey(self, self._key_fields.index(name[1:]), value)
+
   def __init__(self, connection=None, Name=None):
     if not connection.IsAuthenticated:
       raise MxException("Object must have an active MX connection")
@@ -24,10 +66,41 @@ class MxObject(object):
   def __repr__(self):
     return "<imperva_sdk '%s' Object - '%s'>" % (type(self).__name__, self.Name)
 
+  @classmethod
+  def _get_class_fields(Type):
+    '''
+    Returns the parameter and "get_all_" function names of the class (sorted like dir()).
+    The names are computed once per class, so dictionary conversions don't have to scan dir() every time.
+    '''
+    # Look in the class itself - a parent class has different fields
+    fields = Type.__dict__.get('_class_fields')
+    if fields is None:
+      fields = tuple(field for field in dir(Type) if is_parameter.match(field) or field.startswith('get_all_'))
+      Type._class_fields = fields
+    return fields
+
+  def _get_fields(self):
+    ''' Class fields and parameters that were set on the instance itself (sorted like dir()) '''
+    fields = self._get_class_fields()
+    instance_fields = [field for field in self.__dict__ if is_parameter.match(field) and field not in fields]
+    if instance_fields:
+      return sorted(fields + tuple(instance_fields))
+    return fields
+
   # Recursive dictionary representation of the MX object (used for JSON export/import) 
   def __iter__(self):
+    for x,y in self._to_dict().items():
+      yield x, y
+
+  def _to_dict(self, Depth=None, Include=None, Exclude=None):
+    '''
+    Dictionary representation of the MX object. Child objects are only loaded from the MX if they are in scope.
+    :param Depth: Number of child object levels to include (None for all levels, 0 for no child objects)
+    :param Include: Names of the child object lists to include (e.g. `['server_groups', 'web_services']`), None for all child objects
+    :param Exclude: Names of child object lists (or other attributes that are loaded separately, like 'Profile') to leave out
+    '''
     iters = {}
-    for field in dir(self):
+    for field in self._get_fields():
       # Only variables should start with a capital letter
       if is_parameter.match(field):
         variable_function = getattr(self, field)
@@ -35,16 +108,32 @@ class MxObject(object):
       # If the object has a "get_all" function, we need to build the child objects
       elif field.startswith('get_all_'):
         child_title = field.replace('get_all_', '')
+        if not child_in_scope(child_title, Depth=Depth, Include=Include, Exclude=Exclude):
+          continue
         iters[child_title] = []
         get_all_function = getattr(self, field)
         children = get_all_function()
         for child in children:
           if child:
-            iters[child_title].append(dict(child))
+            iters[child_title].append(child_to_dict(child, Depth=Depth, Include=Include, Exclude=Exclude))
           else:
             print("Child of <imperva_sdk '%s' Object - '%s'> is null" % (type(self).__name__, self.Name))
-    for x,y in iters.items():
-      yield x, y
+    return iters
+
+#
+# Scope of MxObject._to_dict - child objects (and other attributes that need more API calls, like web application profiles) are only loaded if they are in scope
+#
+def child_in_scope(Title, Depth=None, Include=None, Exclude=None):
+  return (Depth is None or Depth > 0) and (Include is None or Title in Include) and not (Exclude and Title in Exclude)
+
+def object_to_dict(Object, Depth=None, Include=None, Exclude=None):
+  # Classes that override __iter__ have no child objects - convert them as usual
+  if (Depth is None and Include is None and not Exclude) or type(Object).__iter__ is not MxObject.__iter__:
+    return dict(Object)
+  return Object._to_dict(Depth=Depth, Include=Include, Exclude=Exclude)
+
+def child_to_dict(Child, Depth=None, Include=None, Exclude=None):
+  return object_to_dict(Child, Depth=None if Depth is None else Depth - 1, Include=Include, Exclude=Exclude)
       
 def validate_string(**kwargs):
   for param in kwargs:
@@ -59,6 +148,131 @@ class MxException(Exception):
 class MxExceptionNotFound(Exception):
 	pass
 
+_clock = getattr(time, 'monotonic', time.time)
+
+class MxIdentityMap(object):
+  '''
+  Identity map of the MX objects of a connection.
+  Objects are stored by (class name, key) where the key is a tuple of the class '_key_fields' values,
+  so lookup, insert and removal don't depend on the number of stored objects.
+
+  :param MaxObjects: Maximum number of stored objects (at least 1), the least recently used objects are removed (None for no limit)
+  :param Ttl: Number of seconds an object is returned before it is loaded from the MX again - a number for all objects
+              or a dict of class name (or class) to seconds, the None key applies to other classes (None for no expiration)
+  '''
+  def __init__(self, MaxObjects=None, Ttl=None):
+    # (class name, key) -> (obj, expiration time), least recently used first
+    self._objects = OrderedDict()
+    # id(obj) -> (obj, key)
+    self._keys = {}
+    self.lock = threading.RLock()
+    self.MaxObjects = MaxObjects
+    self.Ttl = Ttl
+
+  def _get_ttl(self, ClassName):
+    if not isinstance(self.Ttl, dict):
+      return self.Ttl
+    for class_key in self.Ttl:
+      if class_key is not None and getattr(class_key, '__name__', class_key) == ClassName:
+        return self.Ttl[class_key]
+    return self.Ttl.get(None)
+
+  def get(self, ClassName, Key):
+    key = (ClassName, tuple(Key))
+    with self.lock:
+      entry = self._objects.pop(key, None)
+      if entry is None:
+        return None
+      obj, expires = entry
+      if expires is not None and _clock() >= expires:
+        # Expired objects are loaded from the MX again
+        self._keys.pop(id(obj), None)
+        return None
+      # Most recently used
+      self._objects[key] = entry
+      return obj
+
+  def add(self, obj, Key):
+    with self.lock:
+      key = (type(obj).__name__, tuple(Key))
+      self._keys[id(obj)] = (obj, key)
+      # Like a lookup by scanning, the first object stored with a key is the one that is returned
+      if key not in self._objects:
+        ttl = self._get_ttl(key[0])
+        self._objects[key] = (obj, _clock() + ttl if ttl is not None else None)
+        self._evict()
+
+  def _evict(self):
+    while self.MaxObjects is not None and len(self._objects) > max(self.MaxObjects, 1):
+      key, (obj, expires) = self._objects.popitem(last=False)
+      entry = self._keys.get(id(obj))
+      if entry is not None and entry[1] == key:
+        del self._keys[id(obj)]
+
+  def append(self, obj):
+    self.add(obj, [getattr(obj, '_' + field, None) for field in obj._key_fields])
+
+  def remove(self, obj):
+    with self.lock:
+      entry = self._keys.pop(id(obj), None)
+      if entry is None:
+        raise ValueError("%r is not in the identity map" % obj)
+      if self._objects.get(entry[1], (None,))[0] is obj:
+        del self._objects[entry[1]]
+
+  def rekey(self, obj, Index, Value):
+    with self.lock:
+      entry = self._keys.get(id(obj))
+      if entry is None or entry[1][1][Index] == Value:
+        return
+      class_name, key = entry[1]
+      self.remove(obj)
+      self.add(obj, key[:Index] + (Value,) + key[Index + 1:])
+
+  def clear(self):
+    with self.lock:
+      self._objects.clear()
+      self._keys.clear()
+
+  def discard(self, obj):
+    '''
+    Removes the object if it is stored (unlike remove, no error if it isn't).
+    Delete functions use it because the object may have been removed (least recently used or expired) after they got it.
+    '''
+    with self.lock:
+      if id(obj) in self._keys:
+        self.remove(obj)
+
+  def discard_type(self, ClassName):
+    ''' Removes all the objects of a class '''
+    with self.lock:
+      for obj, key in list(self._keys.values()):
+        if key[0] == ClassName:
+          self.remove(obj)
+
+  def _remove_expired(self):
+    now = _clock()
+    for key, (obj, expires) in list(self._objects.items()):
+      if expires is not None and now >= expires:
+        del self._objects[key]
+        entry = self._keys.get(id(obj))
+        if entry is not None and entry[1] == key:
+          del self._keys[id(obj)]
+
+  def __iter__(self):
+    ''' Iterates over the stored objects (expired objects are removed, like in get) '''
+    with self.lock:
+      self._remove_expired()
+      return iter([entry[0] for entry in list(self._keys.values())])
+
+  def __len__(self):
+    with self.lock:
+      self._remove_expired()
+      return len(self._keys)
+
+  def __contains__(self, obj):
+    return id(obj) in self._keys
+
 class MxList(list):
   def append(self, item):
     raise MxException('No appending allowed.')
@@ -31,7 +31,7 @@ setup(
     #packages=find_packages(exclude=['contrib', 'docs', 'tests']),
     packages=find_packages(exclude=['contrib', 'docs', 'tests']),
     py_modules=["imperva_sdk"],
-    install_requires=['requests'],
+    install_requires=['requests', 'futures; python_version < "3"'],
 
     #extras_require={
     #    'dev': ['check-manifest'],
@@ -0,0 +1,55 @@
+#!/usr/bin/python
+
+import unittest
+import imperva_sdk.AgentMonitoringRule
+from imperva_sdk.core import MxIdentityMap
+from imperva_sdk.AgentMonitoringRule import AgentMonitoringRule
+
+class StubRule(object):
+  def __init__(self, Name, ApplyToAgent=[], ApplyToTag=[]):
+    self.Name = Name
+    self.ApplyToAgent = ApplyToAgent
+    self.ApplyToTag = ApplyToTag
+
+class StubConnection(object):
+  ''' Connection that lists the rules of the test (no MX needed) '''
+  def __init__(self, Rules, Ttl=None):
+    self.rules = Rules
+    self.listings = 0
+    self._request_generation = 0
+    self._agent_monitoring_rules_index = None
+    self._instances = MxIdentityMap(Ttl=Ttl)
+  def get_all_agent_monitoring_rule_dam_global_objects(self):
+    self.listings += 1
+    return list(self.rules)
+
+class TestAgentMonitoringRulesIndex(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = StubConnection([StubRule('rule1', ApplyToAgent=['agent1']), StubRule('rule2', ApplyToTag=['tag1']), StubRule('rule3', ApplyToAgent=['agent2'])])
+
+  def get_rules(self, AgentName='agent1', AgentTags=['tag1']):
+    rules = AgentMonitoringRule._get_all_agent_monitoring_rules_by_agent(self.connection, AgentName=AgentName, AgentTags=AgentTags)
+    return [rule.Name for rule in rules]
+
+  def test_index_is_kept(self):
+    self.assertEqual(self.get_rules(), ['rule1', 'rule2'])
+    self.assertEqual(self.get_rules(AgentName='agent2', AgentTags=[]), ['rule3'])
+    self.assertEqual(self.connection.listings, 1)
+
+  def test_change_lists_again(self):
+    self.get_rules()
+    # A change through the connection starts a new API call generation
+    self.connection.rules.append(StubRule('rule4', ApplyToAgent=['agent1']))
+    self.connection._request_generation += 1
+    self.assertEqual(self.get_rules(), ['rule1', 'rule2', 'rule4'])
+    self.assertEqual(self.connection.listings, 2)
+
+  def test_ttl(self):
+    self.connection._instances.Ttl = {'AgentMonitoringRule': 0}
+    self.get_rules()
+    self.get_rules()
+    self.assertEqual(self.connection.listings, 2)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/python
+
+import unittest
+import imperva_sdk
+from imperva_sdk.core import MxObject, is_parameter
+from imperva_sdk.TableGroup import TableGroup
+from DiffFromJson import OfflineMxConnection
+
+class ExtendedTableGroup(TableGroup):
+  @property
+  def Owner(self):
+    return 'owner'
+
+def scan_fields(Object):
+  ''' The fields by scanning dir() every time '''
+  return tuple(field for field in dir(Object) if is_parameter.match(field) or field.startswith('get_all_'))
+
+class TestClassFields(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = OfflineMxConnection()
+
+  def test_all_classes(self):
+    # imperva_sdk imports all of the object classes
+    classes = list(MxObject.__subclasses__())
+    for cls in classes:
+      classes += [subclass for subclass in cls.__subclasses__() if subclass not in classes]
+    self.assertTrue(len(classes) > 20)
+    for cls in classes:
+      self.assertEqual(cls._get_class_fields(), scan_fields(cls))
+
+  def test_subclass(self):
+    self.assertEqual(TableGroup._get_class_fields(), scan_fields(TableGroup))
+    self.assertEqual(ExtendedTableGroup._get_class_fields(), scan_fields(ExtendedTableGroup))
+    self.assertTrue('Owner' in ExtendedTableGroup._get_class_fields())
+    self.assertFalse('Owner' in TableGroup._get_class_fields())
+
+  def test_instance_fields(self):
+    table_group = TableGroup(connection=self.mx, Name='tg1', IsSensitive=False, DataType='Usernames')
+    table_group.Comment = 'set on the object'
+    self.assertEqual(list(table_group._get_fields()), list(scan_fields(table_group)))
+    self.assertEqual(dict(table_group)['Comment'], 'set on the object')
+    self.assertFalse('Comment' in dict(TableGroup(connection=self.mx, Name='tg2')))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+
+import unittest
+import imperva_sdk
+from imperva_sdk.core import json_dumps, MxIdentityMap
+from imperva_sdk.TableGroup import TableGroup
+from imperva_sdk.ImportPlan import ImportPlan
+
+class OfflineMxConnection(imperva_sdk.MxConnection):
+  ''' Connection that isn't logged in to an MX - the MX objects are created by the test '''
+  IsAuthenticated = True
+  _dry_run = None
+  def __init__(self):
+    self._instances = MxIdentityMap()
+    self.calls = []
+    self.deleted = []
+  def __del__(self):
+    pass
+  def _mx_api(self, method, path, **kwargs):
+    self.calls.append((method, path))
+    raise imperva_sdk.MxExceptionNotFound("Not found")
+  def get_all_table_group_dam_global_objects(self):
+    return [obj for obj in self._instances if isinstance(obj, TableGroup)]
+  def delete_table_group(self, Name=None):
+    self.deleted.append(Name)
+
+class StubConnection(object):
+  ''' Connection that only returns an existing table group (no MX needed) '''
+  def __init__(self, table_group):
+    self.table_group = table_group
+  def get_table_group(self, Name=None):
+    return self.table_group if Name == self.table_group.Name else None
+
+class StubTableGroup(object):
+  def __init__(self, **parameters):
+    self.__dict__.update(parameters)
+
+class TestDiffFromJson(unittest.TestCase):
+
+  Records = [{'Name': 'record1'}, {'Name': 'record2'}]
+
+  def setUp(self):
+    self.mx = OfflineMxConnection()
+    self.current = [
+      {'Name': 'tg1', 'IsSensitive': False, 'DataType': 'Usernames', 'ServiceTypes': ['Oracle'], 'Records': self.Records},
+      {'Name': 'tg2', 'IsSensitive': False, 'DataType': 'Usernames', 'ServiceTypes': ['Oracle'], 'Records': self.Records}
+    ]
+    self.table_groups = [TableGroup(connection=self.mx, **table_group) for table_group in self.current]
+
+  def diff(self, TableGroups, Workers=1):
+    config = {'metadata': {'SdkVersion': imperva_sdk.__version__}, 'global_objects': {'table_group_dam': TableGroups}}
+    return self.mx._diff_from_config(config, Workers=Workers)
+
+  def test_update_keeps_records(self):
+    tg1 = dict(self.current[0], IsSensitive=True)
+    tg2 = dict(self.current[1])
+    changes, report, deletions = self.diff([tg1, tg2])
+    self.assertEqual([entry['Action'] for entry in report], ['UPDATE', 'UNCHANGED'])
+    self.assertEqual(report[0]['Changes'], ['IsSensitive'])
+    # Only the changed parameter is sent, the others keep their MX value
+    self.assertEqual(changes['global_objects']['table_group_dam'], [{'Name': 'tg1', 'IsSensitive': True, 'DataType': None, 'ServiceTypes': None, 'Records': None}])
+    self.assertEqual(deletions, [])
+
+    # Importing the change only sets the changed parameter
+    table_group = StubTableGroup(Name='tg1', IsSensitive=False, DataType='Usernames', ServiceTypes=['Oracle'], Records=self.Records)
+    TableGroup._create_table_group(connection=StubConnection(table_group), update=True, **changes['global_objects']['table_group_dam'][0])
+    self.assertTrue(table_group.IsSensitive)
+    self.assertEqual(table_group.Records, self.Records)
+
+  def test_empty_value_not_applied(self):
+    tg1 = dict(self.current[0], Records=[])
+    tg2 = dict(self.current[1])
+    changes, report, deletions = self.diff([tg1, tg2])
+    self.assertEqual(report[0]['Action'], 'UNCHANGED')
+    self.assertEqual(report[0]['NotApplied'], ['Records'])
+    self.assertEqual(changes['global_objects']['table_group_dam'], [])
+
+  def test_create(self):
+    tg3 = {'Name': 'tg3', 'IsSensitive': True, 'DataType': 'Usernames', 'ServiceTypes': [], 'Records': []}
+    changes, report, deletions = self.diff([dict(self.current[0]), dict(self.current[1]), tg3])
+    self.assertEqual(report[2]['Action'], 'CREATE')
+    self.assertEqual(changes['global_objects']['table_group_dam'], [tg3])
+
+  def test_only_json_objects_are_loaded(self):
+    # tg1 and tg2 are already in the connection, tg3 is loaded from the MX - no export
+    tg3 = {'Name': 'tg3', 'IsSensitive': True, 'DataType': 'Usernames', 'ServiceTypes': [], 'Records': []}
+    self.diff([dict(self.current[0]), tg3])
+    self.assertEqual(self.mx.calls, [('GET', '/conf/tableGroups/tg3/data')])
+
+  def test_deleted(self):
+    changes, report, deletions = self.diff([dict(self.current[0])], Workers=2)
+    self.assertEqual(report, [
+      {'Function': 'create_table_group_dam_global_object', 'Object Name': 'tg1', 'Action': 'UNCHANGED'},
+      {'Function': 'delete_table_group', 'Object Name': 'tg2', 'Action': 'DELETE'}
+    ])
+    self.assertEqual([(entry['Object Name'], parameters) for entry, delete_function, parameters in deletions], [('tg2', {'Name': 'tg2'})])
+
+    # Deletions run after the other import operations
+    plan = ImportPlan()
+    plan.add(lambda node: [{'Function': 'create_table_group_dam_global_object', 'Result': 'SUCCESS'}])
+    self.mx._plan_deletions(plan, deletions)
+    log = plan.run()
+    self.assertEqual([entry['Function'] for entry in log], ['create_table_group_dam_global_object', 'delete_table_group'])
+    self.assertEqual(log[1]['Result'], 'SUCCESS')
+    self.assertEqual(self.mx.deleted, ['tg2'])
+
+  def test_empty_list_not_compared(self):
+    changes, report, deletions = self.diff([])
+    self.assertEqual(report, [])
+    self.assertEqual(deletions, [])
+
+if __name__ == '__main__':
+  unittest.main()
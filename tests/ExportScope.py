@@ -0,0 +1,118 @@
+#!/usr/bin/python
+
+import unittest
+from imperva_sdk.core import object_to_dict
+from imperva_sdk.Site import Site
+from imperva_sdk.ServerGroup import ServerGroup
+from imperva_sdk.WebService import WebService
+from imperva_sdk.WebApplication import WebApplication
+from DiffFromJson import OfflineMxConnection
+
+class SiteTreeConnection(OfflineMxConnection):
+  ''' Connection with one site -> server group -> web service -> web application tree, records the objects that are loaded '''
+  def __init__(self):
+    OfflineMxConnection.__init__(self)
+    self.loaded = []
+    self.site = Site(connection=self, Name='site1')
+    self.server_group = ServerGroup(connection=self, Name='sg1', Site='site1', OperationMode='simulation')
+    self.web_service = WebService(connection=self, Name='ws1', ServerGroup='sg1', Site='site1', Ports=[80])
+    self.web_application = WebApplication(connection=self, Name='wa1', WebService='ws1', ServerGroup='sg1', Site='site1')
+  def get_all_sites(self):
+    self.loaded.append('sites')
+    return [self.site]
+  def get_all_server_groups(self, Site=None):
+    self.loaded.append('server_groups')
+    return [self.server_group]
+  def get_all_web_services(self, Site=None, ServerGroup=None):
+    self.loaded.append('web_services')
+    return [self.web_service]
+  def get_all_db_services(self, Site=None, ServerGroup=None):
+    self.loaded.append('db_services')
+    return []
+  def get_all_krp_rules(self, Site=None, ServerGroup=None, WebService=None):
+    self.loaded.append('krp_rules')
+    return []
+  def get_all_trp_rules(self, Site=None, ServerGroup=None, WebService=None):
+    self.loaded.append('trp_rules')
+    return []
+  def get_all_web_applications(self, Site=None, ServerGroup=None, WebService=None):
+    self.loaded.append('web_applications')
+    return [self.web_application]
+  def get_profile(self, Application=None, WebService=None, ServerGroup=None, Site=None):
+    self.loaded.append('Profile')
+    return {'webProfileUrls': []}
+
+class TestExportScope(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = SiteTreeConnection()
+
+  def test_all_levels(self):
+    site = object_to_dict(self.mx.site)
+    self.assertEqual(sorted(self.mx.loaded), ['Profile', 'db_services', 'krp_rules', 'server_groups', 'trp_rules', 'web_applications', 'web_services'])
+    web_application = site['server_groups'][0]['web_services'][0]['web_applications'][0]
+    self.assertEqual(web_application['Name'], 'wa1')
+    self.assertEqual(web_application['Profile'], {'webProfileUrls': []})
+
+  def test_depth(self):
+    site = object_to_dict(self.mx.site, Depth=0)
+    self.assertEqual(site, {'Name': 'site1'})
+    site = object_to_dict(self.mx.site, Depth=1)
+    self.assertEqual(site['server_groups'][0]['Name'], 'sg1')
+    self.assertFalse('web_services' in site['server_groups'][0])
+    # Child objects below the depth are not loaded from the MX
+    self.assertEqual(self.mx.loaded, ['server_groups'])
+
+  def test_depth_profile(self):
+    # The profile is loaded like a child object of the web application
+    site = object_to_dict(self.mx.site, Depth=3)
+    self.assertFalse('Profile' in site['server_groups'][0]['web_services'][0]['web_applications'][0])
+    self.assertFalse('Profile' in self.mx.loaded)
+
+  def test_include(self):
+    site = object_to_dict(self.mx.site, Include=['server_groups', 'web_services'])
+    web_service = site['server_groups'][0]['web_services'][0]
+    self.assertEqual(web_service['Name'], 'ws1')
+    self.assertFalse('web_applications' in web_service)
+    self.assertFalse('db_services' in site['server_groups'][0])
+    self.assertEqual(self.mx.loaded, ['server_groups', 'web_services'])
+
+class TestExportDiscard(unittest.TestCase):
+
+  # Sections that are not part of the site tree
+  OtherSections = ['action_sets', 'assessment_tests', 'policies', 'classification_profiles', 'global_objects', 'reports', 'das_objects']
+
+  def setUp(self):
+    self.mx = SiteTreeConnection()
+
+  def export_sites(self, Discard=[]):
+    sections, tasks = self.mx._export_tasks(Discard=self.OtherSections + Discard)
+    self.assertEqual([task[0] for task in tasks], ['sites'])
+    return tasks[0][2]()
+
+  def test_discarded_children(self):
+    site = self.export_sites(Discard=['web_applications', 'db_services'])
+    self.assertFalse('web_applications' in site['server_groups'][0]['web_services'][0])
+    self.assertFalse('db_services' in site['server_groups'][0])
+    # Discarded child objects (and the profiles of their applications) are not loaded from the MX
+    self.assertEqual(sorted(self.mx.loaded), ['krp_rules', 'server_groups', 'sites', 'trp_rules', 'web_services'])
+
+  def test_discarded_profile(self):
+    site = self.export_sites(Discard=['Profile'])
+    self.assertFalse('Profile' in site['server_groups'][0]['web_services'][0]['web_applications'][0])
+    self.assertFalse('Profile' in self.mx.loaded)
+
+  def test_discarded_attributes(self):
+    # Attributes are loaded with their object and removed from the export
+    site = self.export_sites(Discard=['Ports', 'OperationMode'])
+    self.assertFalse('OperationMode' in site['server_groups'][0])
+    self.assertFalse('Ports' in site['server_groups'][0]['web_services'][0])
+    self.assertTrue('web_applications' in self.mx.loaded)
+
+  def test_discarded_sites(self):
+    sections, tasks = self.mx._export_tasks(Discard=self.OtherSections + ['sites'])
+    self.assertEqual(tasks, [])
+    self.assertEqual(self.mx.loaded, [])
+
+if __name__ == '__main__':
+  unittest.main()
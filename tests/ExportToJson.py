@@ -0,0 +1,122 @@
+#!/usr/bin/python
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from imperva_sdk.Site import Site
+from imperva_sdk.ServerGroup import ServerGroup
+from DiffFromJson import OfflineMxConnection
+
+class ExportConnection(OfflineMxConnection):
+  ''' Connection with sites that have one server group each, records the server groups that are loaded '''
+  Host = 'mx.example.com'
+  Version = '13.0.0.10'
+  Challenge = 'challenge'
+  # Sections that are not part of the site tree
+  OtherSections = ['action_sets', 'assessment_tests', 'policies', 'classification_profiles', 'global_objects', 'reports', 'das_objects']
+  def __init__(self, Sites=8):
+    OfflineMxConnection.__init__(self)
+    self.lock = threading.Lock()
+    self.loaded = []
+    self.sites = [Site(connection=self, Name='site%d' % i) for i in range(Sites)]
+  def get_all_sites(self):
+    return list(self.sites)
+  def get_all_server_groups(self, Site=None):
+    # Later sites are loaded faster, so with workers they finish out of order
+    time.sleep(0.002 * (len(self.sites) - int(Site[4:])))
+    with self.lock:
+      self.loaded.append(Site)
+    return [ServerGroup(connection=self, Name='sg', Site=Site, OperationMode='active')]
+  def get_all_web_services(self, Site=None, ServerGroup=None):
+    return []
+  def get_all_db_services(self, Site=None, ServerGroup=None):
+    return []
+  def export(self, Workers=1, Compact=False):
+    export = json.loads(self.export_to_json(Discard=self.OtherSections, Workers=Workers, Compact=Compact))
+    del export['metadata']['ExportTime']
+    return export
+
+class TestParallelExport(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = ExportConnection()
+
+  def test_same_export(self):
+    export = self.mx.export(Workers=4)
+    self.assertEqual([site['Name'] for site in export['sites']], ['site%d' % i for i in range(8)])
+    self.assertEqual(export, self.mx.export())
+    self.assertEqual(export['metadata']['Host'], 'mx.example.com')
+
+  def test_result_order(self):
+    # Tasks return lists (or generators) of objects
+    tasks = [lambda i=i: time.sleep(0.001 * (10 - i)) or [i] for i in range(10)]
+    self.assertEqual(list(self.mx._iter_export_tasks(tasks, Workers=4)), [[i] for i in range(10)])
+
+  def test_window(self):
+    started = []
+    def task(i):
+      started.append(i)
+      return [i]
+    results = self.mx._iter_export_tasks([lambda i=i: task(i) for i in range(100)], Workers=2)
+    self.assertEqual(next(results), [0])
+    # Only a window of tasks runs ahead of the consumer
+    self.assertTrue(len(started) <= 4)
+    results.close()
+    self.assertTrue(len(started) < 100)
+
+  def test_error(self):
+    def fail():
+      raise ValueError('failed task')
+    results = self.mx._iter_export_tasks([lambda: [1], fail, lambda: [3]], Workers=2)
+    self.assertEqual(next(results), [1])
+    self.assertRaises(ValueError, next, results)
+
+class TestStreamingExport(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = ExportConnection()
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, 'export.json')
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_same_text(self):
+    # The chunks make the same text as dumping the whole export at once
+    text = ''.join(self.mx.iter_export_to_json(Discard=ExportConnection.OtherSections))
+    self.assertEqual(text, json.dumps(json.loads(text), indent=4, sort_keys=True, separators=(',', ': ')))
+    text = ''.join(self.mx.iter_export_to_json(Discard=ExportConnection.OtherSections, Compact=True))
+    self.assertEqual(text, json.dumps(json.loads(text), sort_keys=True, separators=(',', ':')))
+
+  def test_sites_loaded_while_written(self):
+    chunks = self.mx.iter_export_to_json(Discard=ExportConnection.OtherSections)
+    for chunk in chunks:
+      if 'site0' in chunk:
+        break
+    self.assertEqual(self.mx.loaded, ['site0'])
+    chunks.close()
+
+  def test_file(self):
+    self.mx.export_to_file(self.path, Discard=ExportConnection.OtherSections)
+    with open(self.path) as f:
+      export = json.load(f)
+    self.assertEqual(len(export['sites']), 8)
+    self.assertEqual(os.listdir(self.directory), ['export.json'])
+
+  def test_failed_export_keeps_file(self):
+    with open(self.path, 'w') as f:
+      f.write('previous export')
+    def fail(Site=None):
+      raise ValueError('failed export')
+    self.mx.get_all_server_groups = fail
+    self.assertRaises(ValueError, self.mx.export_to_file, self.path, Discard=ExportConnection.OtherSections)
+    with open(self.path) as f:
+      self.assertEqual(f.read(), 'previous export')
+    self.assertEqual(os.listdir(self.directory), ['export.json'])
+
+if __name__ == '__main__':
+  unittest.main()
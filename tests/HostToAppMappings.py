@@ -0,0 +1,59 @@
+#!/usr/bin/python
+
+import unittest
+from imperva_sdk.core import MxIdentityMap
+from imperva_sdk.WebService import WebService
+
+class StubConnection(object):
+  ''' Connection that returns one mapping per web service (no MX needed) '''
+  def __init__(self, Ttl=None):
+    self.calls = []
+    self._instances = MxIdentityMap(Ttl=Ttl)
+    self._host_to_app_mappings = {}
+  def _mx_api(self, method, path, **kwargs):
+    self.calls.append((method, path))
+    return {'hostToAppMappings': [{'host': 'www.example.com', 'application': path.split('/')[5]}]}
+
+class TestHostToAppMappings(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = StubConnection()
+
+  def get_mappings(self, Name='ws1', ServerGroup='sg1'):
+    return WebService._get_host_to_app_mappings(self.connection, Site='site1', ServerGroup=ServerGroup, Name=Name)
+
+  def test_fetched_once(self):
+    self.assertEqual(self.get_mappings(), [{'host': 'www.example.com', 'application': 'ws1'}])
+    self.get_mappings()
+    self.get_mappings(Name='ws2')
+    self.get_mappings(Name='ws2')
+    self.assertEqual(len(self.connection.calls), 2)
+
+  def test_copy(self):
+    self.get_mappings()[0]['host'] = 'changed'
+    self.assertEqual(self.get_mappings()[0]['host'], 'www.example.com')
+
+  def test_change_fetches_again(self):
+    self.get_mappings()
+    self.get_mappings(Name='ws2')
+    self.get_mappings(ServerGroup='sg2')
+    # A change of a web service only fetches its own mappings again
+    WebService._invalidate_host_to_app_mappings(self.connection, Site='site1', ServerGroup='sg1', Name='ws1')
+    self.get_mappings()
+    self.get_mappings(Name='ws2')
+    self.assertEqual(len(self.connection.calls), 4)
+    # A change of a server group fetches the mappings of all its web services again
+    WebService._invalidate_host_to_app_mappings(self.connection, Site='site1', ServerGroup='sg1')
+    self.get_mappings()
+    self.get_mappings(Name='ws2')
+    self.get_mappings(ServerGroup='sg2')
+    self.assertEqual(len(self.connection.calls), 6)
+
+  def test_ttl(self):
+    self.connection._instances.Ttl = {'WebApplication': 0}
+    self.get_mappings()
+    self.get_mappings()
+    self.assertEqual(len(self.connection.calls), 2)
+
+if __name__ == '__main__':
+  unittest.main()
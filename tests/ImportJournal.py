@@ -0,0 +1,103 @@
+#!/usr/bin/python
+
+import os
+import shutil
+import tempfile
+import unittest
+import imperva_sdk
+from imperva_sdk.ImportJournal import ImportJournal, import_hash
+from imperva_sdk.ImportPlan import ImportPlan
+
+class TestImportJournal(unittest.TestCase):
+
+  Host = '10.0.0.1'
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, 'import.journal')
+    self.calls = []
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def plan(self, Objects, Fail=[]):
+    ''' Import plan that "creates" site objects (parameters by name) and fails the names in Fail '''
+    plan = ImportPlan()
+    for name in sorted(Objects):
+      def create_object(node, name=name):
+        self.calls.append(name)
+        return [{'Function': 'create_site', 'Object Name': name, 'Result': 'ERROR' if name in Fail else 'SUCCESS'}]
+      plan.add(create_object, Tags=['sites'], Key='sites/' + name, Hash=import_hash('create_site', Objects[name], True))
+    return plan
+
+  def run_plan(self, Objects, Fail=[], ReadOnly=False, Host=Host):
+    journal = ImportJournal(self.path, ReadOnly=ReadOnly, Host=Host)
+    try:
+      return self.plan(Objects, Fail=Fail).run(Journal=journal)
+    finally:
+      journal.close()
+
+  def test_resume(self):
+    objects = {'site1': {'Name': 'site1'}, 'site2': {'Name': 'site2'}, 'site3': {'Name': 'site3'}}
+    self.run_plan(objects, Fail=['site2'])
+    self.assertEqual(self.calls, ['site1', 'site2', 'site3'])
+
+    # Completed operations are skipped, the failed one runs again - the log is the same as a full import
+    del self.calls[:]
+    log = self.run_plan(objects)
+    self.assertEqual(self.calls, ['site2'])
+    self.assertEqual([entry['Object Name'] for entry in log], ['site1', 'site2', 'site3'])
+    self.assertTrue(all(entry['Result'] == 'SUCCESS' for entry in log))
+
+    del self.calls[:]
+    self.run_plan(objects)
+    self.assertEqual(self.calls, [])
+
+  def test_changed_object_runs_again(self):
+    objects = {'site1': {'Name': 'site1'}, 'site2': {'Name': 'site2'}}
+    self.run_plan(objects)
+    del self.calls[:]
+    objects['site2']['Description'] = 'changed'
+    self.run_plan(objects)
+    self.assertEqual(self.calls, ['site2'])
+
+  def test_read_only(self):
+    objects = {'site1': {'Name': 'site1'}}
+    self.run_plan(objects, ReadOnly=True)
+    self.assertFalse(os.path.exists(self.path))
+    self.run_plan(objects)
+    del self.calls[:]
+    self.run_plan(objects, ReadOnly=True)
+    self.assertEqual(self.calls, [])
+
+  def test_incomplete_last_line(self):
+    objects = {'site1': {'Name': 'site1'}, 'site2': {'Name': 'site2'}}
+    self.run_plan(objects)
+    with open(self.path, 'a') as f:
+      f.write('{"Key": "sites/sit')
+    del self.calls[:]
+    objects['site3'] = {'Name': 'site3'}
+    self.run_plan(objects)
+    self.assertEqual(self.calls, ['site3'])
+    self.assertEqual(len(ImportJournal(self.path, Host=self.Host)), 3)
+
+  def test_other_host(self):
+    self.run_plan({'site1': {'Name': 'site1'}})
+    with self.assertRaises(imperva_sdk.MxException):
+      ImportJournal(self.path, Host='10.0.0.2')
+
+  def test_concurrent_header(self):
+    objects = dict(('site%d' % i, {'Name': 'site%d' % i}) for i in range(50))
+    journal = ImportJournal(self.path, Host=self.Host)
+    try:
+      self.plan(objects).run(Workers=8, Journal=journal)
+    finally:
+      journal.close()
+    with open(self.path) as f:
+      lines = f.readlines()
+    self.assertEqual(len(lines), 51)
+    self.assertEqual(sum(1 for line in lines if '"Host"' in line), 1)
+    self.assertIn('"Host"', lines[0])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+
+import threading
+import unittest
+from imperva_sdk.core import MxException
+from imperva_sdk.ImportPlan import ImportPlan, sort_import_types
+
+class TestImportPlan(unittest.TestCase):
+
+  def setUp(self):
+    self.plan = ImportPlan()
+    self.order = []
+    self.lock = threading.Lock()
+
+  def add(self, Name, Tags=[], DependsOn=[]):
+    def function(node):
+      with self.lock:
+        self.order.append(Name)
+      node.Result = Name
+      return [{'Name': Name, 'Result': 'SUCCESS'}]
+    return self.plan.add(function, Tags=Tags, DependsOn=DependsOn)
+
+  def add_tree(self):
+    # Added in the reverse order of their dependencies
+    self.add('policy', Tags=['policy'])
+    site = self.add('site', Tags=['sites'])
+    self.add('server group', Tags=['sites'], DependsOn=[site])
+    self.add('table group', Tags=['global_object', 'global_object:table_group_dam'])
+    self.add('data type', Tags=['global_object', 'global_object:data_type_dam'])
+
+  def check_order(self):
+    position = dict((name, self.order.index(name)) for name in self.order)
+    self.assertTrue(position['table group'] < position['data type'])
+    self.assertTrue(position['table group'] < position['site'] < position['server group'] < position['policy'])
+    self.assertTrue(position['data type'] < position['policy'])
+
+  def test_serial(self):
+    self.add_tree()
+    log = self.plan.run()
+    self.assertEqual(self.order, ['table group', 'site', 'server group', 'data type', 'policy'])
+    # The log is in plan order
+    self.assertEqual([entry['Name'] for entry in log], ['policy', 'site', 'server group', 'table group', 'data type'])
+
+  def test_workers(self):
+    self.add_tree()
+    for i in range(20):
+      self.add('global object %d' % i, Tags=['global_object'])
+    log = self.plan.run(Workers=4)
+    self.assertEqual(len(self.order), 25)
+    self.check_order()
+    self.assertEqual(log[0]['Name'], 'policy')
+
+  def test_circular_dependencies(self):
+    first = self.add('first')
+    second = self.add('second', DependsOn=[first])
+    first.DependsOn.append(second)
+    self.assertRaises(MxException, self.plan.run)
+    self.assertEqual(self.order, [])
+
+  def test_critical_path(self):
+    self.add_tree()
+    # table group -> site -> server group -> policy
+    self.assertEqual(self.plan.critical_path(lambda node: 1), 4)
+    self.assertEqual(self.plan.critical_path(lambda node: 10 if node.Tags == ['sites'] else 1), 22)
+
+  def test_sort_import_types(self):
+    self.assertEqual(sort_import_types('global_object', ['agent_monitoring_rule_dam', 'data_type_dam', 'ip_group_dam', 'table_group_dam']), ['table_group_dam', 'data_type_dam', 'ip_group_dam', 'agent_monitoring_rule_dam'])
+
+if __name__ == '__main__':
+  unittest.main()
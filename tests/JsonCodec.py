@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+import imperva_sdk.JsonCodec
+from imperva_sdk.JsonCodec import JsonBackends, json_loads, json_dumps, set_json_backend, get_json_backend
+
+# The backends that are installed here
+InstalledBackends = [name for name in JsonBackends if name == 'json' or getattr(imperva_sdk.JsonCodec, name) is not None]
+
+class TestJsonCodec(unittest.TestCase):
+
+  Value = {'name': u'café שלום', 'ports': [80, 443], 'nested': {'b': None, 'a': True}, 'ratio': 0.5, 'path': '/conf/sites'}
+
+  def setUp(self):
+    self.backend = get_json_backend()
+
+  def tearDown(self):
+    set_json_backend(self.backend)
+
+  def test_loads(self):
+    text = json.dumps(self.Value)
+    for backend in InstalledBackends:
+      set_json_backend(backend)
+      self.assertEqual(json_loads(text), self.Value)
+      # API responses are decoded from their UTF-8 bytes
+      self.assertEqual(json_loads(json.dumps(self.Value, ensure_ascii=False).encode('utf-8')), self.Value)
+      self.assertRaises(ValueError, json_loads, '{"name": ')
+
+  def test_dumps(self):
+    for backend in InstalledBackends:
+      set_json_backend(backend)
+      # The same compact ASCII text as the standard library
+      self.assertEqual(json_dumps(self.Value, SortKeys=True), json.dumps(self.Value, sort_keys=True, separators=(',', ':')))
+      self.assertEqual(json.loads(json_dumps(self.Value)), self.Value)
+
+  def test_fallback(self):
+    # Values the faster libraries can't encode are encoded by the standard library
+    value = {'big': 2 ** 70, 1: 'integer key'}
+    for backend in InstalledBackends:
+      set_json_backend(backend)
+      self.assertEqual(json_dumps(value, SortKeys=False), json.dumps(value, separators=(',', ':')))
+
+  def test_backends(self):
+    self.assertRaises(ValueError, set_json_backend, 'simplejson')
+    set_json_backend('json')
+    self.assertEqual(get_json_backend(), 'json')
+    set_json_backend()
+    self.assertEqual(get_json_backend(), InstalledBackends[0])
+
+if __name__ == '__main__':
+  unittest.main()
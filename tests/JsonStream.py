@@ -0,0 +1,58 @@
+#!/usr/bin/python
+
+import io
+import json
+import unittest
+import imperva_sdk
+from imperva_sdk.JsonStream import JsonStreamReader
+
+class TestJsonStream(unittest.TestCase):
+
+  Document = {
+    'metadata': {'SdkVersion': '0.1.8', 'Host': '10.0.0.1'},
+    'sites': [
+      {'Name': 'site "1"', 'Description': 'brackets [in] {strings} and \\ backslashes \\"', 'server_groups': [{'Name': 'sg1', 'ProtectedIps': []}]},
+      {'Name': u'site א', 'Ports': [80, 443], 'Enabled': True, 'Parent': None, 'Ratio': -1.5e3},
+      {'Name': 'site 3', 'Description': 'x' * 5000}
+    ],
+    'global_objects': {'ip_group': [{'Name': 'ips', 'Entries': [{'Type': 'single', 'IpAddressFrom': '1.1.1.1'}]}], 'table_group_dam': []},
+    'empty': {}
+  }
+
+  def reader(self, Indent=None, ChunkSize=7, Ascii=True):
+    text = json.dumps(self.Document, indent=Indent, sort_keys=True, ensure_ascii=Ascii)
+    return JsonStreamReader(io.BytesIO(text.encode('utf-8')), ChunkSize=ChunkSize)
+
+  def check(self, reader):
+    sections = reader.index()
+    self.assertEqual(sorted(sections), sorted(self.Document))
+    self.assertEqual(reader.load(*sections['metadata']), self.Document['metadata'])
+    sites = [site for key, site in reader.iter_items(sections['sites'][0])]
+    self.assertEqual(sites, self.Document['sites'])
+    object_types = reader.index(sections['global_objects'][0])
+    self.assertEqual(sorted(object_types), ['ip_group', 'table_group_dam'])
+    self.assertEqual([obj for key, obj in reader.iter_items(object_types['ip_group'][0])], self.Document['global_objects']['ip_group'])
+    self.assertEqual(list(reader.iter_items(object_types['table_group_dam'][0])), [])
+    self.assertEqual(reader.index(sections['empty'][0]), {})
+
+  def test_chunks_split_tokens(self):
+    # Chunks that are smaller than strings, numbers and escapes
+    for chunk_size in (1, 2, 3, 7, 64):
+      self.check(self.reader(ChunkSize=chunk_size))
+      # UTF-8 characters split between chunks
+      self.check(self.reader(ChunkSize=chunk_size, Ascii=False))
+
+  def test_indented(self):
+    self.check(self.reader(Indent=4))
+
+  def test_large_chunks(self):
+    self.check(self.reader(ChunkSize=1024 * 1024))
+
+  def test_invalid(self):
+    for text in (b'{"sites": [1, 2', b'{"sites" [1]}', b'{"sites": "unterminated', b'[1 2]', b'"not a container"'):
+      reader = JsonStreamReader(io.BytesIO(text), ChunkSize=4)
+      with self.assertRaises(imperva_sdk.MxException):
+        list(reader.iter_items(0))
+
+if __name__ == '__main__':
+  unittest.main()
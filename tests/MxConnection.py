@@ -0,0 +1,149 @@
+#!/usr/bin/python
+
+import json
+import threading
+import unittest
+import imperva_sdk
+
+class StubResponse(object):
+  def __init__(self, Status=200, Json=None, Text=None, ContentType='application/json'):
+    self.status_code = Status
+    self.text = Text if Text is not None else json.dumps(Json)
+    self.content = self.text.encode('utf-8')
+    self.headers = {'Content-Type': ContentType}
+
+class StubbedMxConnection(imperva_sdk.MxConnection):
+  '''
+  Connection whose API calls are answered by the test (no MX needed).
+  `Handlers` is a dict of API path to function(method, cookie) that returns a StubResponse, other paths return 404.
+  '''
+  def __init__(self, Handlers={}, **kwargs):
+    self.sent = []
+    self.sessions = 0
+    self.handlers = dict(Handlers)
+    imperva_sdk.MxConnection.__init__(self, Host='mx.example.com', **kwargs)
+  def _send_api_request(self, method, url, path, **kwargs):
+    cookie = kwargs['headers'].get('Cookie')
+    self.sent.append((method, path, cookie))
+    if method == 'POST' and path == '/auth/session':
+      self.sessions += 1
+      return StubResponse(Json={'session-id': 'JSESSIONID=%d' % self.sessions})
+    if path in self.handlers:
+      return self.handlers[path](method, cookie)
+    return StubResponse(Status=404, Json={})
+  def sent_calls(self, Path):
+    return [call for call in self.sent if call[1] == Path]
+
+class TestCoalescing(unittest.TestCase):
+
+  def setUp(self):
+    self.started = threading.Event()
+    self.release = threading.Event()
+    self.mx = StubbedMxConnection({'/conf/sites': self.get_sites, '/conf/sites/site1': self.put_site})
+
+  def get_sites(self, method, cookie):
+    self.started.set()
+    self.release.wait(10)
+    return StubResponse(Json={'sites': ['site1']})
+
+  def put_site(self, method, cookie):
+    return StubResponse(Json={})
+
+  def get_in_thread(self, results):
+    thread = threading.Thread(target=lambda: results.append(self.mx._mx_api('GET', '/conf/sites')))
+    thread.start()
+    return thread
+
+  def wait_for_joined_calls(self, Count):
+    for i in range(1000):
+      if self.mx.ApiStats['CoalescedCalls'] >= Count:
+        return
+      threading.Event().wait(0.01)
+
+  def test_identical_gets_share_a_call(self):
+    results = []
+    first = self.get_in_thread(results)
+    self.started.wait(10)
+    second = self.get_in_thread(results)
+    self.wait_for_joined_calls(1)
+    self.release.set()
+    first.join()
+    second.join()
+    self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 1)
+    self.assertEqual(results, [{'sites': ['site1']}, {'sites': ['site1']}])
+    self.assertEqual(self.mx.ApiStats['CoalescedCalls'], 1)
+
+  def test_change_starts_a_new_call(self):
+    results = []
+    first = self.get_in_thread(results)
+    self.started.wait(10)
+    # A GET that starts after a change doesn't use the response of a GET that started before it
+    self.mx._mx_api('PUT', '/conf/sites/site1', data='{}')
+    self.release.set()
+    second = self.get_in_thread(results)
+    first.join()
+    second.join()
+    self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 2)
+    self.assertEqual(self.mx.ApiStats['CoalescedCalls'], 0)
+
+  def test_request_batch(self):
+    self.release.set()
+    with self.mx.request_batch():
+      self.mx._mx_api('GET', '/conf/sites')
+      self.mx._mx_api('GET', '/conf/sites')
+      self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 1)
+      self.mx._mx_api('PUT', '/conf/sites/site1', data='{}')
+      self.mx._mx_api('GET', '/conf/sites')
+      self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 2)
+    # Responses are not kept after the batch
+    self.mx._mx_api('GET', '/conf/sites')
+    self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 3)
+
+class TestReauthentication(unittest.TestCase):
+
+  def setUp(self):
+    self.valid_session = 1
+    self.expired_response = StubResponse(Status=401, Json={'errors': [{'error-code': 'IMP-10005', 'description': 'Session timed out'}]})
+    self.mx = StubbedMxConnection({'/conf/sites': self.get_sites})
+
+  def get_sites(self, method, cookie):
+    if cookie != 'JSESSIONID=%d' % self.valid_session:
+      return self.expired_response
+    return StubResponse(Json={'sites': ['site1']})
+
+  def test_expired_session(self):
+    self.assertEqual(self.mx._mx_api('GET', '/conf/sites'), {'sites': ['site1']})
+    # The MX ends the session - the call is sent again in a new session
+    self.valid_session = 2
+    self.assertEqual(self.mx._mx_api('GET', '/conf/sites'), {'sites': ['site1']})
+    self.assertEqual([call[2] for call in self.mx.sent_calls('/conf/sites')], ['JSESSIONID=1', 'JSESSIONID=1', 'JSESSIONID=2'])
+    self.assertEqual(self.mx.ApiStats['Reauthentications'], 1)
+
+  def test_login_page(self):
+    self.expired_response = StubResponse(Text='<html><body>Login</body></html>', ContentType='text/html')
+    self.valid_session = 2
+    self.assertEqual(self.mx._mx_api('GET', '/conf/sites'), {'sites': ['site1']})
+    self.assertEqual(self.mx.sessions, 2)
+
+  def test_one_new_session(self):
+    # Calls that failed with the same expired session use the session that the first of them opened
+    self.valid_session = 2
+    self.mx._reauthenticate(Cookie='JSESSIONID=1')
+    self.mx._reauthenticate(Cookie='JSESSIONID=1')
+    self.assertEqual(self.mx.sessions, 2)
+    self.assertEqual(self.mx._mx_api('GET', '/conf/sites'), {'sites': ['site1']})
+
+  def test_still_expired(self):
+    # A call that fails in the new session too is not sent a third time
+    self.valid_session = 0
+    self.assertRaises(imperva_sdk.MxException, self.mx._mx_api, 'GET', '/conf/sites')
+    self.assertEqual(len(self.mx.sent_calls('/conf/sites')), 2)
+
+  def test_own_headers(self):
+    # Calls with their own headers don't use the connection session
+    self.valid_session = 2
+    self.assertRaises(imperva_sdk.MxException, self.mx._mx_api, 'GET', '/conf/sites', headers={'Cookie': 'JSESSIONID=1'})
+    self.assertEqual(self.mx.sessions, 1)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+import unittest
+import imperva_sdk.core
+from imperva_sdk.core import MxIdentityMap
+from imperva_sdk.TableGroup import TableGroup
+from DiffFromJson import OfflineMxConnection
+
+class TestMxIdentityMap(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = OfflineMxConnection()
+
+  def table_group(self, Name):
+    return TableGroup(connection=self.mx, Name=Name)
+
+  def test_same_object(self):
+    tg1 = self.table_group('tg1')
+    self.assertTrue(self.table_group('tg1') is tg1)
+    self.assertFalse(self.table_group('tg2') is tg1)
+    self.assertTrue(TableGroup._exists(connection=self.mx, Name='tg1') is tg1)
+    self.assertEqual(len(self.mx._instances), 2)
+
+  def test_rekey(self):
+    tg1 = self.table_group('tg1')
+    # Renaming the object changes its key
+    tg1._Name = 'renamed'
+    self.assertTrue(TableGroup._exists(connection=self.mx, Name='renamed') is tg1)
+    self.assertTrue(TableGroup._exists(connection=self.mx, Name='tg1') is None)
+    self.assertTrue(self.table_group('renamed') is tg1)
+    self.assertEqual(len(self.mx._instances), 1)
+
+  def test_remove(self):
+    tg1 = self.table_group('tg1')
+    self.mx._instances.remove(tg1)
+    self.assertFalse(tg1 in self.mx._instances)
+    self.assertFalse(self.table_group('tg1') is tg1)
+    self.assertRaises(ValueError, self.mx._instances.remove, tg1)
+
+class TestMxIdentityMapLimits(unittest.TestCase):
+
+  def setUp(self):
+    self.mx = OfflineMxConnection()
+    self.now = 1000.0
+    self.clock = imperva_sdk.core._clock
+    imperva_sdk.core._clock = lambda: self.now
+
+  def tearDown(self):
+    imperva_sdk.core._clock = self.clock
+
+  def table_group(self, Name):
+    return TableGroup(connection=self.mx, Name=Name)
+
+  def test_least_recently_used(self):
+    self.mx._instances = MxIdentityMap(MaxObjects=2)
+    tg1 = self.table_group('tg1')
+    tg2 = self.table_group('tg2')
+    self.assertTrue(self.table_group('tg1') is tg1)
+    # tg2 is the least recently used
+    self.table_group('tg3')
+    self.assertEqual(len(self.mx._instances), 2)
+    self.assertTrue(self.table_group('tg1') is tg1)
+    self.assertFalse(self.table_group('tg2') is tg2)
+
+  def test_discard_after_eviction(self):
+    self.mx._instances = MxIdentityMap(MaxObjects=1)
+    tg1 = self.table_group('tg1')
+    tg2 = self.table_group('tg2')
+    self.assertFalse(tg1 in self.mx._instances)
+    # Delete functions discard objects that may not be stored anymore
+    self.mx._instances.discard(tg1)
+    self.assertTrue(tg2 in self.mx._instances)
+    self.assertRaises(ValueError, self.mx._instances.remove, tg1)
+
+  def test_ttl(self):
+    self.mx._instances = MxIdentityMap(Ttl={TableGroup: 10, None: None})
+    tg1 = self.table_group('tg1')
+    self.now += 9
+    self.assertTrue(self.table_group('tg1') is tg1)
+    self.now += 1
+    self.assertEqual(len(self.mx._instances), 0)
+    self.assertFalse(self.table_group('tg1') is tg1)
+    self.assertEqual(self.mx._instances._get_ttl('Site'), None)
+
+  def test_discard_type(self):
+    tg1 = self.table_group('tg1')
+    self.table_group('tg2')
+    self.mx._instances.discard_type('TableGroup')
+    self.assertEqual(len(self.mx._instances), 0)
+    self.assertFalse(self.table_group('tg1') is tg1)
+
+if __name__ == '__main__':
+  unittest.main()
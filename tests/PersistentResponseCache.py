@@ -0,0 +1,98 @@
+#!/usr/bin/python
+
+import os
+import stat
+import shutil
+import tempfile
+import unittest
+import imperva_sdk
+from requests.models import Response
+
+Url = 'https://10.0.0.1:8083/SecureSphere/api/v1/conf/sites'
+
+def make_response(Status=200, Content=b'', Headers={}):
+  response = Response()
+  response.status_code = Status
+  response._content = Content
+  response.headers.update(Headers)
+  response.encoding = 'utf-8'
+  return response
+
+class TestPersistentResponseCache(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, 'cache.db')
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_path_and_max_age_required(self):
+    with self.assertRaises(imperva_sdk.MxException):
+      imperva_sdk.PersistentResponseCache(MaxAge=600)
+    with self.assertRaises(imperva_sdk.MxException):
+      imperva_sdk.PersistentResponseCache(self.path)
+
+  def test_shared_between_caches(self):
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxAge=600)
+    cache.store(Url, make_response(Content=b'{"sites": ["site1"]}', Headers={'ETag': '"1"'}), User='admin')
+    cache.close()
+    self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    # A new cache (e.g. of another process) uses the stored response
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxAge=600)
+    self.assertEqual(len(cache), 1)
+    self.assertEqual(cache.get_fresh(Url, User='admin').content, b'{"sites": ["site1"]}')
+    # ... and revalidates it after a change
+    cache.expire(Url)
+    self.assertIsNone(cache.get_fresh(Url, User='admin'))
+    self.assertEqual(cache.get_validators(Url, User='admin'), {'If-None-Match': '"1"'})
+    response = make_response(Status=304)
+    self.assertTrue(cache.revalidate(Url, response, User='admin'))
+    self.assertEqual((response.status_code, response.content), (200, b'{"sites": ["site1"]}'))
+    cache.close()
+
+  def test_stored_per_user(self):
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxAge=600)
+    cache.store(Url, make_response(Content=b'{"sites": ["site1"]}'), User='admin')
+    self.assertIsNone(cache.get_fresh(Url, User='auditor'))
+    cache.store(Url, make_response(Content=b'{"sites": []}'), User='auditor')
+    self.assertEqual(cache.get_fresh(Url, User='admin').content, b'{"sites": ["site1"]}')
+    self.assertEqual(cache.get_fresh(Url, User='auditor').content, b'{"sites": []}')
+    # A change on the MX expires the responses of all users
+    cache.expire(Url)
+    self.assertIsNone(cache.get_fresh(Url, User='admin'))
+    self.assertIsNone(cache.get_fresh(Url, User='auditor'))
+    cache.close()
+
+  def test_credentials_not_stored(self):
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxAge=600)
+    ssl_url = 'https://10.0.0.1:8083/SecureSphere/api/v1/conf/webServices/site1/sg1/ws1/sslCertificates/key1'
+    cache.store(ssl_url, make_response(Content=b'{"private": "key"}'))
+    self.assertEqual(len(cache), 0)
+    self.assertIsNone(cache.get_fresh(ssl_url))
+    cache.close()
+
+  def test_max_age_and_expire(self):
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxAge=600)
+    cache.store(Url, make_response(Content=b'{"sites": []}'))
+    self.assertEqual(cache.get_fresh(Url).content, b'{"sites": []}')
+    # A change on the MX expires all the responses of the MX, other MXs are kept
+    other_url = Url.replace('10.0.0.1', '10.0.0.2')
+    cache.store(other_url, make_response(Content=b'{"sites": []}'))
+    cache.expire('https://10.0.0.1:8083/SecureSphere/api/v1/conf/sites/site1')
+    self.assertIsNone(cache.get_fresh(Url))
+    self.assertIsNotNone(cache.get_fresh(other_url))
+    cache.close()
+
+  def test_trim(self):
+    cache = imperva_sdk.PersistentResponseCache(self.path, MaxBytes=10, MaxAge=600)
+    for i in range(3):
+      cache.store('%s/%d' % (Url, i), make_response(Content=b'1234', Headers={'ETag': '"%d"' % i}))
+    self.assertEqual(cache.Size, 8)
+    self.assertEqual(cache.get_validators(Url + '/0'), {})
+    self.assertEqual(cache.get_validators(Url + '/2'), {'If-None-Match': '"2"'})
+    cache.close()
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+
+import sys
+import time
+import threading
+import unittest
+import imperva_sdk
+from imperva_sdk.RateLimiter import RateLimit
+
+# imperva_sdk.RateLimiter is the class (see __init__.py)
+RateLimiterModule = sys.modules['imperva_sdk.RateLimiter']
+
+class TestRateLimiter(unittest.TestCase):
+
+  def setUp(self):
+    self.now = 1000.0
+    self.clock = RateLimiterModule._clock
+    RateLimiterModule._clock = lambda: self.now
+
+  def tearDown(self):
+    RateLimiterModule._clock = self.clock
+
+  def test_bucket_starts_full(self):
+    limit = RateLimit(Rate=10, Burst=5)
+    for i in range(5):
+      limit.acquire()
+      limit.release()
+    self.assertEqual(limit._tokens, 0)
+
+  def test_refill(self):
+    limit = RateLimit(Rate=10, Burst=5)
+    for i in range(5):
+      limit.acquire()
+    self.now += 0.3
+    limit._refill()
+    self.assertAlmostEqual(limit._tokens, 3)
+    # Never more than Burst
+    self.now += 60
+    limit._refill()
+    self.assertEqual(limit._tokens, 5)
+
+  def test_lower_burst(self):
+    limit = RateLimit(Rate=10, Burst=5)
+    limit.configure(Rate=10, Burst=2)
+    self.assertEqual(limit._tokens, 2)
+
+  def test_set_limit_keeps_other_parameters(self):
+    limiter = imperva_sdk.RateLimiter()
+    limiter.set_limit(Prefix='/conf/webProfile', Rate=2, Burst=4)
+    limiter.set_limit(Prefix='/conf/webProfile', MaxInFlight=1)
+    limit = limiter.get_limits()['/conf/webProfile']
+    self.assertEqual((limit.Rate, limit.Burst, limit.MaxInFlight), (2, 4, 1))
+    limiter.set_limit(Prefix='/conf/webProfile', Rate=8)
+    self.assertEqual((limit.Rate, limit.Burst, limit.MaxInFlight), (8, 4, 1))
+    limiter.remove_limit(Prefix='/conf/webProfile')
+    self.assertEqual(limiter.get_limits(), {})
+
+  def test_path_limits(self):
+    limiter = imperva_sdk.RateLimiter()
+    limiter.set_limit(Rate=100)
+    limiter.set_limit(Prefix='/conf', Rate=10)
+    limiter.set_limit(Prefix='/conf/webProfile', Rate=2)
+    limits = limiter.get_limits()
+    self.assertEqual(limiter._get_path_limits('/conf/webProfile/site'), [limits['/conf/webProfile'], limits[None]])
+    self.assertEqual(limiter._get_path_limits('/conf/sites'), [limits['/conf'], limits[None]])
+    self.assertEqual(limiter._get_path_limits('/auth/session'), [limits[None]])
+
+class TestRateLimiterTiming(unittest.TestCase):
+
+  def test_rate(self):
+    limit = RateLimit(Rate=50, Burst=1)
+    start = time.time()
+    for i in range(6):
+      limit.acquire()
+      limit.release()
+    # The first call uses the full bucket, the other 5 wait 1/50 second each
+    self.assertGreaterEqual(time.time() - start, 0.09)
+
+  def test_max_in_flight(self):
+    limit = RateLimit(MaxInFlight=1)
+    limit.acquire()
+    acquired = threading.Event()
+    def second_call():
+      limit.acquire()
+      acquired.set()
+    thread = threading.Thread(target=second_call)
+    thread.start()
+    self.assertFalse(acquired.wait(0.1))
+    limit.release()
+    self.assertTrue(acquired.wait(5))
+    thread.join()
+    self.assertEqual(limit.InFlight, 1)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python
+
+import unittest
+import imperva_sdk
+from requests.models import Response
+
+Url = 'https://10.0.0.1:8083/SecureSphere/api/v1/conf/sites'
+
+def make_response(Status=200, Content=b'', Headers={}):
+  response = Response()
+  response.status_code = Status
+  response._content = Content
+  response.headers.update(Headers)
+  response.encoding = 'utf-8'
+  return response
+
+class TestResponseCache(unittest.TestCase):
+
+  def test_revalidation(self):
+    cache = imperva_sdk.ResponseCache()
+    self.assertEqual(cache.get_validators(Url), {})
+    cache.store(Url, make_response(Content=b'{"sites": ["site1"]}', Headers={'ETag': '"1"', 'Last-Modified': 'Sun, 18 Oct 2026 10:00:00 GMT'}))
+    self.assertEqual(cache.get_validators(Url), {'If-None-Match': '"1"', 'If-Modified-Since': 'Sun, 18 Oct 2026 10:00:00 GMT'})
+    # Without MaxAge the MX is always asked
+    self.assertIsNone(cache.get_fresh(Url))
+
+    response = make_response(Status=304)
+    self.assertTrue(cache.revalidate(Url, response))
+    self.assertEqual((response.status_code, response.content, response.encoding), (200, b'{"sites": ["site1"]}', 'utf-8'))
+    self.assertFalse(cache.revalidate(Url + '/site1', make_response(Status=304)))
+
+  def test_no_validators(self):
+    cache = imperva_sdk.ResponseCache()
+    cache.store(Url, make_response(Content=b'{}', Headers={'ETag': '"1"'}))
+    # A response without validators replaces the stored one
+    cache.store(Url, make_response(Content=b'{}'))
+    self.assertEqual(len(cache), 0)
+    self.assertEqual(cache.Size, 0)
+
+  def test_max_age(self):
+    cache = imperva_sdk.ResponseCache(MaxAge=600)
+    cache.store(Url, make_response(Content=b'{"sites": []}'))
+    self.assertEqual(cache.get_fresh(Url).content, b'{"sites": []}')
+    cache.expire(Url + '/site1')
+    self.assertIsNone(cache.get_fresh(Url))
+    # Revalidation starts a new MaxAge period
+    cache.store(Url, make_response(Content=b'{"sites": []}', Headers={'ETag': '"2"'}))
+    cache.expire(Url)
+    cache.revalidate(Url, make_response(Status=304))
+    self.assertIsNotNone(cache.get_fresh(Url))
+
+  def test_lru_trim(self):
+    cache = imperva_sdk.ResponseCache(MaxBytes=10)
+    for i in range(3):
+      cache.store('%s/%d' % (Url, i), make_response(Content=b'1234', Headers={'ETag': '"%d"' % i}))
+    # The least recently used response (0) was removed
+    self.assertEqual(cache.Size, 8)
+    self.assertEqual(cache.get_validators(Url + '/0'), {})
+    # Using a response makes it the most recently used one
+    cache.get_validators(Url + '/1')
+    cache.store(Url + '/3', make_response(Content=b'1234', Headers={'ETag': '"3"'}))
+    self.assertNotEqual(cache.get_validators(Url + '/1'), {})
+    self.assertEqual(cache.get_validators(Url + '/2'), {})
+    # Responses that are larger than the cache aren't stored
+    cache.store(Url + '/4', make_response(Content=b'12345678901', Headers={'ETag': '"4"'}))
+    self.assertEqual(cache.get_validators(Url + '/4'), {})
+
+  def test_lower_max_bytes(self):
+    cache = imperva_sdk.ResponseCache()
+    for i in range(3):
+      cache.store('%s/%d' % (Url, i), make_response(Content=b'1234', Headers={'ETag': '"%d"' % i}))
+    cache.MaxBytes = 4
+    self.assertEqual(len(cache), 1)
+    cache.MaxBytes = 0
+    self.assertEqual((len(cache), cache.Size), (0, 0))
+
+if __name__ == '__main__':
+  unittest.main()
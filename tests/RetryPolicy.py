@@ -0,0 +1,71 @@
+#!/usr/bin/python
+
+import time
+import email.utils
+import unittest
+import imperva_sdk
+from requests.models import Response
+
+def make_response(Status=200, Text='', Headers={}):
+  response = Response()
+  response.status_code = Status
+  response._content = Text.encode('utf-8')
+  response.headers.update(Headers)
+  response.encoding = 'utf-8'
+  return response
+
+class TestRetryPolicy(unittest.TestCase):
+
+  def test_retry_status(self):
+    policy = imperva_sdk.RetryPolicy()
+    for status in (429, 500, 502, 503, 504):
+      self.assertTrue(policy.is_retryable('GET', 1, make_response(Status=status)))
+    for status in (200, 400, 401, 404):
+      self.assertFalse(policy.is_retryable('GET', 1, make_response(Status=status)))
+
+  def test_retry_errors(self):
+    policy = imperva_sdk.RetryPolicy()
+    busy = make_response(Status=406, Text='{"errors": [{"error-code": "IMP-10000", "description": "System is busy"}]}')
+    self.assertTrue(policy.is_retryable('PUT', 1, busy))
+    self.assertFalse(policy.is_retryable('PUT', 1, make_response(Status=406, Text='{"errors": [{"description": "Invalid name"}]}')))
+
+  def test_connection_error(self):
+    policy = imperva_sdk.RetryPolicy()
+    self.assertTrue(policy.is_retryable('DELETE', 1, None))
+
+  def test_methods(self):
+    # A POST may have been applied by the MX before the connection failed
+    policy = imperva_sdk.RetryPolicy()
+    self.assertFalse(policy.is_retryable('POST', 1, None))
+    self.assertFalse(policy.is_retryable('POST', 1, make_response(Status=503)))
+    policy = imperva_sdk.RetryPolicy(Methods=['get', 'post'])
+    self.assertTrue(policy.is_retryable('POST', 1, make_response(Status=503)))
+    self.assertFalse(policy.is_retryable('PUT', 1, make_response(Status=503)))
+
+  def test_max_attempts(self):
+    policy = imperva_sdk.RetryPolicy(MaxAttempts=3)
+    self.assertTrue(policy.is_retryable('GET', 2, None))
+    self.assertFalse(policy.is_retryable('GET', 3, None))
+    self.assertFalse(imperva_sdk.RetryPolicy(MaxAttempts=1).is_retryable('GET', 1, None))
+
+  def test_backoff(self):
+    policy = imperva_sdk.RetryPolicy(BackoffFactor=0.5, MaxBackoff=3, Jitter=False)
+    self.assertEqual([policy.get_delay(attempt) for attempt in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+  def test_jitter(self):
+    policy = imperva_sdk.RetryPolicy(BackoffFactor=1, MaxBackoff=30)
+    for i in range(100):
+      self.assertTrue(0 <= policy.get_delay(3) <= 4)
+
+  def test_retry_after(self):
+    policy = imperva_sdk.RetryPolicy(MaxBackoff=10)
+    self.assertEqual(policy.get_delay(1, make_response(Status=503, Headers={'Retry-After': '2'})), 2)
+    self.assertEqual(policy.get_delay(1, make_response(Status=503, Headers={'Retry-After': '120'})), 10)
+    date = email.utils.formatdate(time.time() + 5, usegmt=True)
+    self.assertTrue(3 <= policy.get_delay(1, make_response(Status=503, Headers={'Retry-After': date})) <= 5)
+    # Invalid headers fall back to the backoff delay
+    policy.Jitter = False
+    self.assertEqual(policy.get_delay(1, make_response(Status=503, Headers={'Retry-After': 'soon'})), policy.BackoffFactor)
+
+if __name__ == '__main__':
+  unittest.main()
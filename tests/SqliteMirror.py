@@ -0,0 +1,68 @@
+#!/usr/bin/python
+
+import os
+import shutil
+import tempfile
+import unittest
+import imperva_sdk
+
+class TestSqliteMirror(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.mirror = imperva_sdk.SqliteMirror(os.path.join(self.directory, 'mx.db'))
+    self.export = {
+      'metadata': {'Host': '10.0.0.1'},
+      'sites': [{'Name': 'site1', 'server_groups': [
+        {'Name': 'sg1', 'OperationMode': 'active', 'web_services': [
+          {'Name': 'ws1', 'Ports': [80], 'web_applications': [{'Name': 'app1'}, {'Name': 'app2'}]}
+        ], 'db_services': []}
+      ]}],
+      'policies': {'web_service_custom': [
+        {'Name': 'p1', 'Enabled': True, 'ApplyTo': [{'siteName': 'site1', 'serverGroupName': 'sg1', 'webServiceName': 'ws1'}]}
+      ]},
+      'global_objects': {}
+    }
+    self.agents = [{'Name': 'agent1', 'Ip': '10.0.0.2', 'Tags': ['production', 'oracle']}]
+
+  def tearDown(self):
+    self.mirror.close()
+    shutil.rmtree(self.directory)
+
+  def test_sync(self):
+    stats = self.mirror.sync(Export=self.export, Agents=self.agents)
+    self.assertEqual(stats['web_applications'], (2, 0))
+    self.assertEqual(self.mirror.get_policy_services('p1'), [{'site': 'site1', 'server_group': 'sg1', 'service': 'ws1', 'application': None}])
+    self.assertEqual(self.mirror.get_service_policies('site1', 'sg1', 'ws1'), [{'type': 'web_service_custom', 'name': 'p1', 'enabled': 1}])
+    self.assertEqual(self.mirror.get_agents_by_tag('oracle'), ['agent1'])
+    self.assertEqual(self.mirror.get_sync_info('Host'), '10.0.0.1')
+    self.assertIsNone(self.mirror.get_sync_info('Export'))
+
+  def test_only_changes_are_written(self):
+    self.mirror.sync(Export=self.export, Agents=self.agents)
+    stats = self.mirror.sync(Export=self.export, Agents=self.agents)
+    self.assertTrue(all(stats[table] == (0, 0) for table in stats))
+
+    ws = self.export['sites'][0]['server_groups'][0]['web_services'][0]
+    ws['Ports'] = [8080]
+    ws['web_applications'].pop()
+    stats = self.mirror.sync(Export=self.export)
+    self.assertEqual(stats['web_services'], (1, 0))
+    self.assertEqual(stats['web_applications'], (0, 1))
+    self.assertEqual(stats['sites'], (0, 0))
+    # Agents weren't passed - the mirrored agents are kept
+    self.assertNotIn('agents', stats)
+    self.assertEqual(self.mirror.get_agents_by_tag('production'), ['agent1'])
+
+  def test_discarded_tables_are_kept(self):
+    self.mirror.sync(Export=self.export)
+    del self.export['sites'][0]['server_groups'][0]['web_services'][0]['web_applications']
+    del self.export['policies']['web_service_custom'][0]['ApplyTo']
+    stats = self.mirror.sync(Export=self.export, Discard=['web_applications', 'ApplyTo'])
+    self.assertNotIn('web_applications', stats)
+    self.assertNotIn('policy_apply_to', stats)
+    self.assertEqual(len(self.mirror.query('SELECT name FROM web_applications')), 2)
+    self.assertEqual(len(self.mirror.get_policy_services('p1')), 1)
+
+if __name__ == '__main__':
+  unittest.main()